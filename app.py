@@ -4,7 +4,7 @@ Ponto de entrada da aplicação financeira.
 Este módulo inicializa:
 - o banco de dados (Database)
 - a camada de serviços (SistemaFinanceiro)
-- a interface gráfica (MainWindow, em interface.py)
+- a interface gráfica (MainWindow, no pacote interface/)
 """
 
 import sys
@@ -16,6 +16,7 @@ from PySide6.QtGui import QFont
 from database import Database
 from services import SistemaFinanceiro
 from interface import MainWindow
+from interface.theme import aplicar_tema
 
 
 def main():
@@ -31,6 +32,9 @@ def main():
     app.setFont(base_font)
     # ==================================
 
+    # Stylesheet único da aplicação (parse feito uma vez só)
+    aplicar_tema(app)
+
     # Banco e regras de negócio
     db = Database("financeiro.db")
     sistema = SistemaFinanceiro(db)
@@ -0,0 +1,41 @@
+"""
+Arquiva anos encerrados do banco financeiro.
+
+Move recebimentos, despesas e ordens de serviço do ano informado para
+financeiro_AAAA.db (na mesma pasta), deixando o banco principal menor.
+Os relatórios continuam mostrando os anos arquivados.
+
+Uso:
+    python arquivar.py 2023
+    python arquivar.py            (lista os anos já arquivados)
+"""
+
+import sys
+
+from database import Database
+from services import SistemaFinanceiro
+
+
+def main(argv):
+    sistema = SistemaFinanceiro(Database("financeiro.db"))
+
+    if len(argv) < 2:
+        anos = sistema.anos_arquivados()
+        print("Anos arquivados:", ", ".join(map(str, anos)) if anos else "nenhum")
+        return 0
+
+    try:
+        ano = int(argv[1])
+        movidos = sistema.arquivar_ano(ano)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return 1
+
+    print(f"Ano {ano} arquivado em {sistema.db.caminho_arquivo(ano)}:")
+    for tabela, qtd in movidos.items():
+        print(f"   {tabela}: {qtd}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,132 @@
+"""
+Módulo de busca em memória.
+
+Fornece a normalização de texto usada nas buscas (minúsculas e sem
+acentos, para que "joao" encontre "João") e um índice invertido de
+n-gramas que responde consultas de prefixo e de substring sem varrer
+todos os registros. Não conhece banco de dados nem interface: quem usa
+o índice decide quais campos de cada registro são indexados.
+"""
+
+import unicodedata
+from typing import Dict, Hashable, Iterable, Optional, Set
+
+
+def normalizar_texto(texto: Optional[str]) -> str:
+    """
+    Normaliza um texto para comparação: remove acentos e converte
+    para minúsculas. None vira string vazia.
+    """
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acento = "".join(ch for ch in decomposto if not unicodedata.combining(ch))
+    return sem_acento.casefold()
+
+
+def _somente_digitos(texto: str) -> str:
+    return "".join(ch for ch in texto if ch.isdigit())
+
+
+class IndiceNGramas:
+    """
+    Índice invertido de n-gramas (1 a N caracteres) sobre textos normalizados.
+
+    Cada documento (chave -> lista de campos) é normalizado e quebrado em
+    n-gramas. Uma consulta é dividida em termos; cada termo é resolvido pela
+    interseção das listas de seus n-gramas e, quando maior que N, confirmado
+    com uma checagem de substring apenas nos candidatos.
+
+    Campos numéricos com pontuação (CPF, telefone) também são indexados só
+    com os dígitos, para que "12345" encontre "123.45...".
+    """
+
+    def __init__(self, n: int = 3):
+        self.n = n
+        self._grams: Dict[str, Set[Hashable]] = {}
+        self._docs: Dict[Hashable, str] = {}
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _texto_documento(self, campos: Iterable[Optional[str]]) -> str:
+        partes = []
+        for campo in campos:
+            norm = normalizar_texto(campo)
+            if not norm:
+                continue
+            partes.append(norm)
+            digitos = _somente_digitos(norm)
+            if digitos and digitos != norm:
+                partes.append(digitos)
+        # Separador que nunca aparece em consultas: evita casar entre campos
+        return "\x00".join(partes)
+
+    def _gerar_grams(self, texto: str) -> Set[str]:
+        grams = set()
+        for tamanho in range(1, self.n + 1):
+            for i in range(len(texto) - tamanho + 1):
+                g = texto[i:i + tamanho]
+                if "\x00" not in g:
+                    grams.add(g)
+        return grams
+
+    def adicionar(self, chave: Hashable, campos: Iterable[Optional[str]]) -> None:
+        """Indexa (ou reindexa) um documento."""
+        if chave in self._docs:
+            self.remover(chave)
+        texto = self._texto_documento(campos)
+        self._docs[chave] = texto
+        for g in self._gerar_grams(texto):
+            self._grams.setdefault(g, set()).add(chave)
+
+    def remover(self, chave: Hashable) -> None:
+        """Remove um documento do índice (ignora chaves inexistentes)."""
+        texto = self._docs.pop(chave, None)
+        if texto is None:
+            return
+        for g in self._gerar_grams(texto):
+            chaves = self._grams.get(g)
+            if chaves is None:
+                continue
+            chaves.discard(chave)
+            if not chaves:
+                del self._grams[g]
+
+    def _buscar_termo(self, termo: str) -> Set[Hashable]:
+        if len(termo) <= self.n:
+            return set(self._grams.get(termo, ()))
+
+        # Interseção das listas de n-gramas, começando pela menor
+        listas = []
+        for i in range(len(termo) - self.n + 1):
+            chaves = self._grams.get(termo[i:i + self.n])
+            if not chaves:
+                return set()
+            listas.append(chaves)
+        listas.sort(key=len)
+        candidatos = set(listas[0])
+        for chaves in listas[1:]:
+            candidatos &= chaves
+            if not candidatos:
+                return candidatos
+
+        # Os n-gramas podem casar fora de ordem: confirma a substring
+        return {c for c in candidatos if termo in self._docs[c]}
+
+    def buscar(self, consulta: str) -> Optional[Set[Hashable]]:
+        """
+        Retorna as chaves cujos campos contêm todos os termos da consulta.
+        Retorna None para consulta vazia (ou seja, "sem filtro").
+        """
+        termos = normalizar_texto(consulta).split()
+        if not termos:
+            return None
+
+        resultado: Optional[Set[Hashable]] = None
+        for termo in sorted(set(termos), key=len, reverse=True):
+            encontrados = self._buscar_termo(termo)
+            resultado = encontrados if resultado is None else resultado & encontrados
+            if not resultado:
+                return set()
+        return resultado
@@ -5,62 +5,276 @@ Responsável por gerenciar a conexão com o banco (por exemplo, SQLite),
 criar as tabelas necessárias na primeira execução e fornecer funções/
 métodos genéricos para executar comandos SQL (inserir, consultar, etc.).
 Ele não conhece regras de negócio, apenas lida com persistência de dados.
+
+A tabela `resumo_mensal` (quantidade e total por mês, entidade, forma de
+pagamento e situação) é mantida por triggers, para que painel e
+relatórios anuais leiam poucas linhas por mês em vez de todos os
+lançamentos.
+
+Anos já encerrados podem ser movidos para arquivos anuais
+(financeiro.db -> financeiro_2023.db, na mesma pasta) com `arquivar_ano`.
+O banco principal fica só com os anos em uso; consultas por intervalo de
+datas (`consultar_por_data`) anexam, somente leitura, apenas os arquivos
+dos anos que o intervalo alcança.
 """
 
+import os
+import re
 import sqlite3
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from urllib.request import pathname2url
+
+# Tabelas de lançamentos: as que vão para os arquivos anuais. `{esquema}`
+# é "" no banco principal e "arq." no arquivo sendo criado.
+_DDL_LANCAMENTOS = {
+    "recebimentos": """
+        CREATE TABLE IF NOT EXISTS {esquema}recebimentos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            valor REAL NOT NULL,
+            data TEXT NOT NULL,
+            forma_pagamento TEXT NOT NULL,
+            comprovante_caminho TEXT)
+    """,
+    "despesas": """
+        CREATE TABLE IF NOT EXISTS {esquema}despesas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            valor REAL NOT NULL,
+            data TEXT NOT NULL,
+            forma_pagamento TEXT NOT NULL,
+            descricao TEXT NOT NULL,
+            eh_a_prazo INTEGER NOT NULL,
+            data_vencimento TEXT,
+            comprovante_caminho TEXT,
+            foi_pago INTEGER NOT NULL DEFAULT 1)
+    """,
+    "ordens_servico": """
+        CREATE TABLE IF NOT EXISTS {esquema}ordens_servico (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cliente TEXT NOT NULL,
+            descricao TEXT NOT NULL,
+            valor_total REAL NOT NULL,
+            data TEXT NOT NULL,
+            foi_pago INTEGER NOT NULL,
+            forma_pagamento TEXT,
+            saldo_aberto REAL NOT NULL DEFAULT 0
+        )
+    """,
+}
+
+# Colunas acrescentadas depois da criação das tabelas: (tabela, coluna,
+# definição, ajuste feito no banco principal logo depois de acrescentar).
+# Bancos antigos e arquivos anuais ganham a coluna ao abrir o sistema.
+_COLUNAS_NOVAS = (
+    # Contas a prazo que ainda não venceram entram como não pagas; o
+    # resto (à vista ou já vencidas antes do controle existir), como pagas
+    ("despesas", "foi_pago", "INTEGER NOT NULL DEFAULT 1",
+     "UPDATE despesas SET foi_pago = 0 "
+     "WHERE eh_a_prazo = 1 AND data_vencimento >= date('now', 'localtime')"),
+    ("funcionarios", "salario", "REAL", None),
+    # Ordens em aberto começam devendo o valor todo (não havia pagamentos)
+    ("ordens_servico", "saldo_aberto", "REAL NOT NULL DEFAULT 0",
+     "UPDATE ordens_servico SET saldo_aberto = valor_total WHERE foi_pago = 0"),
+)
+
+# Registros que não vão para o arquivo anual mesmo sendo do ano arquivado:
+# contas a prazo e ordens de serviço em aberto continuam no principal, onde
+# podem ser pagas (e onde os índices parciais de pendências as encontram)
+_FICA_NO_PRINCIPAL = {
+    "despesas": "eh_a_prazo = 1 AND foi_pago = 0",
+    "ordens_servico": "foi_pago = 0",
+}
+
+# Limite padrão do SQLite para bancos anexados a uma conexão
+MAX_ANEXOS = 10
+
+# ========= EXTRATO UNIFICADO =========
+
+# Colunas da view `lancamentos` tiradas de cada tabela de lançamentos, na
+# ordem que desempata lançamentos do mesmo dia: (tabela, tipo, descrição,
+# valor com sinal, fluxo no saldo, situação). Notas de serviço aparecem
+# no extrato, mas não mexem no saldo.
+FONTES_LANCAMENTOS = (
+    ("recebimentos", "Receita", "'Recebimento (' || forma_pagamento || ')'", "valor", "valor", "1"),
+    ("despesas", "Despesa", "descricao", "-valor", "-valor", "foi_pago"),
+    ("ordens_servico", "Nota de serviço", "descricao", "valor_total", "0", "foi_pago"),
+)
+
+
+def sql_lancamentos(ordem: int, origem: Optional[str] = None) -> str:
+    """
+    SELECT com as colunas da view `lancamentos` (tipo, ordem, id, data,
+    descricao, valor, fluxo, pago) para a fonte `ordem`, lendo de `origem`
+    (padrão: a própria tabela; ex.: "arq_2023.despesas").
+    """
+    tabela, tipo, descricao, valor, fluxo, pago = FONTES_LANCAMENTOS[ordem]
+    return (
+        f"SELECT '{tipo}' AS tipo, {ordem} AS ordem, id, data, {descricao} AS descricao, "
+        f"{valor} AS valor, {fluxo} AS fluxo, {pago} AS pago FROM {origem or tabela}"
+    )
+
+
+def _sql_indices_lancamentos(tabela: str, esquema: str = "") -> List[str]:
+    """
+    Índices para cada coluna ordenável do extrato (data, descrição, valor),
+    sobre a mesma expressão usada na view: uma página ordenada sai direto
+    do índice. O rowid vem junto, então o id já desempata.
+    """
+    _, _, descricao, valor, _, _ = next(f for f in FONTES_LANCAMENTOS if f[0] == tabela)
+    return [
+        f"CREATE INDEX IF NOT EXISTS {esquema}{tabela}_{nome} ON {tabela} ({expressao})"
+        for nome, expressao in (("data", "data"), ("descricao", descricao), ("valor", valor))
+    ]
+
+
+def _sql_view_lancamentos() -> str:
+    partes = [sql_lancamentos(n) for n in range(len(FONTES_LANCAMENTOS))]
+    return "CREATE VIEW lancamentos AS " + " UNION ALL ".join(partes)
+
+
+# ========= SALDO DAS ORDENS DE SERVIÇO =========
+
+# saldo_aberto = valor total menos os pagamentos (zero se a ordem está
+# paga), refeito pelos triggers quando a ordem ou os pagamentos dela mudam.
+# Pagamentos que somam o valor todo (com tolerância de meio centavo)
+# marcam a ordem como paga.
+_SQL_SALDO_OS = """
+    UPDATE ordens_servico SET saldo_aberto = CASE WHEN foi_pago = 1 THEN 0 ELSE MAX(
+        valor_total - (SELECT COALESCE(SUM(p.valor), 0) FROM pagamentos_os p
+                       WHERE p.ordem_servico_id = ordens_servico.id), 0) END
+    WHERE id = {id};"""
+
+_SQL_TRIGGERS_SALDO_OS = f"""
+    CREATE TRIGGER IF NOT EXISTS ordens_servico_saldo_ai AFTER INSERT ON ordens_servico BEGIN
+        {_SQL_SALDO_OS.format(id="new.id")}
+    END;
+    CREATE TRIGGER IF NOT EXISTS ordens_servico_saldo_au AFTER UPDATE OF valor_total, foi_pago ON ordens_servico BEGIN
+        {_SQL_SALDO_OS.format(id="new.id")}
+    END;
+    CREATE TRIGGER IF NOT EXISTS pagamentos_os_ai AFTER INSERT ON pagamentos_os BEGIN
+        {_SQL_SALDO_OS.format(id="new.ordem_servico_id")}
+        UPDATE ordens_servico SET foi_pago = 1
+        WHERE id = new.ordem_servico_id AND foi_pago = 0 AND saldo_aberto < 0.005;
+    END;
+    CREATE TRIGGER IF NOT EXISTS pagamentos_os_ad AFTER DELETE ON pagamentos_os BEGIN
+        {_SQL_SALDO_OS.format(id="old.ordem_servico_id")}
+    END;
+"""
+
+
+# ========= RESUMO MENSAL =========
+
+# Origem de cada entidade do resumo: (tabela, entidade, coluna do valor,
+# expressão de "pago", colunas que mudam o resumo quando alteradas).
+# `{r}` é o prefixo da linha: "new."/"old." nos triggers, "" nas consultas.
+_FONTES_RESUMO = (
+    ("recebimentos", "recebimento", "valor", "1", "valor, data, forma_pagamento"),
+    ("despesas", "despesa", "valor", "1", "valor, data, forma_pagamento"),
+    ("ordens_servico", "ordem_servico", "valor_total", "{r}foi_pago",
+     "valor_total, data, forma_pagamento, foi_pago"),
+)
+
+
+def _sql_somar_resumo(valores: str) -> str:
+    """Soma quantidade/total na linha do resumo (criando a linha se preciso)."""
+    return f"""
+        INSERT INTO resumo_mensal (mes, entidade, forma_pagamento, pago, quantidade, total)
+        VALUES ({valores})
+        ON CONFLICT (mes, entidade, forma_pagamento, pago) DO UPDATE SET
+            quantidade = quantidade + excluded.quantidade,
+            total = total + excluded.total"""
+
+
+def _sql_trigger_resumo(fonte, r: str, sinal: int) -> str:
+    """Comandos de trigger que somam (+1) ou tiram (-1) a linha `r` do resumo."""
+    tabela, entidade, valor, pago, _ = fonte
+    pago = pago.format(r=r + ".")
+    chave = f"substr({r}.data, 1, 7), '{entidade}', COALESCE({r}.forma_pagamento, ''), {pago}"
+    sql = _sql_somar_resumo(f"{chave}, {sinal}, {sinal} * {r}.{valor}") + ";"
+    if sinal < 0:
+        # Mês que ficou sem lançamentos sai do resumo
+        sql += f"""
+        DELETE FROM resumo_mensal
+        WHERE (mes, entidade, forma_pagamento, pago) = ({chave}) AND quantidade = 0;"""
+    return sql
+
+
+def _sql_agregar_resumo(fonte, tabela: str = "{tabela}", filtro: str = "") -> str:
+    """SELECT que calcula as linhas do resumo direto de uma tabela de lançamentos."""
+    _, entidade, valor, pago, _ = fonte
+    return f"""
+        SELECT substr(data, 1, 7), '{entidade}', COALESCE(forma_pagamento, ''),
+               {pago.format(r="")}, COUNT(*), SUM({valor})
+        FROM {tabela} {filtro}
+        GROUP BY 1, 3, 4"""
+
 
 class Database:
     def __init__(self, caminho_banco: str = "financeiro.db"):
         self.caminho_banco = caminho_banco
+        # Fica False se o SQLite da máquina não tiver sido compilado com FTS5
+        self.fts_disponivel = True
+        # Anos com arquivo anual (lido da pasta na primeira consulta)
+        self._anos_arquivados: Optional[List[int]] = None
         self._criar_tabelas()
 
     def _conectar(self):
-        return sqlite3.connect(self.caminho_banco)
+        # uri=True: permite anexar os arquivos anuais com "?mode=ro"
+        return sqlite3.connect(self.caminho_banco, uri=True)
     
     def _criar_tabelas(self):
         conn = self._conectar()
         cur = conn.cursor()
 
+        # Recebimentos, despesas e ordens de serviço (com coluna data)
+        for tabela, ddl in _DDL_LANCAMENTOS.items():
+            cur.execute(ddl.format(esquema=""))
+        self._migrar_colunas(conn)
+        for tabela in _DDL_LANCAMENTOS:
+            for sql in _sql_indices_lancamentos(tabela):
+                cur.execute(sql)
 
-        # Criar tabela dos recebimentos
+        # Contas a pagar: só as a prazo em aberto entram no índice, que fica
+        # pequeno e serve a agenda de vencimentos
         cur.execute("""
-                    
-            CREATE TABLE IF NOT EXISTS recebimentos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                valor REAL NOT NULL,
-                data TEXT NOT NULL,
-                forma_pagamento TEXT NOT NULL,
-                comprovante_caminho TEXT)
+            CREATE INDEX IF NOT EXISTS despesas_a_pagar ON despesas (data_vencimento)
+            WHERE eh_a_prazo = 1 AND foi_pago = 0
         """)
 
-
-        # Criar tabela das despesas
+        # Ordens de serviço a receber: índice parcial que cobre a consulta de
+        # aging (agrupa por cliente sem ler a tabela nem as ordens pagas).
+        # foi_pago entra nas colunas para o SQLite aceitar o índice como
+        # cobertura da consulta
+        cur.execute("DROP INDEX IF EXISTS ordens_servico_em_aberto")
         cur.execute("""
-            
-            CREATE TABLE IF NOT EXISTS despesas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                valor REAL NOT NULL,
-                data TEXT NOT NULL,
-                forma_pagamento TEXT NOT NULL,
-                descricao TEXT NOT NULL,
-                eh_a_prazo INTEGER NOT NULL,
-                data_vencimento TEXT,
-                comprovante_caminho TEXT)
+            CREATE INDEX IF NOT EXISTS ordens_servico_a_receber
+            ON ordens_servico (cliente, data, saldo_aberto, foi_pago) WHERE foi_pago = 0
         """)
 
-
-            # ORDENS DE SERVIÇO AGORA COM COLUNA data
+        # Pagamentos de ordens de serviço: cada linha liga um recebimento a
+        # uma ordem. Ficam no principal (não vão para os arquivos anuais)
         cur.execute("""
-            CREATE TABLE IF NOT EXISTS ordens_servico (
+            CREATE TABLE IF NOT EXISTS pagamentos_os (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cliente TEXT NOT NULL,
-                descricao TEXT NOT NULL,
-                valor_total REAL NOT NULL,
-                data TEXT NOT NULL,
-                foi_pago INTEGER NOT NULL,
-                forma_pagamento TEXT
+                ordem_servico_id INTEGER NOT NULL,
+                recebimento_id INTEGER NOT NULL,
+                valor REAL NOT NULL,
+                data TEXT NOT NULL
             )
         """)
+        # (ordem, valor) cobre a soma do que cada ordem já recebeu
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS pagamentos_os_ordem ON pagamentos_os (ordem_servico_id, valor)
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS pagamentos_os_recebimento ON pagamentos_os (recebimento_id)")
+        cur.executescript(_SQL_TRIGGERS_SALDO_OS)
+
+        # View do extrato unificado (refeita se a definição mudou)
+        view = cur.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'lancamentos'").fetchone()
+        if view is None or view[0] != _sql_view_lancamentos():
+            cur.execute("DROP VIEW IF EXISTS lancamentos")
+            cur.execute(_sql_view_lancamentos())
         
         # Criar tabela de funcionários
         cur.execute("""
@@ -75,14 +289,219 @@ class Database:
                 dia_pagamento INTEGER NOT NULL,
                 mes_decimo_terceiro INTEGER,
                 mes_ferias INTEGER,
-                data_demissao TEXT
+                data_demissao TEXT,
+                salario REAL
             )
         """)
 
+        # Despesas geradas pela folha: uma linha por funcionário, competência
+        # ("AAAA-MM") e tipo de pagamento. A chave única impede que rodar a
+        # folha duas vezes lance a mesma despesa de novo
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS folha_lancamentos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                funcionario_id INTEGER NOT NULL,
+                competencia TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                despesa_id INTEGER,
+                UNIQUE (funcionario_id, competencia, tipo)
+            )
+        """)
+
+        # Parcelas das despesas a prazo. Ficam sempre no principal (não vão
+        # para os arquivos anuais): o caixa de um mês soma as parcelas que
+        # vencem nele, seja qual for o ano da compra
+        parcelas_novas = cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'parcelas_despesa'"
+        ).fetchone() is None
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS parcelas_despesa (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                despesa_id INTEGER NOT NULL,
+                numero INTEGER NOT NULL,
+                valor REAL NOT NULL,
+                data_vencimento TEXT NOT NULL,
+                foi_pago INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (despesa_id, numero)
+            )
+        """)
+        # (data_vencimento, valor) cobre a soma do caixa do mês; o parcial,
+        # as parcelas em aberto (agenda de vencimentos, "a vencer no mês")
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS parcelas_despesa_vencimento
+            ON parcelas_despesa (data_vencimento, valor)
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS parcelas_a_pagar ON parcelas_despesa (data_vencimento)
+            WHERE foi_pago = 0
+        """)
 
         conn.commit()
+
+        self._criar_busca_textual(conn)
+        resumo_novo = self._criar_resumo_mensal(conn)
+
         conn.close()
 
+        if resumo_novo:
+            self.reconstruir_resumo_mensal()
+        self._migrar_arquivos()
+        if parcelas_novas:
+            self._criar_parcelas_unicas()
+
+    def _criar_parcelas_unicas(self) -> None:
+        """
+        Dá uma parcela (o valor todo, no vencimento da conta) a cada despesa a
+        prazo gravada antes de existirem parcelas, no principal e nos arquivos.
+        """
+        linhas = self.consultar_por_data(
+            "SELECT id, 1, valor, COALESCE(data_vencimento, data), foi_pago "
+            "FROM {tabela} WHERE eh_a_prazo = 1",
+            "despesas",
+        )
+        with self.transacao() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO parcelas_despesa "
+                "(despesa_id, numero, valor, data_vencimento, foi_pago) VALUES (?, ?, ?, ?, ?)",
+                linhas,
+            )
+
+    @staticmethod
+    def _migrar_colunas(conn, esquema: str = "main", ajustar: bool = True) -> None:
+        """Acrescenta as colunas de _COLUNAS_NOVAS que faltam nas tabelas do `esquema`."""
+        for tabela, coluna, definicao, ajuste in _COLUNAS_NOVAS:
+            existentes = {r[1] for r in conn.execute(f"PRAGMA {esquema}.table_info({tabela})")}
+            if not existentes or coluna in existentes:
+                continue
+            conn.execute(f"ALTER TABLE {esquema}.{tabela} ADD COLUMN {coluna} {definicao}")
+            if ajustar and ajuste:
+                conn.execute(ajuste)
+        conn.commit()
+
+    def _migrar_arquivos(self) -> None:
+        """Leva as colunas novas aos arquivos anuais (que depois só são lidos)."""
+        for ano in self.anos_arquivados():
+            conn = sqlite3.connect(self.caminho_arquivo(ano))
+            try:
+                self._migrar_colunas(conn, ajustar=False)
+            finally:
+                conn.close()
+
+    def _criar_resumo_mensal(self, conn) -> bool:
+        """
+        Cria a tabela resumo_mensal e os triggers que a mantêm. Retorna True
+        se a tabela acabou de ser criada (e precisa ser populada).
+        """
+        cur = conn.cursor()
+        existia = cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'resumo_mensal'"
+        ).fetchone()
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS resumo_mensal (
+                mes TEXT NOT NULL,                  -- "AAAA-MM"
+                entidade TEXT NOT NULL,             -- recebimento, despesa, ordem_servico
+                forma_pagamento TEXT NOT NULL,      -- "" quando não definida
+                pago INTEGER NOT NULL,
+                quantidade INTEGER NOT NULL,
+                total REAL NOT NULL,
+                PRIMARY KEY (mes, entidade, forma_pagamento, pago)
+            )
+        """)
+
+        triggers = []
+        for fonte in _FONTES_RESUMO:
+            tabela, colunas = fonte[0], fonte[4]
+            triggers.append(f"""
+            CREATE TRIGGER IF NOT EXISTS {tabela}_resumo_ai AFTER INSERT ON {tabela} BEGIN
+                {_sql_trigger_resumo(fonte, "new", 1)}
+            END;
+            CREATE TRIGGER IF NOT EXISTS {tabela}_resumo_ad AFTER DELETE ON {tabela} BEGIN
+                {_sql_trigger_resumo(fonte, "old", -1)}
+            END;
+            CREATE TRIGGER IF NOT EXISTS {tabela}_resumo_au AFTER UPDATE OF {colunas} ON {tabela} BEGIN
+                {_sql_trigger_resumo(fonte, "old", -1)}
+                {_sql_trigger_resumo(fonte, "new", 1)}
+            END;""")
+        cur.executescript("".join(triggers))
+        conn.commit()
+        return existia is None
+
+    def _criar_busca_textual(self, conn):
+        """
+        Cria as tabelas FTS5 (busca textual) sobre despesas e ordens de
+        serviço, mantidas em sincronia por triggers. Na primeira criação
+        o índice é populado com os registros já existentes.
+        """
+        cur = conn.cursor()
+        existentes = {
+            r[0] for r in cur.execute(
+                "SELECT name FROM sqlite_master WHERE name IN ('despesas_fts', 'ordens_servico_fts')"
+            )
+        }
+
+        try:
+            # remove_diacritics: "correia" encontra "Corréia", "joao" encontra "João"
+            cur.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS despesas_fts USING fts5(
+                    descricao,
+                    content='despesas',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            cur.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS ordens_servico_fts USING fts5(
+                    cliente,
+                    descricao,
+                    content='ordens_servico',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+        except sqlite3.OperationalError:
+            conn.rollback()
+            self.fts_disponivel = False
+            return
+
+        # Triggers de sincronização (padrão de "external content" do FTS5)
+        cur.executescript("""
+            CREATE TRIGGER IF NOT EXISTS despesas_fts_ai AFTER INSERT ON despesas BEGIN
+                INSERT INTO despesas_fts(rowid, descricao) VALUES (new.id, new.descricao);
+            END;
+            CREATE TRIGGER IF NOT EXISTS despesas_fts_ad AFTER DELETE ON despesas BEGIN
+                INSERT INTO despesas_fts(despesas_fts, rowid, descricao)
+                VALUES ('delete', old.id, old.descricao);
+            END;
+            CREATE TRIGGER IF NOT EXISTS despesas_fts_au AFTER UPDATE OF descricao ON despesas BEGIN
+                INSERT INTO despesas_fts(despesas_fts, rowid, descricao)
+                VALUES ('delete', old.id, old.descricao);
+                INSERT INTO despesas_fts(rowid, descricao) VALUES (new.id, new.descricao);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS ordens_servico_fts_ai AFTER INSERT ON ordens_servico BEGIN
+                INSERT INTO ordens_servico_fts(rowid, cliente, descricao)
+                VALUES (new.id, new.cliente, new.descricao);
+            END;
+            CREATE TRIGGER IF NOT EXISTS ordens_servico_fts_ad AFTER DELETE ON ordens_servico BEGIN
+                INSERT INTO ordens_servico_fts(ordens_servico_fts, rowid, cliente, descricao)
+                VALUES ('delete', old.id, old.cliente, old.descricao);
+            END;
+            CREATE TRIGGER IF NOT EXISTS ordens_servico_fts_au AFTER UPDATE OF cliente, descricao ON ordens_servico BEGIN
+                INSERT INTO ordens_servico_fts(ordens_servico_fts, rowid, cliente, descricao)
+                VALUES ('delete', old.id, old.cliente, old.descricao);
+                INSERT INTO ordens_servico_fts(rowid, cliente, descricao)
+                VALUES (new.id, new.cliente, new.descricao);
+            END;
+        """)
+
+        if "despesas_fts" not in existentes:
+            cur.execute("INSERT INTO despesas_fts(despesas_fts) VALUES ('rebuild')")
+        if "ordens_servico_fts" not in existentes:
+            cur.execute("INSERT INTO ordens_servico_fts(ordens_servico_fts) VALUES ('rebuild')")
+
+        conn.commit()
+
     def executar(self, sql: str, params  = ()) -> int:
         conn = self._conectar()
         cur = conn.cursor()
@@ -93,6 +512,17 @@ class Database:
 
         return last_id
     
+    def alterar(self, sql: str, params=()) -> int:
+        """Executa um UPDATE/DELETE e retorna quantas linhas foram afetadas."""
+        conn = self._conectar()
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        conn.commit()
+        afetadas = cur.rowcount
+        conn.close()
+
+        return afetadas
+    
     def consultar(self, sql: str, params = ()):
         conn = self._conectar()
         cur = conn.cursor()
@@ -101,4 +531,186 @@ class Database:
         conn.close()
 
         return rows
+
+    @contextmanager
+    def transacao(self):
+        """
+        Conexão para vários comandos que precisam ser gravados juntos:
+        commit no fim do bloco, rollback se ocorrer um erro.
+        """
+        conn = self._conectar()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ========= RESUMO MENSAL =========
+
+    def _agregar_lancamentos(self) -> Dict[tuple, list]:
+        """Resumo calculado direto dos lançamentos (principal e arquivos)."""
+        totais: Dict[tuple, list] = {}
+        for fonte in _FONTES_RESUMO:
+            for mes, entidade, forma, pago, qtd, total in self.consultar_por_data(
+                _sql_agregar_resumo(fonte), fonte[0]
+            ):
+                item = totais.setdefault((mes, entidade, forma, pago), [0, 0.0])
+                item[0] += qtd
+                item[1] += total
+        return totais
+
+    def reconstruir_resumo_mensal(self) -> None:
+        """Refaz a tabela resumo_mensal do zero a partir dos lançamentos."""
+        linhas = [(*chave, qtd, total) for chave, (qtd, total) in self._agregar_lancamentos().items()]
+        with self.transacao() as conn:
+            conn.execute("DELETE FROM resumo_mensal")
+            conn.executemany("INSERT INTO resumo_mensal VALUES (?, ?, ?, ?, ?, ?)", linhas)
+
+    def verificar_resumo_mensal(self) -> List[tuple]:
+        """
+        Compara resumo_mensal com os lançamentos. Retorna as chaves
+        (mes, entidade, forma_pagamento, pago) divergentes; vazia = ok.
+        """
+        esperado = self._agregar_lancamentos()
+        atual = {
+            tuple(r[:4]): r[4:]
+            for r in self.consultar("SELECT mes, entidade, forma_pagamento, pago, quantidade, total FROM resumo_mensal")
+        }
+        divergentes = []
+        for chave in esperado.keys() | atual.keys():
+            qtd_e, total_e = esperado.get(chave, (0, 0.0))
+            qtd_a, total_a = atual.get(chave, (0, 0.0))
+            if qtd_e != qtd_a or abs(total_e - total_a) > 0.005:
+                divergentes.append(chave)
+        return sorted(divergentes)
+
+    # ========= ARQUIVOS ANUAIS =========
+
+    def caminho_arquivo(self, ano: int) -> str:
+        """financeiro.db -> financeiro_2023.db, na mesma pasta do principal."""
+        base, ext = os.path.splitext(self.caminho_banco)
+        return f"{base}_{ano}{ext or '.db'}"
+
+    def anos_arquivados(self) -> List[int]:
+        if self._anos_arquivados is None:
+            base, ext = os.path.splitext(os.path.abspath(self.caminho_banco))
+            padrao = re.compile(re.escape(os.path.basename(base)) + r"_(\d{4})" + re.escape(ext or ".db") + "$")
+            anos = []
+            for nome in os.listdir(os.path.dirname(base)):
+                m = padrao.match(nome)
+                if m:
+                    anos.append(int(m.group(1)))
+            self._anos_arquivados = sorted(anos)
+        return list(self._anos_arquivados)
+
+    def _anos_no_intervalo(self, data_inicio: Optional[date], data_fim: Optional[date]) -> List[int]:
+        return [
+            ano for ano in self.anos_arquivados()
+            if (data_inicio is None or ano >= data_inicio.year)
+            and (data_fim is None or ano <= data_fim.year)
+        ]
+
+    @contextmanager
+    def conexao(self, anos: Iterable[int] = ()):
+        """
+        Conexão com o banco principal e, anexados como `arq_AAAA` (somente
+        leitura), os arquivos dos `anos` pedidos.
+        """
+        conn = self._conectar()
+        try:
+            for ano in anos:
+                uri = "file:" + pathname2url(os.path.abspath(self.caminho_arquivo(ano))) + "?mode=ro"
+                conn.execute(f"ATTACH DATABASE ? AS arq_{int(ano)}", (uri,))
+            yield conn
+        finally:
+            conn.close()
+
+    def consultar_por_data(
+        self,
+        sql: str,
+        tabela: str,
+        params=(),
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        ordem: str = "",
+        principal: bool = True,
+    ):
+        """
+        Executa `sql` (com `{tabela}` no lugar do nome da tabela) no banco
+        principal e nos arquivos anuais que o intervalo alcança (sem datas:
+        todos), juntando com UNION ALL. `ordem` (ex.: "ORDER BY id") vale
+        para o resultado todo enquanto couber numa conexão só (até
+        MAX_ANEXOS arquivos); acima disso cada lote vem na sua ordem. Com
+        `principal` falso, só os arquivos são consultados.
+        """
+        anos = self._anos_no_intervalo(data_inicio, data_fim)
+        if not principal and not anos:
+            return []
+        rows = []
+        # O principal vai no primeiro lote; cada lote respeita MAX_ANEXOS
+        lotes = [anos[i:i + MAX_ANEXOS] for i in range(0, len(anos), MAX_ANEXOS)] or [[]]
+        for n, lote in enumerate(lotes):
+            partes = [sql.format(tabela=tabela)] if n == 0 and principal else []
+            partes += [sql.format(tabela=f"arq_{ano}.{tabela}") for ano in lote]
+            consulta = " UNION ALL ".join(partes)
+            if ordem:
+                consulta += " " + ordem
+            with self.conexao(lote) as conn:
+                rows += conn.execute(consulta, tuple(params) * len(partes)).fetchall()
+        return rows
+
+    def arquivar_ano(self, ano: int) -> Dict[str, int]:
+        """
+        Move os lançamentos de um ano já encerrado para o arquivo anual
+        (criado se não existir). Principal e arquivo mudam na mesma
+        transação: ou tudo é movido, ou nada. Contas a prazo e ordens de
+        serviço ainda não pagas ficam no principal. Retorna quantos registros foram movidos
+        por tabela.
+        """
+        if ano >= date.today().year:
+            raise ValueError("Só é possível arquivar anos já encerrados.")
+        limites = (f"{ano:04d}-01-01", f"{ano:04d}-12-31")
+        movidos = {}
+
+        conn = self._conectar()
+        conn.isolation_level = None     # BEGIN/COMMIT explícitos
+        try:
+            conn.execute("ATTACH DATABASE ? AS arq", (self.caminho_arquivo(ano),))
+            conn.execute("BEGIN IMMEDIATE")
+            for tabela, ddl in _DDL_LANCAMENTOS.items():
+                conn.execute(ddl.format(esquema="arq."))
+                for sql in _sql_indices_lancamentos(tabela, "arq."):
+                    conn.execute(sql)
+                colunas = ", ".join(r[1] for r in conn.execute(f"PRAGMA main.table_info({tabela})"))
+                filtro = "WHERE data BETWEEN ? AND ?"
+                if tabela in _FICA_NO_PRINCIPAL:
+                    filtro += f" AND NOT ({_FICA_NO_PRINCIPAL[tabela]})"
+                cur = conn.execute(
+                    f"INSERT INTO arq.{tabela} ({colunas}) SELECT {colunas} FROM main.{tabela} {filtro}",
+                    limites,
+                )
+                movidos[tabela] = cur.rowcount
+                # Os triggers tiram do resumo o que sai do principal; o resumo
+                # cobre todos os anos, então essa parte é devolvida em seguida
+                fonte = next(f for f in _FONTES_RESUMO if f[0] == tabela)
+                resumo = conn.execute(
+                    _sql_agregar_resumo(fonte, f"main.{tabela}", filtro), limites
+                ).fetchall()
+                conn.execute(f"DELETE FROM main.{tabela} {filtro}", limites)
+                conn.executemany(_sql_somar_resumo("?, ?, ?, ?, ?, ?"), resumo)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        self._anos_arquivados = None
+        if any(movidos.values()):
+            # Devolve ao sistema o espaço liberado no principal
+            conn = self._conectar()
+            conn.execute("VACUUM")
+            conn.close()
+        return movidos
     
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Módulo de eventos de domínio.
+
+Quando o SistemaFinanceiro grava algo (registrar_*, atualizar_*,
+marcar como paga), ele publica um EventoAlteracao no BarramentoEventos.
+Quem mostra dados (cards do painel, relatórios abertos, página de
+funcionários) se inscreve e aplica só a diferença, em vez de recarregar
+tudo do banco às cegas.
+
+Não depende de Qt: os assinantes são funções Python comuns, chamadas na
+mesma thread que fez a alteração.
+"""
+
+import traceback
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# Entidades
+RECEBIMENTO = "recebimento"
+DESPESA = "despesa"
+ORDEM_SERVICO = "ordem_servico"
+FUNCIONARIO = "funcionario"
+
+# Ações
+CRIADO = "criado"
+ATUALIZADO = "atualizado"
+
+
+@dataclass(frozen=True)
+class EventoAlteracao:
+    """
+    Uma alteração já gravada no banco.
+
+    Atributos:
+        entidade: RECEBIMENTO, DESPESA, ORDEM_SERVICO ou FUNCIONARIO.
+        id: Identificador do registro alterado.
+        acao: CRIADO ou ATUALIZADO.
+        anterior: Modelo como estava antes (None quando criado).
+        atual: Modelo como ficou depois da alteração.
+    """
+    entidade: str
+    id: int
+    acao: str
+    anterior: Optional[Any] = None
+    atual: Optional[Any] = None
+
+    @property
+    def data_anterior(self) -> Optional[date]:
+        return getattr(self.anterior, "data", None)
+
+    @property
+    def data_atual(self) -> Optional[date]:
+        return getattr(self.atual, "data", None)
+
+    @property
+    def periodo_anterior(self) -> Optional[Tuple[int, int]]:
+        """(ano, mês) em que o registro estava, ou None."""
+        d = self.data_anterior
+        return (d.year, d.month) if d else None
+
+    @property
+    def periodo_atual(self) -> Optional[Tuple[int, int]]:
+        """(ano, mês) em que o registro ficou, ou None."""
+        d = self.data_atual
+        return (d.year, d.month) if d else None
+
+    def afeta_periodo(self, data_inicio: Optional[date], data_fim: Optional[date]) -> bool:
+        """
+        Indica se a alteração mexe em um intervalo de datas (limites None =
+        sem limite): vale tanto a data antiga quanto a nova, pois um
+        registro pode ter saído ou entrado no intervalo.
+        """
+        for d in (self.data_anterior, self.data_atual):
+            if d is None:
+                continue
+            if data_inicio and d < data_inicio:
+                continue
+            if data_fim and d > data_fim:
+                continue
+            return True
+        return False
+
+
+class BarramentoEventos:
+    """Lista de assinantes; cada publicação é repassada a todos os interessados."""
+
+    def __init__(self):
+        self._assinantes: List[Tuple[Callable[[EventoAlteracao], None], Optional[frozenset]]] = []
+
+    def inscrever(
+        self,
+        callback: Callable[[EventoAlteracao], None],
+        entidades: Optional[Iterable[str]] = None,
+    ) -> Callable[[], None]:
+        """
+        Inscreve `callback` para receber os eventos das `entidades` (None =
+        todas). Retorna uma função que cancela a inscrição.
+        """
+        item = (callback, frozenset(entidades) if entidades is not None else None)
+        self._assinantes.append(item)
+
+        def cancelar():
+            if item in self._assinantes:
+                self._assinantes.remove(item)
+        return cancelar
+
+    def publicar(self, evento: EventoAlteracao) -> None:
+        # Copia a lista: um assinante pode cancelar a inscrição durante o aviso
+        for callback, entidades in list(self._assinantes):
+            if entidades is not None and evento.entidade not in entidades:
+                continue
+            try:
+                callback(evento)
+            except Exception:
+                # A alteração já foi gravada: um assinante com problema não
+                # pode fazer a operação parecer que falhou.
+                traceback.print_exc()
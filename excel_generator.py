@@ -9,20 +9,31 @@ Gera relatórios em Excel (.xlsx) com:
 - Formatação de datas (dd/MM/yyyy) e moeda (R$)
 """
 
-from typing import List, Tuple, Any, Optional
+from typing import Iterable, List, Tuple, Any, Optional
 from datetime import date, datetime
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
 
 
+def _largura_valor(valor: Any) -> int:
+    """Quantos caracteres o valor ocupa na planilha, já formatado."""
+    if isinstance(valor, float):
+        return len(f"R$ {valor:,.2f}")
+    if isinstance(valor, date):
+        return 12  # dd/mm/yyyy
+    if valor is not None:
+        return len(str(valor))
+    return 0
+
+
 def gerar_excel_relatorio(
     caminho_saida: str,
     titulo: str,
     periodo_descricao: str,
     saldo_final: str,
     colunas: List[str],
-    linhas: List[Tuple],
+    linhas: Iterable[Tuple],
     *,
     nome_sistema: str = "Sistema Financeiro - Torneadora",
     emitido_em: Optional[datetime] = None,
@@ -36,7 +47,8 @@ def gerar_excel_relatorio(
         periodo_descricao: Descrição do período filtrado
         saldo_final: Texto do saldo/total final formatado
         colunas: Lista com nomes das colunas
-        linhas: Lista de tuplas com os dados
+        linhas: Tuplas com os dados (lista ou gerador: as linhas são
+            gravadas à medida que chegam, sem montar uma lista antes)
         nome_sistema: Nome do sistema para o cabeçalho
         emitido_em: Data/hora de emissão (default: agora)
         
@@ -45,7 +57,6 @@ def gerar_excel_relatorio(
     """
     try:
         emitido_em = emitido_em or datetime.now()
-        total_registros = len(linhas)
         
         wb = Workbook()
         ws = wb.active
@@ -115,8 +126,9 @@ def gerar_excel_relatorio(
         # Total de registros
         ws.cell(row=row, column=1, value="Total de registros:")
         ws.cell(row=row, column=1).font = font_meta_bold
-        ws.cell(row=row, column=2, value=total_registros)
-        ws.cell(row=row, column=2).font = font_meta
+        # Preenchido depois das linhas, quando a contagem é conhecida
+        cell_total = ws.cell(row=row, column=2)
+        cell_total.font = font_meta
         row += 2
         
         # Saldo final (destacado)
@@ -145,8 +157,14 @@ def gerar_excel_relatorio(
             cell.border = thin_border
         row += 1
         
-        # Dados
+        # Dados (as larguras das colunas são medidas nas 100 primeiras)
+        larguras = [len(str(nome)) + 2 for nome in colunas]
+        total_registros = 0
         for linha_idx, linha in enumerate(linhas):
+            total_registros += 1
+            if linha_idx < 100:
+                for col_idx, valor in enumerate(linha[:len(colunas)]):
+                    larguras[col_idx] = max(larguras[col_idx], _largura_valor(valor))
             for col_idx, valor in enumerate(linha, start=1):
                 cell = ws.cell(row=row, column=col_idx)
                 
@@ -176,6 +194,8 @@ def gerar_excel_relatorio(
             
             row += 1
         
+        cell_total.value = total_registros
+        
         # ===== FILTROS AUTOMÁTICOS =====
         
         # Define a área da tabela para auto-filtro
@@ -190,31 +210,10 @@ def gerar_excel_relatorio(
         
         # ===== AUTO-DIMENSIONAR COLUNAS =====
         
-        for col_idx in range(1, len(colunas) + 1):
-            max_length = 0
-            col_letter = get_column_letter(col_idx)
-            
-            # Verifica o cabeçalho
-            header_value = colunas[col_idx - 1]
-            max_length = max(max_length, len(str(header_value)) + 2)
-            
-            # Verifica os dados (até 100 linhas para performance)
-            for linha_idx, linha in enumerate(linhas[:100]):
-                if col_idx <= len(linha):
-                    valor = linha[col_idx - 1]
-                    if isinstance(valor, float):
-                        cell_len = len(f"R$ {valor:,.2f}")
-                    elif isinstance(valor, date):
-                        cell_len = 12  # dd/mm/yyyy
-                    elif valor is not None:
-                        cell_len = len(str(valor))
-                    else:
-                        cell_len = 0
-                    max_length = max(max_length, cell_len)
-            
+        for col_idx, max_length in enumerate(larguras, start=1):
             # Aplica largura (com margem)
             adjusted_width = min(max_length + 3, 50)  # Max 50 caracteres
-            ws.column_dimensions[col_letter].width = adjusted_width
+            ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
         
         # ===== SALVAR =====
         
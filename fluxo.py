@@ -0,0 +1,156 @@
+"""
+Módulo de projeção do fluxo de caixa.
+
+Soma por dia o que deve entrar e sair do caixa nos próximos dias: saldos
+das ordens de serviço em aberto, parcelas das contas a prazo e pagamentos
+da folha ainda não lançados. Não conhece banco de dados nem interface:
+quem usa a projeção informa os valores previstos de cada origem e troca
+só a origem que mudou.
+"""
+
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from models import DiaProjecao, Despesa, LancamentoFolha, OrdemServico, Parcela, ProjecaoFluxo
+
+# Origens dos valores previstos (primeiro elemento da chave de cada origem)
+ORDEM = "ordem"
+PARCELAS = "parcelas"
+FOLHA = "folha"
+
+# Dias entre a emissão da OS e o recebimento esperado
+PRAZO_RECEBIMENTO_DIAS = 30
+
+
+def previsto_da_ordem(os_: OrdemServico) -> List[Tuple[date, float]]:
+    """Saldo em aberto da OS, esperado PRAZO_RECEBIMENTO_DIAS depois da emissão."""
+    if os_.foi_pago or not os_.saldo_aberto:
+        return []
+    return [(os_.data + timedelta(days=PRAZO_RECEBIMENTO_DIAS), os_.saldo_aberto)]
+
+
+def previsto_das_parcelas(parcelas: Iterable[Parcela]) -> List[Tuple[date, float]]:
+    """Parcelas ainda não pagas, como saídas no vencimento."""
+    return [(p.data_vencimento, -p.valor) for p in parcelas if not p.foi_pago]
+
+
+def lancado_da_compra(despesa: Despesa, parcelas: Iterable[Parcela]) -> Optional[Tuple[date, float]]:
+    """
+    O que o saldo por data já tirou, na data da compra, de uma conta a
+    prazo e que ainda não saiu do caixa: o valor das parcelas em aberto.
+    """
+    em_aberto = sum(p.valor for p in parcelas if not p.foi_pago)
+    return (despesa.data, -em_aberto) if em_aberto else None
+
+
+def previsto_da_folha(previstos: Iterable[LancamentoFolha]) -> List[Tuple[date, float]]:
+    """Pagamentos da folha que ainda não viraram despesa, na data de pagamento."""
+    return [
+        (p.obrigacao.data, -p.valor) for p in previstos if not p.lancado and p.valor is not None
+    ]
+
+
+class FluxoPrevisto:
+    """
+    Entradas e saídas previstas somadas por dia (ordinal -> [entradas, saídas]).
+
+    Cada origem (uma OS, as parcelas de uma despesa, a folha) guarda o que
+    pôs em cada dia: trocá-la tira a contribuição antiga e põe a nova, sem
+    refazer as demais. A projeção é uma passada pelos dias com movimento
+    seguida de uma soma acumulada sobre o horizonte.
+
+    Uma origem também pode substituir um valor já lançado no saldo por
+    data (a compra a prazo, que o saldo tira na data da compra e o caixa
+    só paga nas parcelas): esse valor sai do saldo inicial, se a data já
+    passou, ou do fluxo lançado do dia, se ainda não chegou.
+    """
+
+    def __init__(self):
+        self._por_dia: Dict[int, List[float]] = {}
+        self._por_origem: Dict[Hashable, List[Tuple[int, float]]] = {}
+        self._substituidos: Dict[int, float] = {}
+        self._substituido_por_origem: Dict[Hashable, Tuple[int, float]] = {}
+
+    def __len__(self):
+        return len(self._por_origem)
+
+    def substituir(
+        self, chave: Tuple, valores: Iterable[Tuple[date, float]],
+        lancado: Optional[Tuple[date, float]] = None,
+    ) -> None:
+        """
+        Troca o que a origem `chave` prevê: (dia, valor) com valor positivo
+        para entradas e negativo para saídas. `lancado` é o (dia, valor) já
+        contado no saldo por data que esses valores substituem.
+        """
+        for o, valor in self._por_origem.pop(chave, ()):
+            self._somar(o, valor, -1)
+        novos = [(dia.toordinal(), valor) for dia, valor in valores if valor]
+        for o, valor in novos:
+            self._somar(o, valor, 1)
+        if novos:
+            self._por_origem[chave] = novos
+
+        antigo = self._substituido_por_origem.pop(chave, None)
+        if antigo is not None:
+            self._somar_substituido(*antigo, -1)
+        if lancado is not None and lancado[1]:
+            novo = (lancado[0].toordinal(), lancado[1])
+            self._somar_substituido(*novo, 1)
+            self._substituido_por_origem[chave] = novo
+
+    def _somar(self, o: int, valor: float, sinal: int) -> None:
+        dia = self._por_dia.setdefault(o, [0.0, 0.0])
+        dia[0 if valor > 0 else 1] += sinal * valor
+        if abs(dia[0]) < 1e-9 and abs(dia[1]) < 1e-9:
+            del self._por_dia[o]
+
+    def _somar_substituido(self, o: int, valor: float, sinal: int) -> None:
+        total = self._substituidos.get(o, 0.0) + sinal * valor
+        if abs(total) < 1e-9:
+            self._substituidos.pop(o, None)
+        else:
+            self._substituidos[o] = total
+
+    def projetar(
+        self, hoje: date, dias: int, saldo_anterior: float, lancados: Sequence[float] = ()
+    ) -> ProjecaoFluxo:
+        """
+        Saldo dia a dia de `hoje` até `dias` - 1 dias depois, partindo do
+        saldo por data até ontem (`saldo_anterior`). O que estava previsto
+        para antes de hoje (OS e parcelas atrasadas) conta hoje. `lancados`
+        é o fluxo líquido já gravado de cada dia do horizonte (lançamentos
+        com data futura), a partir de hoje.
+        """
+        h = hoje.toordinal()
+        entradas = [0.0] * dias
+        saidas = [0.0] * dias
+        for o, (entrada, saida) in self._por_dia.items():
+            i = max(o - h, 0)
+            if i < dias:
+                entradas[i] += entrada
+                saidas[i] -= saida
+        lancados = list(lancados[:dias])
+        saldo_inicial = saldo_anterior
+        for o, valor in self._substituidos.items():
+            i = o - h
+            if i < 0:
+                saldo_inicial -= valor
+            elif i < len(lancados):
+                lancados[i] -= valor
+        for i, valor in enumerate(lancados):
+            if valor > 0:
+                entradas[i] += valor
+            else:
+                saidas[i] -= valor
+        saldos = accumulate((e - s for e, s in zip(entradas, saidas)), initial=saldo_inicial)
+        next(saldos)
+        return ProjecaoFluxo(
+            hoje=hoje,
+            saldo_inicial=saldo_inicial,
+            dias=[
+                DiaProjecao(hoje + timedelta(days=i), entradas[i], saidas[i], saldo)
+                for i, saldo in enumerate(saldos)
+            ],
+        )
@@ -0,0 +1,86 @@
+"""
+Módulo do calendário da folha de pagamento.
+
+A partir dos funcionários cadastrados (admissão, demissão, dia de
+pagamento, mês do 13º e mês de férias), calcula o que a folha deve pagar
+em cada mês. Não conhece banco de dados nem interface: quem usa o
+calendário informa os funcionários e o refaz quando eles mudam.
+"""
+
+from calendar import monthrange
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models import Funcionario, ObrigacaoFolha, ObrigacoesMes
+
+SALARIO = "Salário"
+DECIMO_TERCEIRO = "13º salário"
+FERIAS = "Férias"
+
+
+def valor_obrigacao(obrigacao: ObrigacaoFolha) -> Optional[float]:
+    """
+    Valor a lançar para a obrigação: salário e 13º pelo salário cheio;
+    férias pelo terço constitucional (o salário do mês já sai à parte).
+    None se o funcionário não tem salário cadastrado.
+    """
+    salario = obrigacao.funcionario.salario
+    if not salario:
+        return None
+    if obrigacao.tipo == FERIAS:
+        return round(salario / 3, 2)
+    return salario
+
+
+def _ativo_no_mes(func: Funcionario, inicio: date, fim: date) -> bool:
+    """Admitido até o fim do mês e não demitido antes do início dele."""
+    return func.data_admissao <= fim and (func.data_demissao is None or func.data_demissao >= inicio)
+
+
+def _tem_direito_a_ferias(func: Funcionario, fim: date) -> bool:
+    """Férias só depois de 12 meses de casa (período aquisitivo completo)."""
+    a = func.data_admissao
+    return (a.year + 1, a.month, a.day) <= (fim.year, fim.month, fim.day)
+
+
+class CalendarioFolha:
+    """
+    Obrigações da folha por mês, guardadas em um dicionário (ano, mes).
+
+    Os meses em volta da data de referência são calculados na criação; os
+    demais, na primeira consulta. Depois disso cada consulta é uma leitura
+    do dicionário. O calendário não se atualiza: quando um funcionário muda,
+    quem o usa descarta o calendário e monta outro.
+    """
+
+    # Meses calculados antes e depois do mês de referência, na criação
+    MESES_PRE_CALCULADOS = 12
+
+    def __init__(self, funcionarios: Iterable[Funcionario], hoje: date):
+        self._funcionarios: List[Funcionario] = sorted(funcionarios, key=lambda f: (f.dia_pagamento, f.nome))
+        self._meses: Dict[Tuple[int, int], ObrigacoesMes] = {}
+        base = hoje.year * 12 + hoje.month - 1
+        for n in range(base - self.MESES_PRE_CALCULADOS, base + self.MESES_PRE_CALCULADOS + 1):
+            self.mes(n // 12, n % 12 + 1)
+
+    def mes(self, ano: int, mes: int) -> ObrigacoesMes:
+        chave = (ano, mes)
+        if chave not in self._meses:
+            self._meses[chave] = self._calcular(ano, mes)
+        return self._meses[chave]
+
+    def _calcular(self, ano: int, mes: int) -> ObrigacoesMes:
+        ultimo_dia = monthrange(ano, mes)[1]
+        inicio, fim = date(ano, mes, 1), date(ano, mes, ultimo_dia)
+        itens = []
+        for func in self._funcionarios:
+            if not _ativo_no_mes(func, inicio, fim):
+                continue
+            dia = date(ano, mes, min(max(func.dia_pagamento, 1), ultimo_dia))
+            itens.append(ObrigacaoFolha(dia, SALARIO, func))
+            if func.mes_decimo_terceiro == mes:
+                itens.append(ObrigacaoFolha(dia, DECIMO_TERCEIRO, func))
+            if func.mes_ferias == mes and _tem_direito_a_ferias(func, fim):
+                itens.append(ObrigacaoFolha(dia, FERIAS, func))
+        # Funcionários em ordem de dia de pagamento: itens já saem por data
+        return ObrigacoesMes(ano=ano, mes=mes, itens=itens)
@@ -4,6 +4,8 @@ Pacote Interface.
 Este pacote contém toda a lógica de interface gráfica (GUI) da aplicação.
 Foi refatorado para dividir responsabilidades em módulos menores:
 - styles.py: Definições de CSS/QSS
+- theme.py: Aplica o stylesheet único na QApplication
+- dialog_pool.py: Pool de diálogos reaproveitáveis (cadastros e relatórios)
 - helpers.py: Funções utilitárias
 - main_window.py: Janela principal
 - dialogs/: Subpacote com todos os diálogos do sistema.
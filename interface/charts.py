@@ -0,0 +1,141 @@
+"""
+Módulo de gráficos.
+
+Gráfico de linhas simples, desenhado com QPainter (sem depender do
+QtCharts, que não vem em todas as instalações do PySide6). Serve para
+séries curtas, como o saldo projetado dos próximos dias no painel.
+"""
+
+from typing import List, NamedTuple, Optional, Sequence
+
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen
+from PySide6.QtWidgets import QWidget, QSizePolicy
+
+# Cores do tema (ver styles.py)
+POSITIVO = "#00b33c"
+NEGATIVO = "#E53935"
+NEUTRO = "#2196F3"
+TEXTO = "#666666"
+GRADE = "#E0E0E0"
+
+
+def _moeda_curta(valor: float) -> str:
+    """R$ sem centavos, com milhares abreviados (eixo do gráfico)."""
+    if abs(valor) >= 10_000:
+        return f"R$ {valor / 1000:,.0f} mil".replace(",", ".")
+    return f"R$ {valor:,.0f}".replace(",", ".")
+
+
+class Serie(NamedTuple):
+    """Uma linha do gráfico: nome (legenda), valores (None = sem ponto) e cor."""
+    nome: str
+    valores: Sequence[Optional[float]]
+    cor: str = NEUTRO
+    tracejada: bool = False
+
+
+class GraficoLinhas(QWidget):
+    """
+    Linhas sobre um eixo de rótulos (dias, meses). Só os rótulos das pontas
+    (e o do meio) aparecem, e o zero ganha uma linha quando cabe na escala.
+    Os dados são trocados com definir_dados; o desenho é refeito no paint.
+    """
+
+    MARGEM_ESQUERDA = 70
+    MARGEM = 10
+    ALTURA_TEXTO = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rotulos: List[str] = []
+        self._series: List[Serie] = []
+        self.setMinimumHeight(140)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def definir_dados(self, rotulos: Sequence[str], series: Sequence[Serie]) -> None:
+        self._rotulos = list(rotulos)
+        self._series = list(series)
+        self.update()
+
+    def _escala(self):
+        valores = [v for s in self._series for v in s.valores if v is not None]
+        if not valores:
+            return None
+        menor, maior = min(valores), max(valores)
+        if menor == maior:
+            menor, maior = menor - 1, maior + 1
+        return menor, maior
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        escala = self._escala()
+        legenda = len(self._series) > 1
+        topo = self.MARGEM + (self.ALTURA_TEXTO if legenda else 0)
+        area = QRectF(
+            self.MARGEM_ESQUERDA, topo,
+            self.width() - self.MARGEM_ESQUERDA - self.MARGEM,
+            self.height() - topo - self.MARGEM - self.ALTURA_TEXTO,
+        )
+        painter.setPen(QColor(TEXTO))
+        if escala is None or len(self._rotulos) < 1 or area.width() <= 0 or area.height() <= 0:
+            painter.drawText(self.rect(), Qt.AlignCenter, "Sem dados")
+            return
+        menor, maior = escala
+        n = len(self._rotulos)
+
+        def x(i):
+            return area.left() + (area.width() * i / (n - 1) if n > 1 else area.width() / 2)
+
+        def y(v):
+            return area.bottom() - area.height() * (v - menor) / (maior - menor)
+
+        # Grade: topo, base e zero
+        painter.setPen(QPen(QColor(GRADE), 1))
+        painter.drawLine(QPointF(area.left(), area.top()), QPointF(area.right(), area.top()))
+        painter.drawLine(QPointF(area.left(), area.bottom()), QPointF(area.right(), area.bottom()))
+        if menor < 0 < maior:
+            painter.setPen(QPen(QColor(NEGATIVO), 1, Qt.DotLine))
+            painter.drawLine(QPointF(area.left(), y(0)), QPointF(area.right(), y(0)))
+
+        # Eixos: valores extremos e rótulos das pontas
+        painter.setPen(QColor(TEXTO))
+        caixa_y = QRectF(0, 0, self.MARGEM_ESQUERDA - 6, self.ALTURA_TEXTO)
+        caixa_y.moveCenter(QPointF(caixa_y.center().x(), area.top()))
+        painter.drawText(caixa_y, Qt.AlignRight | Qt.AlignVCenter, _moeda_curta(maior))
+        caixa_y.moveCenter(QPointF(caixa_y.center().x(), area.bottom()))
+        painter.drawText(caixa_y, Qt.AlignRight | Qt.AlignVCenter, _moeda_curta(menor))
+        for i in sorted({0, n // 2, n - 1}):
+            caixa_x = QRectF(0, area.bottom() + 2, 80, self.ALTURA_TEXTO)
+            caixa_x.moveCenter(QPointF(x(i), caixa_x.center().y()))
+            painter.drawText(caixa_x, Qt.AlignCenter, self._rotulos[i])
+
+        # Linhas (um valor None interrompe a linha)
+        for serie in self._series:
+            caminho = QPainterPath()
+            aberto = False
+            for i, v in enumerate(serie.valores[:n]):
+                if v is None:
+                    aberto = False
+                    continue
+                ponto = QPointF(x(i), y(v))
+                if aberto:
+                    caminho.lineTo(ponto)
+                else:
+                    caminho.moveTo(ponto)
+                    aberto = True
+            painter.setPen(QPen(QColor(serie.cor), 2, Qt.DashLine if serie.tracejada else Qt.SolidLine))
+            painter.drawPath(caminho)
+
+        # Legenda (só com mais de uma série)
+        if legenda:
+            pos = area.left()
+            for serie in self._series:
+                painter.setPen(QPen(QColor(serie.cor), 2, Qt.DashLine if serie.tracejada else Qt.SolidLine))
+                meio = self.MARGEM + self.ALTURA_TEXTO / 2
+                painter.drawLine(QPointF(pos, meio), QPointF(pos + 16, meio))
+                painter.setPen(QColor(TEXTO))
+                largura = painter.fontMetrics().horizontalAdvance(serie.nome)
+                painter.drawText(QRectF(pos + 20, self.MARGEM, largura + 4, self.ALTURA_TEXTO), Qt.AlignVCenter, serie.nome)
+                pos += 20 + largura + 16
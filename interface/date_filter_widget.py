@@ -3,12 +3,16 @@ Módulo do Widget de Filtro de Data.
 
 Fornece um widget reutilizável para filtrar dados por dia, mês ou ano específicos.
 O usuário pode escolher o modo de filtro e selecionar a data apropriada.
+
+As mudanças são agrupadas: o sinal filterChanged só é emitido depois de um
+curto intervalo sem novas alterações, e apenas se a faixa de datas efetiva
+(get_date_range) mudou. Rolar o seletor de mês custa, no máximo, uma recarga.
 """
 
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QLabel, QComboBox, QDateEdit
 )
-from PySide6.QtCore import Qt, QDate, Signal
+from PySide6.QtCore import Qt, QDate, Signal, QTimer
 from datetime import date
 from typing import Tuple
 from PySide6.QtCore import QLocale
@@ -18,13 +22,26 @@ class DateFilterWidget(QWidget):
     """
     Widget de filtro de data com três modos: Dia, Mês e Ano.
     
-    Emite o sinal filterChanged quando o usuário altera o filtro.
+    Emite o sinal filterChanged quando o usuário altera o filtro
+    (com debounce e somente se a faixa de datas mudou).
     """
     
     filterChanged = Signal()  # Sinal emitido quando o filtro muda
     
+    # Tempo (ms) sem novas alterações antes de emitir filterChanged
+    DEBOUNCE_MS = 250
+    
     def __init__(self, parent=None):
         super().__init__(parent)
+        
+        # Última faixa efetivamente emitida (começa em "Tudo")
+        self._ultimo_range = (None, None)
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._emitir_se_mudou)
+        
         self._setup_ui()
         
     def _setup_ui(self):
@@ -52,18 +69,24 @@ class DateFilterWidget(QWidget):
         layout.addWidget(self.date_edit)
         
         # Label de informação sobre o filtro atual
-        self.lbl_info = QLabel("")
-        self.lbl_info.setStyleSheet("color: #666; font-style: italic;")
+        self.lbl_info = QLabel("", objectName="filterInfo")
         layout.addWidget(self.lbl_info)
         
         layout.addStretch()
         
-        # Inicializa com modo "Tudo"
+        # Inicializa com modo "Tudo" (sem disparar o sinal de mudança)
+        self.combo_modo.blockSignals(True)
         self.combo_modo.setCurrentIndex(3)
-        self._on_modo_changed()
+        self.combo_modo.blockSignals(False)
+        self._atualizar_modo_ui()
         
     def _on_modo_changed(self):
-        """Atualiza a interface quando o modo de filtro muda."""
+        """Atualiza a interface quando o modo de filtro muda e agenda a emissão."""
+        self._atualizar_modo_ui()
+        self._timer.start()
+    
+    def _atualizar_modo_ui(self):
+        """Ajusta formato/habilitação do seletor de data conforme o modo."""
         modo = self.combo_modo.currentText()
         
         if modo == "Dia":
@@ -81,12 +104,19 @@ class DateFilterWidget(QWidget):
         else:  # Tudo
             self.date_edit.setEnabled(False)
             self.lbl_info.setText("Mostrando todos os registros")
-        
-        self.filterChanged.emit()
     
     def _on_date_changed(self):
-        """Atualiza quando a data selecionada muda."""
+        """Atualiza o texto na hora e agenda a emissão (reinicia o debounce)."""
         self._update_info_label()
+        self._timer.start()
+    
+    def _emitir_se_mudou(self):
+        """Emite filterChanged apenas se a faixa de datas efetiva mudou."""
+        self._timer.stop()
+        faixa = self.get_date_range()
+        if faixa == self._ultimo_range:
+            return
+        self._ultimo_range = faixa
         self.filterChanged.emit()
     
     def _update_info_label(self):
@@ -157,6 +187,10 @@ class DateFilterWidget(QWidget):
             modo_texto: "Dia", "Mês", "Ano" ou "Tudo"
             data_ref: Data para setar no date_edit. Se None, usa data atual.
         """
+        # Bloqueia os sinais internos para não processar a mudança duas vezes
+        self.combo_modo.blockSignals(True)
+        self.date_edit.blockSignals(True)
+        
         index = self.combo_modo.findText(modo_texto)
         if index >= 0:
             self.combo_modo.setCurrentIndex(index)
@@ -166,5 +200,9 @@ class DateFilterWidget(QWidget):
         elif modo_texto != "Tudo":
             self.date_edit.setDate(QDate.currentDate())
         
-        # Força atualização
-        self._on_modo_changed()
+        self.combo_modo.blockSignals(False)
+        self.date_edit.blockSignals(False)
+        
+        # Mudança programática: aplica na hora, sem esperar o debounce
+        self._atualizar_modo_ui()
+        self._emitir_se_mudou()
@@ -0,0 +1,80 @@
+"""
+Módulo de Pool de Diálogos.
+
+Guarda uma instância de cada diálogo (cadastros e relatórios) para ser
+reaproveitada entre aberturas. Na primeira vez o diálogo é construído;
+nas seguintes só tem o formulário/filtros "zerados" pelo método
+`resetar()` do próprio diálogo, sem recriar layout, widgets e QSS.
+
+Os diálogos mais usados podem ser pré-construídos em segundo plano
+(`aquecer`), um por vez, quando o event loop está ocioso.
+"""
+
+from typing import Callable, Dict, List
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class DialogPool(QObject):
+    """Pool de diálogos reaproveitáveis, identificados por uma chave."""
+
+    # Atraso antes de começar o aquecimento: deixa a janela principal
+    # terminar de aparecer antes de gastar tempo com diálogos.
+    ATRASO_AQUECIMENTO_MS = 800
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._fabricas: Dict[str, Callable] = {}
+        self._dialogos: Dict[str, object] = {}
+        self._fila_aquecimento: List[str] = []
+
+        self._timer_aquecimento = QTimer(self)
+        self._timer_aquecimento.setSingleShot(True)
+        self._timer_aquecimento.timeout.connect(self._aquecer_proximo)
+
+    def registrar(self, chave: str, fabrica: Callable) -> None:
+        """
+        Registra a função que constrói o diálogo `chave`. Ela recebe os mesmos
+        kwargs de `obter` (na primeira abertura) ou nenhum (no aquecimento).
+        """
+        self._fabricas[chave] = fabrica
+
+    def construido(self, chave: str) -> bool:
+        return chave in self._dialogos
+
+    def _construir(self, chave: str, **kwargs):
+        if chave not in self._dialogos:
+            self._dialogos[chave] = self._fabricas[chave](**kwargs)
+        return self._dialogos[chave]
+
+    def obter(self, chave: str, **kwargs):
+        """
+        Retorna o diálogo pronto para abrir. Se ele já existia, é resetado
+        (os kwargs vão para `resetar`, ex.: filtro_inicial dos relatórios).
+        """
+        if chave in self._fila_aquecimento:
+            self._fila_aquecimento.remove(chave)
+        if chave in self._dialogos:
+            dlg = self._dialogos[chave]
+            dlg.resetar(**kwargs)
+            return dlg
+        # Primeira abertura: constrói já no estado pedido
+        return self._construir(chave, **kwargs)
+
+    def aquecer(self, chaves) -> None:
+        """
+        Agenda a construção dos diálogos em `chaves` para quando a aplicação
+        estiver ociosa, um por ciclo do event loop (não trava a interface).
+        """
+        for chave in chaves:
+            if chave not in self._dialogos and chave not in self._fila_aquecimento:
+                self._fila_aquecimento.append(chave)
+        if self._fila_aquecimento and not self._timer_aquecimento.isActive():
+            self._timer_aquecimento.start(self.ATRASO_AQUECIMENTO_MS)
+
+    def _aquecer_proximo(self):
+        if not self._fila_aquecimento:
+            return
+        self._construir(self._fila_aquecimento.pop(0))
+        if self._fila_aquecimento:
+            self._timer_aquecimento.start(0)
@@ -9,12 +9,11 @@ Contém os diálogos para registrar novas entradas:
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QPushButton, 
-    QLineEdit, QDateEdit, QComboBox, QCheckBox, QFileDialog, QMessageBox
+    QLineEdit, QDateEdit, QComboBox, QCheckBox, QFileDialog, QMessageBox, QSpinBox
 )
 from PySide6.QtCore import Qt, QDate, QObject, QEvent
 from typing import Optional
 
-from interface.styles import DIALOG_STYLES
 from interface.helpers import (
     mapear_forma_pagamento, 
     _formatar_texto_moeda, 
@@ -42,7 +41,6 @@ class NovaReceitaDialog(QDialog):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.resize(640, 420)
-        self.setStyleSheet(DIALOG_STYLES)
 
         # Instala o filtro de eventos para navegação com Enter
         self.enter_filter = EnterKeyFilter(self)
@@ -156,6 +154,14 @@ class NovaReceitaDialog(QDialog):
 
         root.addWidget(card)
 
+    def resetar(self):
+        """Limpa o formulário para reaproveitar o diálogo (ver DialogPool)."""
+        self.input_valor.clear()
+        self.input_comprovante.clear()
+        self.combo_fp.setCurrentIndex(0)
+        self.date_edit.setDate(QDate.currentDate())
+        self.input_valor.setFocus()
+
     def _on_valor_edited(self, text):
         if self._formatando_valor: return
         fmt = _formatar_texto_moeda(text)
@@ -212,7 +218,6 @@ class NovaDespesaDialog(QDialog):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.resize(680, 520)
-        self.setStyleSheet(DIALOG_STYLES)
 
         # Instala o filtro de eventos para navegação com Enter
         self.enter_filter = EnterKeyFilter(self)
@@ -320,9 +325,21 @@ class NovaDespesaDialog(QDialog):
         self.dt_venc.setEnabled(False) # começa desabilitado
         col_venc.addWidget(self.lbl_venc)
         col_venc.addWidget(self.dt_venc)
+
+        # Parcelas mensais: o vencimento acima é o da primeira
+        col_parc = QVBoxLayout()
+        col_parc.addWidget(QLabel("Parcelas", objectName="sectionTitle"))
+        self.spin_parcelas = QSpinBox()
+        self.spin_parcelas.setRange(1, 48)
+        self.spin_parcelas.setSuffix("x")
+        self.spin_parcelas.setFixedHeight(44)
+        self.spin_parcelas.setEnabled(False)
+        self.spin_parcelas.valueChanged.connect(self._toggle_prazo)
+        col_parc.addWidget(self.spin_parcelas)
         
         row_prazo.addWidget(self.chk_prazo)
         row_prazo.addLayout(col_venc)
+        row_prazo.addLayout(col_parc)
         layout.addLayout(row_prazo)
 
         # Botões
@@ -342,6 +359,18 @@ class NovaDespesaDialog(QDialog):
 
         root.addWidget(card)
 
+    def resetar(self):
+        """Limpa o formulário para reaproveitar o diálogo (ver DialogPool)."""
+        self.input_valor.clear()
+        self.input_desc.clear()
+        self.input_comp.clear()
+        self.combo_fp.setCurrentIndex(0)
+        self.dt_lanc.setDate(QDate.currentDate())
+        self.dt_venc.setDate(QDate.currentDate())
+        self.spin_parcelas.setValue(1)
+        self.chk_prazo.setChecked(False)
+        self.input_valor.setFocus()
+
     def _on_valor_edited(self, text):
         if self._formatando_valor: return
         fmt = _formatar_texto_moeda(text)
@@ -356,6 +385,10 @@ class NovaDespesaDialog(QDialog):
 
     def _toggle_prazo(self, state):
         self.dt_venc.setEnabled(self.chk_prazo.isChecked())
+        self.spin_parcelas.setEnabled(self.chk_prazo.isChecked())
+        self.lbl_venc.setText(
+            "Primeiro vencimento" if self.spin_parcelas.value() > 1 else "Data de vencimento"
+        )
 
     def _salvar(self):
         # Validações básicas omitidas para brevidade, mas devem existir
@@ -373,7 +406,11 @@ class NovaDespesaDialog(QDialog):
         try:
             if self.chk_prazo.isChecked():
                 dt_venc = qdate_to_date(self.dt_venc.date())
-                self.sistema.registrar_despesa_a_prazo(valor, desc, fp, dt_venc, dt_lanc, comp)
+                parcelas = self.spin_parcelas.value()
+                if parcelas > 1:
+                    self.sistema.registrar_despesa_parcelada(valor, desc, fp, dt_venc, parcelas, dt_lanc, comp)
+                else:
+                    self.sistema.registrar_despesa_a_prazo(valor, desc, fp, dt_venc, dt_lanc, comp)
             else:
                 self.sistema.registrar_despesa(valor, desc, fp, dt_lanc, comp)
                 
@@ -395,7 +432,6 @@ class NovaNotaServicoDialog(QDialog):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.resize(680, 520)
-        self.setStyleSheet(DIALOG_STYLES)
         
         # Instala o filtro de eventos para navegação com Enter
         self.enter_filter = EnterKeyFilter(self)
@@ -493,6 +529,16 @@ class NovaNotaServicoDialog(QDialog):
         l.setFrameShadow(QFrame.Sunken)
         return l
 
+    def resetar(self):
+        """Limpa o formulário para reaproveitar o diálogo (ver DialogPool)."""
+        self.input_cliente.clear()
+        self.input_desc.clear()
+        self.input_valor.clear()
+        self.dt_servico.setDate(QDate.currentDate())
+        self.combo_fp.setCurrentIndex(0)
+        self.chk_pago.setChecked(False)
+        self.input_cliente.setFocus()
+
     def _on_valor_edited(self, text):
         if self._formatando_valor: return
         fmt = _formatar_texto_moeda(text)
@@ -11,11 +11,12 @@ from PySide6.QtWidgets import (
     QMessageBox, QFrame, QScrollArea, QWidget
 )
 from PySide6.QtCore import Qt, QDate, QObject, QEvent
-from PySide6.QtGui import QPixmap, QPainter, QPainterPath
+from PySide6.QtGui import QPixmap
 
 from models import Funcionario
-from interface.styles import DIALOG_STYLES
-from interface.helpers import EnterKeyFilter
+from interface.helpers import (
+    EnterKeyFilter, criar_pixmap_circular, _formatar_texto_moeda, _texto_para_float_moeda
+)
 
 
 def pydate_to_qdate(d: Optional[date]) -> QDate:
@@ -47,7 +48,6 @@ class AddEditEmployeeDialog(QDialog):
         self.setObjectName("addEditEmployeeDialog")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
-        self.setStyleSheet(DIALOG_STYLES)
 
         self.setWindowTitle("Novo Funcionário" if not funcionario else "Editar Funcionário")
         self.resize(640, 720)
@@ -96,21 +96,14 @@ class AddEditEmployeeDialog(QDialog):
         card_layout.addWidget(line)
 
         # Scroll
-        scroll = QScrollArea()
+        # Transparente para mostrar o cinza do card (regras em formScroll/formContent;
+        # o tema é global, então o conteúdo rolável herda o QSS normalmente)
+        scroll = QScrollArea(objectName="formScroll")
         scroll.setWidgetResizable(True)
         scroll.setFrameShape(QFrame.NoFrame)
 
-        # Transparente para mostrar o cinza do card
-        scroll.setStyleSheet("QScrollArea { background: transparent; }")
-        scroll.viewport().setStyleSheet("background: transparent;")
-
-        content_widget = QWidget()
-
-        # ✅ FIX PRINCIPAL:
-        # Em alguns casos o QScrollArea faz os filhos não herdarem o QSS do diálogo.
-        # Reaplicamos o mesmo stylesheet dentro do conteúdo scrollável.
+        content_widget = QWidget(objectName="formContent")
         content_widget.setAttribute(Qt.WA_StyledBackground, True)
-        content_widget.setStyleSheet(DIALOG_STYLES)
 
         content_layout = QVBoxLayout(content_widget)
         content_layout.setContentsMargins(0, 0, 12, 0)
@@ -154,6 +147,13 @@ class AddEditEmployeeDialog(QDialog):
         self.txt_cargo.installEventFilter(self.enter_filter)
         content_layout.addWidget(self.txt_cargo)
 
+        self.txt_salario = QLineEdit()
+        self.txt_salario.setPlaceholderText("Salário mensal (R$)")
+        self.txt_salario.setFixedHeight(44)
+        self.txt_salario.installEventFilter(self.enter_filter)
+        self.txt_salario.textEdited.connect(self._on_salario_edited)
+        content_layout.addWidget(self.txt_salario)
+
         row_dates = QHBoxLayout()
         row_dates.setSpacing(10)
 
@@ -224,12 +224,9 @@ class AddEditEmployeeDialog(QDialog):
         row_foto = QHBoxLayout()
         row_foto.setSpacing(12)
 
-        self.lbl_foto_preview = QLabel()
+        self.lbl_foto_preview = QLabel(objectName="fotoPreview")
         self.lbl_foto_preview.setFixedSize(80, 80)
         self.lbl_foto_preview.setAlignment(Qt.AlignCenter)
-        self.lbl_foto_preview.setStyleSheet(
-            "background-color: #ddd; border-radius: 40px; border: 2px solid white;"
-        )
 
         btn_foto = QPushButton("Selecionar foto")
         btn_foto.setObjectName("fileButton")
@@ -276,6 +273,11 @@ class AddEditEmployeeDialog(QDialog):
             cb.addItem(m, i)
         return cb
 
+    def _on_salario_edited(self, text):
+        fmt = _formatar_texto_moeda(text)
+        self.txt_salario.setText(fmt)
+        self.txt_salario.setCursorPosition(len(fmt))
+
     def _selecionar_foto(self):
         path, _ = QFileDialog.getOpenFileName(self, "Selecionar Foto", "", "Imagens (*.png *.jpg *.jpeg)")
         if path:
@@ -288,29 +290,12 @@ class AddEditEmployeeDialog(QDialog):
             self.lbl_foto_preview.setPixmap(QPixmap())
             return
 
-        pix = QPixmap(self.foto_caminho)
-        if pix.isNull():
+        rounded = criar_pixmap_circular(self.foto_caminho, 80)
+        if rounded is None:
             self.lbl_foto_preview.setText("X")
             self.lbl_foto_preview.setPixmap(QPixmap())
             return
 
-        size = 80
-        rounded = QPixmap(size, size)
-        rounded.fill(Qt.transparent)
-
-        scaled_pix = pix.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-        x = (scaled_pix.width() - size) // 2
-        y = (scaled_pix.height() - size) // 2
-        cropped = scaled_pix.copy(x, y, size, size)
-
-        painter = QPainter(rounded)
-        painter.setRenderHint(QPainter.Antialiasing)
-        path = QPainterPath()
-        path.addEllipse(0, 0, size, size)
-        painter.setClipPath(path)
-        painter.drawPixmap(0, 0, cropped)
-        painter.end()
-
         self.lbl_foto_preview.setPixmap(rounded)
         self.lbl_foto_preview.setText("")
 
@@ -321,6 +306,10 @@ class AddEditEmployeeDialog(QDialog):
         self.txt_telefone.setText(getattr(f, "telefone", "") or "")
         self.txt_cargo.setText(getattr(f, "cargo", "") or "")
 
+        salario = getattr(f, "salario", None)
+        if salario:
+            self.txt_salario.setText(_formatar_texto_moeda(f"{salario:.2f}"))
+
         self.date_admissao.setDate(pydate_to_qdate(getattr(f, "data_admissao", None)))
 
         dia_pag = getattr(f, "dia_pagamento", None)
@@ -361,6 +350,14 @@ class AddEditEmployeeDialog(QDialog):
         dt_admissao = qdate_to_pydate(self.date_admissao.date())
         dia_pag = int(self.spin_dia_pagamento.value())
 
+        salario = None
+        if self.txt_salario.text().strip():
+            try:
+                salario = _texto_para_float_moeda(self.txt_salario.text())
+            except ValueError:
+                QMessageBox.warning(self, "Aviso", "Salário inválido.")
+                return
+
         mes_13 = self.combo_mes_13.currentData()
         mes_ferias = self.combo_mes_ferias.currentData()
 
@@ -387,9 +384,10 @@ class AddEditEmployeeDialog(QDialog):
                 f.mes_decimo_terceiro = mes_13
                 f.mes_ferias = mes_ferias
                 f.data_demissao = dt_demissao
+                f.salario = salario
 
-                self.sistema.atualizar_funcionario(f)
-                QMessageBox.information(self, "Sucesso", "Funcionário atualizado com sucesso!")
+                if self.sistema.atualizar_funcionario(f):
+                    QMessageBox.information(self, "Sucesso", "Funcionário atualizado com sucesso!")
             else:
                 self.sistema.registrar_funcionario(
                     nome=nome,
@@ -400,7 +398,8 @@ class AddEditEmployeeDialog(QDialog):
                     dia_pagamento=dia_pag,
                     foto_caminho=self.foto_caminho,
                     mes_decimo_terceiro=mes_13,
-                    mes_ferias=mes_ferias
+                    mes_ferias=mes_ferias,
+                    salario=salario
                 )
                 QMessageBox.information(self, "Sucesso", "Funcionário cadastrado com sucesso!")
 
@@ -17,8 +17,6 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QPixmap, QPainter
 
-from models import Recebimento, Despesa, OrdemServico, FormaPagamento
-from interface.styles import DIALOG_STYLES
 from interface.helpers import (
     mapear_forma_pagamento, 
     _formatar_texto_moeda, 
@@ -85,6 +83,32 @@ class ImagemZoomDialog(QDialog):
 
 # ===================== DIÁLOGO DE DETALHES =====================
 
+def _info_do_modelo(tipo: str, modelo) -> Dict:
+    """Converte o modelo lido do banco nos campos exibidos pelo diálogo."""
+    forma = modelo.forma_pagamento.value if modelo.forma_pagamento else "Não definido"
+    if tipo == "Nota de serviço":
+        return {
+            "tipo": tipo, "id": modelo.id, "data": modelo.data,
+            "cliente": modelo.cliente, "descricao": modelo.descricao,
+            "valor": modelo.valor_total,
+            "situacao": "Paga" if modelo.foi_pago else "Não paga",
+            "forma_pagamento": forma,
+            "comprovante": None,
+        }
+    info = {
+        "tipo": tipo, "id": modelo.id, "data": modelo.data,
+        "valor": modelo.valor, "forma_pagamento": forma,
+        "comprovante": modelo.comprovante_caminho,
+    }
+    if tipo == "Despesa":
+        info.update(
+            descricao=modelo.descricao,
+            eh_a_prazo=modelo.eh_a_prazo,
+            data_vencimento=modelo.data_vencimento,
+        )
+    return info
+
+
 class DetalheLancamentoDialog(QDialog):
     """
     Janela que exibe todas as informações de um item (Receita, Despesa, OS).
@@ -92,15 +116,23 @@ class DetalheLancamentoDialog(QDialog):
     1. Visualizar dados (somente leitura inicialmente)
     2. Ver comprovante (com preview e botão de zoom)
     3. Editar dados (botão 'Editar' libera os campos)
+
+    Recebe só o tipo e o id do lançamento: o registro completo é lido do
+    banco aqui, na abertura, e não fica guardado em quem lista.
+
+    Depois de fechado, `resultado` traz o modelo salvo (ou None se nada
+    mudou), para quem abriu atualizar só o que foi editado.
     """
 
-    def __init__(self, info: Dict, parent=None):
+    def __init__(self, tipo: str, id_lanc: int, parent=None):
         super().__init__(parent)
 
-        self.info = info
-        self._caminho_imagem = info.get("comprovante")
-        # Mantém referência ao sistema para poder salvar edições
+        # Mantém referência ao sistema para carregar o registro e salvar edições
         self._sistema = getattr(parent, "sistema", None)
+        # Modelo lido do banco: as edições são aplicadas nele, campo a campo
+        self._modelo = None
+        self.info = self._carregar_info(tipo, id_lanc)
+        self._caminho_imagem = self.info.get("comprovante")
 
         # Controle de campos editáveis (chave -> widget)
         self._campos_editaveis: Dict[str, QWidget] = {}
@@ -110,15 +142,31 @@ class DetalheLancamentoDialog(QDialog):
         self._modo_edicao = False
         self._formatando_valor = False
 
+        # Modelo salvo na última edição (None = nada foi alterado)
+        self.resultado = None
+
         # Configuração visual (sem bordas do sistema operacional)
         self.setObjectName("relatorioGeralDialog")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
 
         self._setup_ui()
-        self.setStyleSheet(DIALOG_STYLES)
         self.resize(720, 550)
 
+    def _carregar_info(self, tipo: str, id_lanc: int) -> Dict:
+        """Busca o lançamento pelo id; se não existir mais, mostra só tipo/id."""
+        obter = {
+            "Receita": "obter_recebimento",
+            "Despesa": "obter_despesa",
+            "Nota de serviço": "obter_ordem_servico",
+        }.get(tipo)
+        if self._sistema is not None and obter is not None:
+            self._modelo = getattr(self._sistema, obter)(id_lanc)
+        if self._modelo is None:
+            # Tipo fora da lista cai nos campos genéricos (somente leitura)
+            return {"tipo": f"{tipo} (não encontrado)", "id": id_lanc}
+        return _info_do_modelo(tipo, self._modelo)
+
     def _setup_ui(self):
         root = QVBoxLayout(self)
         root.setContentsMargins(0, 0, 0, 0)
@@ -185,12 +233,9 @@ class DetalheLancamentoDialog(QDialog):
         self.lbl_comp_path.setWordWrap(True)
         comp_layout.addWidget(self.lbl_comp_path)
 
-        self.lbl_preview = QLabel()
+        self.lbl_preview = QLabel(objectName="comprovantePreview")
         self.lbl_preview.setAlignment(Qt.AlignCenter)
         self.lbl_preview.setFixedHeight(200)
-        self.lbl_preview.setStyleSheet(
-            "border: 1px solid #CCCCCC; border-radius: 8px; background-color: #F5F5F5;"
-        )
         self.lbl_preview.setScaledContents(True)
         comp_layout.addWidget(self.lbl_preview)
 
@@ -366,6 +411,17 @@ class DetalheLancamentoDialog(QDialog):
         
         self._add_data_linha(layout, "Data de vencimento", "data_vencimento", data_venc)
 
+        if eh_a_prazo and self._sistema is not None:
+            parcelas = self._sistema.parcelas_da_despesa(info["id"])
+            if len(parcelas) > 1:
+                pagas = sum(1 for p in parcelas if p.foi_pago)
+                proxima = next((p for p in parcelas if not p.foi_pago), None)
+                texto = f"{pagas} de {len(parcelas)} pagas"
+                if proxima is not None:
+                    valor_p = f"R$ {proxima.valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+                    texto += f" — próxima: {valor_p} em {proxima.data_vencimento.strftime('%d/%m/%Y')}"
+                self._add_label_simples(layout, "Parcelas", texto)
+
     def _montar_campos_nota_servico(self, layout, info):
         data = info.get("data")
         valor = abs(info.get("valor", 0.0))
@@ -388,6 +444,16 @@ class DetalheLancamentoDialog(QDialog):
         opcoes_fp = ["Não definido", "Dinheiro", "Debito", "Credito", "PIX", "Boleto", "Cheque"]
         self._add_combo_linha(layout, "Forma de pagamento", "forma_pagamento", opcoes_fp, forma)
 
+        if self._sistema is not None and self._modelo is not None:
+            pagamentos = self._sistema.pagamentos_da_ordem(info["id"])
+            if pagamentos:
+                moeda = lambda v: f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+                recebido = sum(p.valor for p in pagamentos)
+                texto = f"{moeda(recebido)} em {len(pagamentos)} pagamento(s)"
+                if not self._modelo.foi_pago:
+                    texto += f" — em aberto: {moeda(self._modelo.saldo_aberto)}"
+                self._add_label_simples(layout, "Recebido", texto)
+
     def _montar_campos_genericos(self, layout, info):
         """Fallback para tipos desconhecidos."""
         self._add_label_simples(layout, "Descrição", info.get("descricao", "-"))
@@ -464,10 +530,9 @@ class DetalheLancamentoDialog(QDialog):
             return
 
         tipo = self.info.get("tipo")
-        id_lanc = self.info.get("id")
 
-        if id_lanc is None:
-            QMessageBox.critical(self, "Erro", "ID do lançamento não encontrado.")
+        if self._modelo is None:
+            QMessageBox.critical(self, "Erro", "Lançamento não encontrado.")
             return
 
         # Confirmação
@@ -482,11 +547,11 @@ class DetalheLancamentoDialog(QDialog):
 
         try:
             if tipo == "Receita":
-                self._salvar_receita(id_lanc)
+                salvou = self._salvar_receita()
             elif tipo == "Despesa":
-                self._salvar_despesa(id_lanc)
+                salvou = self._salvar_despesa()
             elif tipo == "Nota de serviço":
-                self._salvar_nota(id_lanc)
+                salvou = self._salvar_nota()
             else:
                 QMessageBox.warning(self, "Erro", f"Tipo desconhecido: {tipo}")
                 return
@@ -497,8 +562,12 @@ class DetalheLancamentoDialog(QDialog):
             QMessageBox.critical(self, "Erro", f"Ocorreu um erro ao salvar:\n{e}")
             return
 
-        # Se chegou aqui, deu certo
-        QMessageBox.information(self, "Sucesso", "Alterações salvas com sucesso!")
+        # Se chegou aqui, deu certo (ou não havia o que gravar)
+        if salvou:
+            self.resultado = self._modelo
+            QMessageBox.information(self, "Sucesso", "Alterações salvas com sucesso!")
+        else:
+            QMessageBox.information(self, "Sem alterações", "Nenhum campo foi alterado.")
         
         # Reseta UI para modo leitura
         self._modo_edicao = False
@@ -529,7 +598,7 @@ class DetalheLancamentoDialog(QDialog):
 
     # Lógicas específicas de salvamento para cada tipo
 
-    def _salvar_receita(self, id_lanc):
+    def _salvar_receita(self) -> bool:
         txt_valor = self._campos_editaveis["valor"].text()
         valor = _texto_para_float_moeda(txt_valor)
         if valor <= 0: raise ValueError("O valor deve ser maior que zero.")
@@ -543,16 +612,13 @@ class DetalheLancamentoDialog(QDialog):
         forma_enum = mapear_forma_pagamento(forma_text)
         if not forma_enum: raise ValueError("Forma de pagamento inválida.")
 
-        rec = Recebimento(
-            id=id_lanc,
-            valor=valor,
-            data=data_py,
-            forma_pagamento=forma_enum,
-            comprovante_caminho=self._caminho_imagem
-        )
-        self._sistema.atualizar_recebimento(rec)
+        rec = self._modelo
+        rec.valor = valor
+        rec.data = data_py
+        rec.forma_pagamento = forma_enum
+        return self._sistema.atualizar_recebimento(rec)
 
-    def _salvar_despesa(self, id_lanc):
+    def _salvar_despesa(self) -> bool:
         txt_valor = self._campos_editaveis["valor"].text()
         valor = _texto_para_float_moeda(txt_valor)
         
@@ -575,19 +641,16 @@ class DetalheLancamentoDialog(QDialog):
             try: data_venc = dv.toPython()
             except AttributeError: data_venc = date(dv.year(), dv.month(), dv.day())
 
-        desp = Despesa(
-            id=id_lanc,
-            valor=valor,
-            data=data_lanc,
-            forma_pagamento=forma_enum,
-            descricao=desc,
-            eh_a_prazo=eh_a_prazo,
-            data_vencimento=data_venc,
-            comprovante_caminho=self._caminho_imagem
-        )
-        self._sistema.atualizar_despesa(desp)
+        desp = self._modelo
+        desp.valor = valor
+        desp.data = data_lanc
+        desp.forma_pagamento = forma_enum
+        desp.descricao = desc
+        desp.eh_a_prazo = eh_a_prazo
+        desp.data_vencimento = data_venc
+        return self._sistema.atualizar_despesa(desp)
 
-    def _salvar_nota(self, id_lanc):
+    def _salvar_nota(self) -> bool:
         cliente = self._campos_editaveis["cliente"].text().strip()
         desc = self._campos_editaveis["descricao"].text().strip()
         if not cliente: raise ValueError("Cliente obrigatório.")
@@ -607,14 +670,12 @@ class DetalheLancamentoDialog(QDialog):
         if forma_text != "Não definido":
             forma_enum = mapear_forma_pagamento(forma_text)
 
-        os_ = OrdemServico(
-            id=id_lanc,
-            cliente=cliente,
-            descricao=desc,
-            valor_total=valor,
-            data=data_os,
-            foi_pago=foi_pago,
-            forma_pagamento=forma_enum
-        )
-        self._sistema.atualizar_ordem_servico(os_)
+        os_ = self._modelo
+        os_.cliente = cliente
+        os_.descricao = desc
+        os_.valor_total = valor
+        os_.data = data_os
+        os_.foi_pago = foi_pago
+        os_.forma_pagamento = forma_enum
+        return self._sistema.atualizar_ordem_servico(os_)
 
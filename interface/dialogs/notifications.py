@@ -0,0 +1,152 @@
+"""
+Módulo de Notificações.
+
+Contém o diálogo aberto pelo sino do header: lista as parcelas das contas
+a prazo ainda não pagas que estão vencidas, vencem hoje ou vencem nesta
+semana, e permite marcá-las como pagas.
+"""
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox
+)
+from PySide6.QtCore import Qt
+
+import eventos
+from interface.helpers import _date_to_str, inscrever_eventos
+
+
+def _moeda(valor):
+    return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+class NotificacoesDialog(QDialog):
+    """
+    Lista de parcelas a pagar agrupadas pelo vencimento. Os dados vêm de
+    `sistema.alertas_vencimento()`, que já está em memória: recarregar a
+    lista não consulta o banco.
+    """
+
+    COLUNAS = ["Situação", "Vencimento", "Descrição", "Valor", "Forma pagamento"]
+
+    def __init__(self, sistema, parent=None):
+        super().__init__(parent)
+        self.sistema = sistema
+        self._parcelas = []  # parcela de cada linha da tabela
+
+        self.setObjectName("relatorioGeralDialog")
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.resize(800, 480)
+
+        self._setup_ui()
+        self.carregar_dados()
+        inscrever_eventos(self, sistema, self._on_evento, (eventos.DESPESA,))
+
+    def _setup_ui(self):
+        root = QVBoxLayout(self)
+        root.setContentsMargins(0, 0, 0, 0)
+        root.setAlignment(Qt.AlignCenter)
+
+        card = QFrame(objectName="card")
+        layout = QVBoxLayout(card)
+        layout.setContentsMargins(32, 24, 32, 24)
+        layout.setSpacing(16)
+
+        # Header
+        h = QHBoxLayout()
+        h.addWidget(QLabel("Contas a vencer", objectName="title"))
+        h.addStretch()
+        btn_close = QPushButton("✕", objectName="closeButton")
+        btn_close.setFixedSize(40, 40)
+        btn_close.clicked.connect(self.close)
+        h.addWidget(btn_close)
+        layout.addLayout(h)
+
+        line = QFrame()
+        line.setFrameShape(QFrame.HLine)
+        line.setFrameShadow(QFrame.Sunken)
+        layout.addWidget(line)
+
+        self.tabela = QTableWidget()
+        self.tabela.setColumnCount(len(self.COLUNAS))
+        self.tabela.setHorizontalHeaderLabels(self.COLUNAS)
+        self.tabela.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabela.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabela.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tabela.verticalHeader().setVisible(False)
+        self.tabela.cellDoubleClicked.connect(self._abrir_detalhes_linha)
+        layout.addWidget(self.tabela)
+
+        # Footer
+        footer = QHBoxLayout()
+        self.lbl_total = QLabel("Nenhuma conta a vencer")
+        footer.addWidget(self.lbl_total)
+        footer.addStretch()
+
+        btn_pagar = QPushButton("Marcar como paga", objectName="secondaryButton")
+        btn_pagar.clicked.connect(self._marcar_como_paga)
+        footer.addWidget(btn_pagar)
+        layout.addLayout(footer)
+
+        root.addWidget(card)
+
+    def carregar_dados(self):
+        alertas = self.sistema.alertas_vencimento()
+        grupos = (
+            ("Vencida", alertas.vencidas),
+            ("Vence hoje", alertas.vencem_hoje),
+            ("Vence nesta semana", alertas.vencem_na_semana),
+        )
+        self._parcelas = []
+        total = 0.0
+        self.tabela.setRowCount(alertas.total)
+        for situacao, parcelas in grupos:
+            for p in parcelas:
+                forma = p.forma_pagamento.value if p.forma_pagamento else "-"
+                celulas = (
+                    situacao, _date_to_str(p.data_vencimento), p.rotulo,
+                    _moeda(p.valor), forma,
+                )
+                row = len(self._parcelas)
+                for col, texto in enumerate(celulas):
+                    self.tabela.setItem(row, col, QTableWidgetItem(texto))
+                self._parcelas.append(p)
+                total += p.valor
+
+        if alertas.total:
+            self.lbl_total.setText(f"{alertas.total} parcela(s) — total: R$ {_moeda(total)}")
+        else:
+            self.lbl_total.setText("Nenhuma conta a vencer")
+
+    def resetar(self):
+        """Recarrega a lista ao reabrir (usado pelo DialogPool)."""
+        self.tabela.clearSelection()
+        self.tabela.scrollToTop()
+        self.carregar_dados()
+
+    def _on_evento(self, evento):
+        # A agenda do sistema já foi atualizada quando o evento chega
+        if self.isVisible():
+            self.carregar_dados()
+
+    def _marcar_como_paga(self):
+        rows = sorted({idx.row() for idx in self.tabela.selectionModel().selectedRows()})
+        if not rows:
+            QMessageBox.information(self, "Contas a vencer", "Selecione uma ou mais parcelas.")
+            return
+        # A lista é recarregada a cada parcela paga (evento), então os ids
+        # são separados antes
+        ids = [self._parcelas[row].id for row in rows]
+        try:
+            for parcela_id in ids:
+                self.sistema.pagar_parcela(parcela_id)
+        except ValueError as e:
+            QMessageBox.critical(self, "Erro", str(e))
+        self.carregar_dados()
+
+    def _abrir_detalhes_linha(self, row, col):
+        if row < 0 or row >= len(self._parcelas):
+            return
+        from interface.dialogs.details import DetalheLancamentoDialog
+        DetalheLancamentoDialog("Despesa", self._parcelas[row].despesa_id, self).exec()
@@ -5,39 +5,82 @@ Contém os diálogos de visualização de dados em tabelas:
 - RelatorioReceitasDialog
 - RelatorioDespesasDialog
 - RelatorioNotasDialog
+- RelatorioAgingDialog
+- RelatorioFolhaDialog
+- RelatorioPrevisaoDialog
 - RelatorioGeralDialog
 """
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QPushButton, 
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QComboBox, QCheckBox, QFileDialog, QMessageBox
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QComboBox, QCheckBox, QFileDialog, QMessageBox,
+    QLineEdit, QTableView, QInputDialog
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex
+from dataclasses import replace
 from datetime import date
+from typing import NamedTuple
 
-from interface.styles import DIALOG_STYLES  
-from interface.helpers import _date_to_str
-from interface.dialogs.details import DetalheLancamentoDialog
+import eventos
+from interface.helpers import _date_to_str, inscrever_eventos, mapear_forma_pagamento
 from interface.date_filter_widget import DateFilterWidget
-from excel_generator import gerar_excel_relatorio
+from interface.charts import GraficoLinhas, Serie, POSITIVO, NEGATIVO
+
+# DetalheLancamentoDialog (visualização de imagens) e excel_generator (openpyxl)
+# são importados no primeiro uso, para não pesar na abertura dos relatórios.
+
+# Tipo exibido na tabela para cada entidade dos eventos
+TIPO_POR_ENTIDADE = {
+    eventos.RECEBIMENTO: "Receita",
+    eventos.DESPESA: "Despesa",
+    eventos.ORDEM_SERVICO: "Nota de serviço",
+}
+
+# Formas de pagamento oferecidas nas ações em lote
+FORMAS_PAGAMENTO = ["Dinheiro", "Débito", "Crédito", "PIX", "Boleto", "Cheque"]
+
+
+def _moeda(valor):
+    return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+class ChaveLinha(NamedTuple):
+    """
+    O que o relatório guarda de cada linha: qual registro ela mostra e o
+    valor usado no rodapé. Os detalhes completos são lidos do banco só
+    quando o DetalheLancamentoDialog é aberto.
+    """
+    tipo: str
+    id: int
+    valor: float
 
 # ===================== BASE RELATÓRIO =====================
 
 class BaseRelatorioDialog(QDialog):
     """Classe base para evitar repetição de setup de UI (Header, Tabela, Footer)."""
     
+    # Entidades exibidas pelo relatório (eventos de outras são ignorados)
+    ENTIDADES = ()
+    
     def __init__(self, sistema, titulo, parent=None):
         super().__init__(parent)
         self.sistema = sistema
-        self._linhas_raw = []
+        self._linhas = []  # ChaveLinha por linha da tabela
+        self.txt_busca = None
+        self._editando_linha = False
+        
+        # Agrupa pedidos de recarga (filtro, busca) em uma única consulta
+        self._timer_carga = QTimer(self)
+        self._timer_carga.setSingleShot(True)
+        self._timer_carga.timeout.connect(self.carregar_dados)
         
         self.setObjectName("relatorioGeralDialog")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
         self.resize(950, 560)
-        self.setStyleSheet(DIALOG_STYLES)
         
         self._setup_base_ui(titulo)
+        inscrever_eventos(self, sistema, self._on_evento, self.ENTIDADES)
 
     def _setup_base_ui(self, titulo):
         root = QVBoxLayout(self)
@@ -69,9 +112,55 @@ class BaseRelatorioDialog(QDialog):
     def _add_date_filter(self):
         """Adiciona o novo widget de filtro de data."""
         self.date_filter = DateFilterWidget()
-        self.date_filter.filterChanged.connect(self.carregar_dados)
+        self.date_filter.filterChanged.connect(self._agendar_carga)
         return self.date_filter
 
+    def _agendar_carga(self):
+        """
+        Agenda uma recarga para o próximo ciclo do event loop. Vários pedidos
+        seguidos viram uma só consulta; um pedido ainda pendente é descartado
+        se carregar_dados rodar antes (ver _cancelar_carga_pendente).
+        """
+        self._timer_carga.start(0)
+
+    def _cancelar_carga_pendente(self):
+        self._timer_carga.stop()
+
+    def _add_busca(self, placeholder="Buscar..."):
+        """
+        Adiciona a caixa de busca textual. A busca roda enquanto o usuário
+        digita (com um pequeno atraso para não consultar a cada tecla).
+        """
+        self.txt_busca = QLineEdit()
+        self.txt_busca.setPlaceholderText(placeholder)
+        self.txt_busca.setFixedHeight(36)
+        self.txt_busca.setClearButtonEnabled(True)
+
+        self._timer_busca = QTimer(self)
+        self._timer_busca.setSingleShot(True)
+        self._timer_busca.setInterval(250)
+        self._timer_busca.timeout.connect(self._agendar_carga)
+        self.txt_busca.textChanged.connect(self._timer_busca.start)
+        return self.txt_busca
+
+    def _ids_busca(self, tipo, data_inicio, data_fim):
+        """
+        Retorna os ids do `tipo` ("Despesa" ou "Nota de serviço") que casam
+        com o texto da busca, ou None quando a busca está vazia.
+        """
+        if self.txt_busca is None or not self.txt_busca.text().strip():
+            return None
+        resultados = self.sistema.buscar(self.txt_busca.text(), data_inicio, data_fim, limite=None)
+        return {r.id for r in resultados if r.tipo == tipo}
+
+    def _saiu_da_busca(self, tipo, modelo):
+        """
+        True se há busca ativa e o registro editado deixou de casar com ela
+        (a busca é refeita só no dia do registro).
+        """
+        ids = self._ids_busca(tipo, modelo.data, modelo.data)
+        return ids is not None and modelo.id not in ids
+
     def _setup_tabela(self, colunas):
         self.tabela = QTableWidget()
         self.tabela.setColumnCount(len(colunas))
@@ -82,14 +171,148 @@ class BaseRelatorioDialog(QDialog):
         self.tabela.cellDoubleClicked.connect(self._abrir_detalhes_linha)
         self.layout_card.addWidget(self.tabela)
 
+    def _habilitar_selecao_multipla(self):
+        """Seleção de linhas inteiras, várias de uma vez (Ctrl/Shift), para as ações em lote."""
+        self.tabela.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabela.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+    def _ids_selecionados(self):
+        rows = sorted({idx.row() for idx in self.tabela.selectionModel().selectedRows()})
+        return [self._linhas[row].id for row in rows if row < len(self._linhas)]
+
+    def _acao_em_lote(self, titulo, acao):
+        """
+        Roda `acao(ids)` nas linhas selecionadas e recarrega a tabela uma vez
+        só, no fim: os eventos que a ação publica (um por registro) são
+        ignorados enquanto ela roda. Retorna o que a ação retornou, ou None
+        se nada foi feito.
+        """
+        ids = self._ids_selecionados()
+        if not ids:
+            QMessageBox.information(self, titulo, "Selecione uma ou mais linhas.")
+            return None
+        self._editando_linha = True
+        try:
+            resultado = acao(ids)
+        except ValueError as e:
+            QMessageBox.critical(self, "Erro", str(e))
+            return None
+        finally:
+            self._editando_linha = False
+        self.carregar_dados()
+        return resultado
+
+    def _avisar_nao_alteradas(self, titulo, selecionadas, alteradas):
+        """
+        Avisa quando a ação em lote deixou de fora parte das `selecionadas`:
+        são lançamentos de anos arquivados, que só podem ser consultados.
+        """
+        if alteradas is not None and alteradas < selecionadas:
+            QMessageBox.warning(
+                self, titulo,
+                f"{selecionadas - alteradas} de {selecionadas} linha(s) não foram alteradas: "
+                "são de anos arquivados, que ficam somente para consulta.",
+            )
+
+    def _escolher_forma_pagamento(self, titulo):
+        texto, ok = QInputDialog.getItem(self, titulo, "Forma de pagamento:", FORMAS_PAGAMENTO, 0, False)
+        return mapear_forma_pagamento(texto) if ok else None
+
     def _abrir_detalhes_linha(self, row, col):
-        if row < 0 or row >= len(self._linhas_raw): return
-        info = self._linhas_raw[row]
-        dlg = DetalheLancamentoDialog(info, self)
-        dlg.exec()
-        # Ao voltar, recarrega para refletir edições
-        self.carregar_dados() 
+        if row < 0 or row >= len(self._linhas): return
+        from interface.dialogs.details import DetalheLancamentoDialog
+        chave = self._linhas[row]
+        dlg = DetalheLancamentoDialog(chave.tipo, chave.id, self)
+        # A própria edição é aplicada abaixo, com o modelo devolvido pelo
+        # diálogo: o evento que ela publica não precisa recarregar nada
+        self._editando_linha = True
+        try:
+            dlg.exec()
+        finally:
+            self._editando_linha = False
+        if dlg.resultado is not None:
+            self._aplicar_alteracao(row, dlg.resultado)
+
+    def _on_evento(self, evento):
+        """
+        Reage a alterações feitas fora deste relatório: um registro já
+        exibido é corrigido só na sua linha; qualquer outra mudança no
+        período exibido agenda uma recarga. Relatório fechado ignora: ao
+        ser reaberto, resetar() já recarrega tudo.
+        """
+        if not self.isVisible() or self._editando_linha:
+            return
+        if evento.acao == eventos.ATUALIZADO:
+            row = self._linha_do_registro(TIPO_POR_ENTIDADE[evento.entidade], evento.id)
+            if row is not None:
+                self._aplicar_alteracao(row, evento.atual)
+                return
+        data_inicio, data_fim = self.date_filter.get_date_range()
+        if evento.afeta_periodo(data_inicio, data_fim):
+            self._agendar_carga()
+
+    def _linha_do_registro(self, tipo, id_):
+        for row, chave in enumerate(self._linhas):
+            if chave.id == id_ and chave.tipo == tipo:
+                return row
+        return None
+
+    def _aplicar_alteracao(self, row, modelo):
+        """
+        Reescreve só a linha `row` com o modelo salvo e atualiza o rodapé,
+        sem reconsultar o banco nem perder rolagem e seleção. Se a nova data
+        saiu do período filtrado, ou o registro não casa mais com a busca,
+        a linha é removida.
+        """
+        anterior = self._linhas[row]
+        celulas, chave = self._montar_linha(anterior.tipo, modelo)
+        data_inicio, data_fim = self.date_filter.get_date_range()
+        fora = (data_inicio and modelo.data < data_inicio) or (data_fim and modelo.data > data_fim)
+        if fora or self._saiu_da_busca(anterior.tipo, modelo):
+            self.tabela.removeRow(row)
+            del self._linhas[row]
+        else:
+            self._linhas[row] = chave
+            self._preencher_linha(row, celulas)
+        self._atualizar_rodape(anterior, chave)
+
+    def _preencher_linha(self, row, celulas):
+        """Troca o texto das células de uma linha já preenchida."""
+        for col, texto in enumerate(celulas):
+            self.tabela.item(row, col).setText(texto)
+
+    def _preencher_tabela(self, linhas):
+        self.tabela.setRowCount(len(linhas))
+        for i, celulas in enumerate(linhas):
+            for col, texto in enumerate(celulas):
+                self.tabela.setItem(i, col, QTableWidgetItem(texto))
+
+    def _montar_linha(self, tipo, modelo):
+        """Retorna (textos das células, ChaveLinha) de um registro."""
+        raise NotImplementedError
+
+    def _atualizar_rodape(self, anterior=None, atual=None):
+        """
+        Atualiza o total do rodapé. `anterior`/`atual` são as ChaveLinha da
+        linha alterada (antes e depois da edição); sem elas, recalcula tudo.
+        """
+        raise NotImplementedError
         
+    def resetar(self, filtro_inicial=None):
+        """
+        Volta o relatório ao estado de abertura (filtro, busca, rolagem) e
+        recarrega os dados. Usado quando o diálogo é reaproveitado pelo pool.
+        """
+        self.date_filter.set_modo(filtro_inicial or "Tudo")
+        if self.txt_busca is not None:
+            self._timer_busca.stop()
+            self.txt_busca.blockSignals(True)
+            self.txt_busca.clear()
+            self.txt_busca.blockSignals(False)
+        self.tabela.clearSelection()
+        self.tabela.scrollToTop()
+        self.carregar_dados()
+
     def carregar_dados(self):
         raise NotImplementedError
     
@@ -104,6 +327,8 @@ class BaseRelatorioDialog(QDialog):
 # ===================== RELATÓRIO RECEITAS =====================
 
 class RelatorioReceitasDialog(BaseRelatorioDialog):
+    ENTIDADES = (eventos.RECEBIMENTO,)
+
     def __init__(self, sistema, parent=None, filtro_inicial=None):
         super().__init__(sistema, "Relatório de receitas", parent)
         
@@ -136,39 +361,31 @@ class RelatorioReceitasDialog(BaseRelatorioDialog):
         self.carregar_dados()
 
     def carregar_dados(self):
+        self._cancelar_carga_pendente()
         # Obtém o range de datas do filtro
         data_inicio, data_fim = self.date_filter.get_date_range()
         
-        self._linhas_raw = []
+        self._linhas = []
         linhas = []
-        total = 0.0
         
         # Usa o novo método de filtragem por data
         recebimentos = self.sistema.listar_recebimentos_por_data(data_inicio, data_fim)
         
         for r in recebimentos:
+            celulas, chave = self._montar_linha("Receita", r)
+            linhas.append(celulas)
+            self._linhas.append(chave)
             
-            linhas.append((r.data, r.valor, r.forma_pagamento.value))
-            total += r.valor
-            
-            self._linhas_raw.append({
-                "tipo": "Receita",
-                "id": r.id,
-                "data": r.data,
-                "descricao": f"Recebimento ({r.forma_pagamento.value})",
-                "valor": r.valor,
-                "situacao": None,
-                "forma_pagamento": r.forma_pagamento.value,
-                "comprovante": r.comprovante_caminho
-            })
-            
-        self.tabela.setRowCount(len(linhas))
-        for i, (d, v, f) in enumerate(linhas):
-            self.tabela.setItem(i, 0, QTableWidgetItem(_date_to_str(d)))
-            self.tabela.setItem(i, 1, QTableWidgetItem(f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")))
-            self.tabela.setItem(i, 2, QTableWidgetItem(f))
-            
-        self.lbl_total.setText(f"Total das receitas: R$ {total:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+        self._preencher_tabela(linhas)
+        self._atualizar_rodape()
+
+    def _montar_linha(self, tipo, r):
+        celulas = (_date_to_str(r.data), _moeda(r.valor), r.forma_pagamento.value)
+        return celulas, ChaveLinha("Receita", r.id, r.valor)
+
+    def _atualizar_rodape(self, anterior=None, atual=None):
+        total = sum(chave.valor for chave in self._linhas)
+        self.lbl_total.setText(f"Total das receitas: R$ {_moeda(total)}")
     
     def _exportar_excel(self):
         """Exporta Excel do relatório de receitas."""
@@ -178,6 +395,8 @@ class RelatorioReceitasDialog(BaseRelatorioDialog):
         if not caminho:
             return
         
+        from excel_generator import gerar_excel_relatorio
+        
         data_inicio, data_fim = self.date_filter.get_date_range()
         recebimentos = self.sistema.listar_recebimentos_por_data(data_inicio, data_fim)
         
@@ -206,10 +425,13 @@ class RelatorioReceitasDialog(BaseRelatorioDialog):
 # ===================== RELATÓRIO DESPESAS =====================
 
 class RelatorioDespesasDialog(BaseRelatorioDialog):
+    ENTIDADES = (eventos.DESPESA,)
+
     def __init__(self, sistema, parent=None, filtro_inicial=None):
         super().__init__(sistema, "Relatório de despesas", parent)
         
         self.layout_card.addWidget(self._add_date_filter())
+        self.layout_card.addWidget(self._add_busca("Buscar na descrição..."))
         
         if filtro_inicial:
             self.date_filter.blockSignals(True)
@@ -219,11 +441,20 @@ class RelatorioDespesasDialog(BaseRelatorioDialog):
         self.btn_atualizar.clicked.connect(self.carregar_dados)
         
         self._setup_tabela(["Data", "Descrição", "Valor", "Forma pagamento", "A prazo?"])
+        self._habilitar_selecao_multipla()
         
         footer = QHBoxLayout()
         self.lbl_total = QLabel("Total das despesas: R$ 0,00")
         footer.addWidget(self.lbl_total)
         footer.addStretch()
+
+        btn_pagar = QPushButton("Marcar como pagas", objectName="secondaryButton")
+        btn_pagar.clicked.connect(self._marcar_como_pagas)
+        footer.addWidget(btn_pagar)
+
+        btn_forma = QPushButton("Alterar forma", objectName="secondaryButton")
+        btn_forma.clicked.connect(self._alterar_forma_pagamento)
+        footer.addWidget(btn_forma)
         
         btn_excel = QPushButton("Exportar Excel", objectName="secondaryButton")
         btn_excel.clicked.connect(self._exportar_excel)
@@ -235,43 +466,52 @@ class RelatorioDespesasDialog(BaseRelatorioDialog):
         self.carregar_dados()
 
     def carregar_dados(self):
+        self._cancelar_carga_pendente()
         data_inicio, data_fim = self.date_filter.get_date_range()
         
-        self._linhas_raw = []
+        self._linhas = []
         linhas = []
-        total = 0.0
         
         despesas = self.sistema.listar_despesas_por_data(data_inicio, data_fim)
+        ids = self._ids_busca("Despesa", data_inicio, data_fim)
         
         for d in despesas:
+            if ids is not None and d.id not in ids:
+                continue
+            celulas, chave = self._montar_linha("Despesa", d)
+            linhas.append(celulas)
+            self._linhas.append(chave)
             
-            prazo = "Sim" if d.eh_a_prazo else "Não"
-            linhas.append((d.data, d.descricao, d.valor, d.forma_pagamento.value, prazo))
-            total += d.valor
-            
-            self._linhas_raw.append({
-                "tipo": "Despesa",
-                "id": d.id,
-                "data": d.data,
-                "descricao": d.descricao,
-                "valor": d.valor,
-                "forma_pagamento": d.forma_pagamento.value,
-                "eh_a_prazo": d.eh_a_prazo,
-                "data_vencimento": d.data_vencimento,
-                "situacao": None,
-                "comprovante": d.comprovante_caminho
-            })
-            
-        self.tabela.setRowCount(len(linhas))
-        for i, (dt, desc, val, fp, prz) in enumerate(linhas):
-            self.tabela.setItem(i, 0, QTableWidgetItem(_date_to_str(dt)))
-            self.tabela.setItem(i, 1, QTableWidgetItem(desc))
-            self.tabela.setItem(i, 2, QTableWidgetItem(f"{val:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")))
-            self.tabela.setItem(i, 3, QTableWidgetItem(fp))
-            self.tabela.setItem(i, 4, QTableWidgetItem(prz))
-            
-        self.lbl_total.setText(f"Total das despesas: R$ {total:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
-    
+        self._preencher_tabela(linhas)
+        self._atualizar_rodape()
+
+    def _montar_linha(self, tipo, d):
+        prazo = "Sim" if d.eh_a_prazo else "Não"
+        celulas = (_date_to_str(d.data), d.descricao, _moeda(d.valor), d.forma_pagamento.value, prazo)
+        return celulas, ChaveLinha("Despesa", d.id, d.valor)
+
+    def _atualizar_rodape(self, anterior=None, atual=None):
+        total = sum(chave.valor for chave in self._linhas)
+        self.lbl_total.setText(f"Total das despesas: R$ {_moeda(total)}")
+
+    def _marcar_como_pagas(self):
+        """Contas a prazo selecionadas (com todas as parcelas) passam a pagas."""
+        alteradas = self._acao_em_lote("Marcar como pagas", self.sistema.marcar_despesas_como_pagas)
+        if alteradas is not None:
+            QMessageBox.information(self, "Marcar como pagas", f"{alteradas} conta(s) a prazo marcada(s) como paga(s).")
+
+    def _alterar_forma_pagamento(self):
+        selecionadas = len(self._ids_selecionados())
+        if not selecionadas:
+            QMessageBox.information(self, "Alterar forma", "Selecione uma ou mais linhas.")
+            return
+        forma = self._escolher_forma_pagamento("Alterar forma")
+        if forma is not None:
+            alteradas = self._acao_em_lote(
+                "Alterar forma", lambda ids: self.sistema.alterar_forma_pagamento_despesas(ids, forma)
+            )
+            self._avisar_nao_alteradas("Alterar forma", selecionadas, alteradas)
+
     def _exportar_excel(self):
         """Exporta Excel do relatório de despesas."""
         caminho, _ = QFileDialog.getSaveFileName(
@@ -280,14 +520,19 @@ class RelatorioDespesasDialog(BaseRelatorioDialog):
         if not caminho:
             return
         
+        from excel_generator import gerar_excel_relatorio
+        
         data_inicio, data_fim = self.date_filter.get_date_range()
         despesas = self.sistema.listar_despesas_por_data(data_inicio, data_fim)
+        ids = self._ids_busca("Despesa", data_inicio, data_fim)
         
         colunas = ["Data", "Descrição", "Valor", "Forma Pagamento", "A prazo?"]
         linhas = []
         total = 0.0
         
         for d in despesas:
+            if ids is not None and d.id not in ids:
+                continue
             prazo = "Sim" if d.eh_a_prazo else "Não"
             linhas.append((d.data, d.descricao, d.valor, d.forma_pagamento.value, prazo))
             total += d.valor
@@ -307,19 +552,35 @@ class RelatorioDespesasDialog(BaseRelatorioDialog):
 # ===================== RELATÓRIO NOTAS =====================
 
 class RelatorioNotasDialog(BaseRelatorioDialog):
+    ENTIDADES = (eventos.ORDEM_SERVICO,)
+
     def __init__(self, sistema, parent=None):
         super().__init__(sistema, "Relatório de notas de serviço", parent)
         
         self.layout_card.addWidget(self._add_date_filter())
+        self.layout_card.addWidget(self._add_busca("Buscar por cliente ou descrição..."))
         self.btn_atualizar = QPushButton("Atualizar", objectName="secondaryButton")
         self.btn_atualizar.clicked.connect(self.carregar_dados)
         
         self._setup_tabela(["Cliente", "Valor", "Pago", "Data"])
+        self._habilitar_selecao_multipla()
         
         footer = QHBoxLayout()
         self.lbl_total = QLabel("Total: R$ 0,00")
         footer.addWidget(self.lbl_total)
         footer.addStretch()
+
+        btn_receber = QPushButton("Receber", objectName="secondaryButton")
+        btn_receber.clicked.connect(self._receber)
+        footer.addWidget(btn_receber)
+
+        btn_pagar = QPushButton("Marcar como pagas", objectName="secondaryButton")
+        btn_pagar.clicked.connect(self._marcar_como_pagas)
+        footer.addWidget(btn_pagar)
+
+        btn_forma = QPushButton("Alterar forma", objectName="secondaryButton")
+        btn_forma.clicked.connect(self._alterar_forma_pagamento)
+        footer.addWidget(btn_forma)
         
         btn_excel = QPushButton("Exportar Excel", objectName="secondaryButton")
         btn_excel.clicked.connect(self._exportar_excel)
@@ -331,42 +592,58 @@ class RelatorioNotasDialog(BaseRelatorioDialog):
         self.carregar_dados()
 
     def carregar_dados(self):
+        self._cancelar_carga_pendente()
         data_inicio, data_fim = self.date_filter.get_date_range()
         
-        self._linhas_raw = []
+        self._linhas = []
         linhas = []
-        total = 0.0
         
         ordens = self.sistema.listar_ordens_servico_por_data(data_inicio, data_fim)
+        ids = self._ids_busca("Nota de serviço", data_inicio, data_fim)
         
         for n in ordens:
+            if ids is not None and n.id not in ids:
+                continue
+            celulas, chave = self._montar_linha("Nota de serviço", n)
+            linhas.append(celulas)
+            self._linhas.append(chave)
             
-            sit = "Paga" if n.foi_pago else "Não paga"
-            linhas.append((n.cliente, n.valor_total, sit, n.data))
-            total += n.valor_total
-            
-            fp = n.forma_pagamento.value if n.forma_pagamento else "Não definido"
-            self._linhas_raw.append({
-                "tipo": "Nota de serviço",
-                "id": n.id,
-                "data": n.data,
-                "cliente": n.cliente,
-                "descricao": n.descricao,
-                "valor": n.valor_total,
-                "situacao": sit,
-                "pago_int": 1 if n.foi_pago else 0,
-                "forma_pagamento": fp,
-                "comprovante": None
-            })
-            
-        self.tabela.setRowCount(len(linhas))
-        for i, (cli, val, sit, dt) in enumerate(linhas):
-            self.tabela.setItem(i, 0, QTableWidgetItem(cli))
-            self.tabela.setItem(i, 1, QTableWidgetItem(f"{val:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")))
-            self.tabela.setItem(i, 2, QTableWidgetItem(sit))
-            self.tabela.setItem(i, 3, QTableWidgetItem(_date_to_str(dt)))
-            
-        self.lbl_total.setText(f"Total das notas: R$ {total:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+        self._preencher_tabela(linhas)
+        self._atualizar_rodape()
+
+    def _montar_linha(self, tipo, n):
+        sit = "Paga" if n.foi_pago else "Não paga"
+        celulas = (n.cliente, _moeda(n.valor_total), sit, _date_to_str(n.data))
+        return celulas, ChaveLinha("Nota de serviço", n.id, n.valor_total)
+
+    def _atualizar_rodape(self, anterior=None, atual=None):
+        total = sum(chave.valor for chave in self._linhas)
+        self.lbl_total.setText(f"Total das notas: R$ {_moeda(total)}")
+
+    def _acao_com_forma(self, titulo, acao):
+        """Pede a forma de pagamento e roda `acao(ids, forma)` nas linhas selecionadas."""
+        if not self._ids_selecionados():
+            QMessageBox.information(self, titulo, "Selecione uma ou mais linhas.")
+            return None
+        forma = self._escolher_forma_pagamento(titulo)
+        if forma is None:
+            return None
+        return self._acao_em_lote(titulo, lambda ids: acao(ids, forma))
+
+    def _receber(self):
+        """Lança um recebimento com o saldo em aberto das notas selecionadas."""
+        self._acao_com_forma("Receber", self.sistema.quitar_ordens_servico)
+
+    def _marcar_como_pagas(self):
+        """Marca as notas selecionadas como pagas, sem lançar recebimento."""
+        alteradas = self._acao_com_forma("Marcar como pagas", self.sistema.marcar_ordens_como_pagas)
+        if alteradas is not None:
+            QMessageBox.information(self, "Marcar como pagas", f"{alteradas} nota(s) marcada(s) como paga(s).")
+
+    def _alterar_forma_pagamento(self):
+        selecionadas = len(self._ids_selecionados())
+        alteradas = self._acao_com_forma("Alterar forma", self.sistema.alterar_forma_pagamento_ordens)
+        self._avisar_nao_alteradas("Alterar forma", selecionadas, alteradas)
     
     def _exportar_excel(self):
         """Exporta Excel do relatório de notas de serviço."""
@@ -376,14 +653,19 @@ class RelatorioNotasDialog(BaseRelatorioDialog):
         if not caminho:
             return
         
+        from excel_generator import gerar_excel_relatorio
+        
         data_inicio, data_fim = self.date_filter.get_date_range()
         ordens = self.sistema.listar_ordens_servico_por_data(data_inicio, data_fim)
+        ids = self._ids_busca("Nota de serviço", data_inicio, data_fim)
         
         colunas = ["Cliente", "Valor", "Situação", "Data"]
         linhas = []
         total = 0.0
         
         for n in ordens:
+            if ids is not None and n.id not in ids:
+                continue
             sit = "Paga" if n.foi_pago else "Não paga"
             linhas.append((n.cliente, n.valor_total, sit, n.data))
             total += n.valor_total
@@ -400,11 +682,526 @@ class RelatorioNotasDialog(BaseRelatorioDialog):
             QMessageBox.critical(self, "Erro", "Erro ao exportar Excel.")
 
 
+# ===================== AGING DE NOTAS A RECEBER =====================
+
+class RelatorioAgingDialog(BaseRelatorioDialog):
+    """
+    Notas de serviço não pagas por cliente e por idade (0-30, 31-60, 61-90
+    e mais de 90 dias). Não tem filtro de data: a idade é sempre contada
+    até hoje. Cada linha é um cliente, não um lançamento.
+    """
+    ENTIDADES = (eventos.ORDEM_SERVICO,)
+    COLUNAS = ["Cliente", "0-30 dias", "31-60 dias", "61-90 dias", "Mais de 90", "Total", "Notas", "Mais antiga"]
+
+    def __init__(self, sistema, parent=None):
+        super().__init__(sistema, "Notas a receber por idade", parent)
+        self._aging = []
+
+        self._setup_tabela(self.COLUNAS)
+
+        footer = QHBoxLayout()
+        self.lbl_total = QLabel("Total a receber: R$ 0,00")
+        footer.addWidget(self.lbl_total)
+        footer.addStretch()
+
+        btn_excel = QPushButton("Exportar Excel", objectName="secondaryButton")
+        btn_excel.clicked.connect(self._exportar_excel)
+        footer.addWidget(btn_excel)
+
+        self.btn_atualizar = QPushButton("Atualizar", objectName="secondaryButton")
+        self.btn_atualizar.clicked.connect(self.carregar_dados)
+        footer.addWidget(self.btn_atualizar)
+        self.layout_card.addLayout(footer)
+
+        self.carregar_dados()
+
+    @staticmethod
+    def _valores(a):
+        return (a.ate_30, a.de_31_a_60, a.de_61_a_90, a.acima_de_90, a.total)
+
+    def carregar_dados(self):
+        self._cancelar_carga_pendente()
+        self._aging = self.sistema.aging_ordens_servico()
+        linhas = [
+            (a.cliente, *(_moeda(v) for v in self._valores(a)), str(a.quantidade), _date_to_str(a.mais_antiga))
+            for a in self._aging
+        ]
+        self._preencher_tabela(linhas)
+        self._atualizar_rodape()
+
+    def _atualizar_rodape(self, anterior=None, atual=None):
+        totais = [sum(v) for v in zip(*(self._valores(a) for a in self._aging))] or [0.0] * 5
+        self.lbl_total.setText(
+            f"Total a receber: R$ {_moeda(totais[4])}  (mais de 90 dias: R$ {_moeda(totais[3])})"
+        )
+
+    def _on_evento(self, evento):
+        # Qualquer nota criada ou alterada pode mudar os totais de um cliente
+        if self.isVisible():
+            self._agendar_carga()
+
+    def _abrir_detalhes_linha(self, row, col):
+        """As linhas são clientes: abre o relatório de notas."""
+        pai = self.parent()
+        if hasattr(pai, "abrir_relatorio_notas"):
+            pai.abrir_relatorio_notas()
+
+    def resetar(self, filtro_inicial=None):
+        self.tabela.clearSelection()
+        self.tabela.scrollToTop()
+        self.carregar_dados()
+
+    def _exportar_excel(self):
+        """Exporta Excel do aging (valores como números, para somar na planilha)."""
+        caminho, _ = QFileDialog.getSaveFileName(
+            self, "Salvar Excel", "aging_notas_servico.xlsx", "Excel Files (*.xlsx)"
+        )
+        if not caminho:
+            return
+
+        from excel_generator import gerar_excel_relatorio
+
+        linhas = [
+            (a.cliente, *self._valores(a), a.quantidade, a.mais_antiga)
+            for a in self._aging
+        ]
+        total = sum(a.total for a in self._aging)
+        periodo = f"Idade contada até {_date_to_str(date.today())}"
+        saldo = f"Total a receber: R$ {_moeda(total)}"
+
+        sucesso = gerar_excel_relatorio(
+            caminho, "Notas de Serviço a Receber por Idade", periodo, saldo, self.COLUNAS, linhas
+        )
+
+        if sucesso:
+            QMessageBox.information(self, "Sucesso", f"Excel exportado com sucesso!\n{caminho}")
+        else:
+            QMessageBox.critical(self, "Erro", "Erro ao exportar Excel.")
+
+
+# ===================== FOLHA DE PAGAMENTO =====================
+
+class RelatorioFolhaDialog(BaseRelatorioDialog):
+    """
+    Salários, 13º e férias que a folha deve pagar no mês escolhido, com o
+    valor de cada despesa e se ela já foi lançada. É a prévia de "Lançar
+    despesas", que grava de uma vez só o que ainda falta lançar. As
+    obrigações vêm do calendário da folha (sistema.obrigacoes_folha), que
+    guarda cada mês já calculado.
+    """
+    ENTIDADES = (eventos.FUNCIONARIO,)
+    COLUNAS = ["Data", "Funcionário", "Cargo", "Obrigação", "Valor", "Situação"]
+
+    def __init__(self, sistema, parent=None):
+        super().__init__(sistema, "Folha de pagamento", parent)
+        self._previstos = []
+
+        # O filtro fica sempre em "Mês": só o seletor de data aparece
+        self.layout_card.addWidget(self._add_date_filter())
+        self.date_filter.combo_modo.hide()
+        self.date_filter.blockSignals(True)
+        self.date_filter.set_modo("Mês")
+        self.date_filter.blockSignals(False)
+
+        self._setup_tabela(self.COLUNAS)
+
+        footer = QHBoxLayout()
+        self.lbl_total = QLabel("Nenhum pagamento no mês")
+        footer.addWidget(self.lbl_total)
+        footer.addStretch()
+
+        btn_excel = QPushButton("Exportar Excel", objectName="secondaryButton")
+        btn_excel.clicked.connect(self._exportar_excel)
+        footer.addWidget(btn_excel)
+
+        self.btn_lancar = QPushButton("Lançar despesas", objectName="secondaryButton")
+        self.btn_lancar.clicked.connect(self._lancar_folha)
+        footer.addWidget(self.btn_lancar)
+        self.layout_card.addLayout(footer)
+
+        self.carregar_dados()
+
+    def _mes(self):
+        inicio, _ = self.date_filter.get_date_range()
+        return inicio.year, inicio.month
+
+    @staticmethod
+    def _situacao(previsto):
+        if previsto.lancado:
+            return "Lançada"
+        return "A lançar" if previsto.valor is not None else "Sem salário"
+
+    def _a_lancar(self):
+        return [p for p in self._previstos if not p.lancado and p.valor is not None]
+
+    def carregar_dados(self):
+        self._cancelar_carga_pendente()
+        self._previstos = self.sistema.prever_folha(*self._mes())
+        linhas = [
+            (
+                _date_to_str(p.obrigacao.data), p.obrigacao.funcionario.nome, p.obrigacao.funcionario.cargo,
+                p.obrigacao.tipo, _moeda(p.valor) if p.valor is not None else "-", self._situacao(p),
+            )
+            for p in self._previstos
+        ]
+        self._preencher_tabela(linhas)
+        self._atualizar_rodape()
+
+    def _atualizar_rodape(self, anterior=None, atual=None):
+        if not self._previstos:
+            self.lbl_total.setText("Nenhum pagamento no mês")
+            self.btn_lancar.setEnabled(False)
+            return
+        total = sum(p.valor or 0.0 for p in self._previstos)
+        a_lancar = self._a_lancar()
+        self.lbl_total.setText(
+            f"{len(self._previstos)} pagamento(s), total R$ {_moeda(total)} — {len(a_lancar)} a lançar"
+        )
+        self.btn_lancar.setEnabled(bool(a_lancar))
+
+    def _lancar_folha(self):
+        a_lancar = self._a_lancar()
+        if not a_lancar:
+            return
+        total = sum(p.valor for p in a_lancar)
+        resposta = QMessageBox.question(
+            self, "Lançar folha",
+            f"Lançar {len(a_lancar)} despesa(s) da folha, total R$ {_moeda(total)}?",
+        )
+        if resposta != QMessageBox.Yes:
+            return
+        ids = self.sistema.lancar_folha(*self._mes())
+        self.carregar_dados()
+        QMessageBox.information(self, "Lançar folha", f"{len(ids)} despesa(s) lançada(s).")
+
+    def _on_evento(self, evento):
+        # O calendário foi descartado pelo sistema: recarrega se estiver aberto
+        if self.isVisible():
+            self._agendar_carga()
+
+    def _abrir_detalhes_linha(self, row, col):
+        """Despesa já lançada abre o detalhe; as outras linhas, os funcionários."""
+        if 0 <= row < len(self._previstos) and self._previstos[row].lancado:
+            from interface.dialogs.details import DetalheLancamentoDialog
+            DetalheLancamentoDialog("Despesa", self._previstos[row].despesa_id, self).exec()
+            return
+        pai = self.parent()
+        if hasattr(pai, "abrir_funcionarios"):
+            pai.abrir_funcionarios()
+
+    def resetar(self, filtro_inicial=None):
+        self.date_filter.set_modo("Mês")
+        self.tabela.clearSelection()
+        self.tabela.scrollToTop()
+        self.carregar_dados()
+
+    def _exportar_excel(self):
+        """Exporta Excel da folha do mês."""
+        caminho, _ = QFileDialog.getSaveFileName(
+            self, "Salvar Excel", "folha_pagamento.xlsx", "Excel Files (*.xlsx)"
+        )
+        if not caminho:
+            return
+
+        from excel_generator import gerar_excel_relatorio
+
+        linhas = [
+            (p.obrigacao.data, p.obrigacao.funcionario.nome, p.obrigacao.funcionario.cargo,
+             p.obrigacao.tipo, p.valor, self._situacao(p))
+            for p in self._previstos
+        ]
+        periodo = self.date_filter.lbl_info.text()
+        total = self.lbl_total.text()
+
+        sucesso = gerar_excel_relatorio(caminho, "Folha de Pagamento", periodo, total, self.COLUNAS, linhas)
+
+        if sucesso:
+            QMessageBox.information(self, "Sucesso", f"Excel exportado com sucesso!\n{caminho}")
+        else:
+            QMessageBox.critical(self, "Erro", "Erro ao exportar Excel.")
+
+
+# ===================== PREVISÃO MENSAL =====================
+
+class RelatorioPrevisaoDialog(BaseRelatorioDialog):
+    """
+    Previsão de receitas e despesas para os próximos meses, com o
+    histórico mensal no gráfico. As contas ficam no sistema
+    (sistema.prever_totais_mensais), que guarda o resultado até um
+    recebimento ou despesa ser gravado. Cada linha é um mês, não um
+    lançamento.
+    """
+    ENTIDADES = (eventos.RECEBIMENTO, eventos.DESPESA)
+    COLUNAS = ["Mês", "Receitas previstas", "Despesas previstas", "Resultado previsto"]
+    # Meses do histórico exibidos no gráfico
+    MESES_GRAFICO = 24
+    HORIZONTES = (3, 6, 12)
+
+    def __init__(self, sistema, parent=None):
+        super().__init__(sistema, "Previsão de receitas e despesas", parent)
+        self._previsoes = ()
+
+        self.grafico = GraficoLinhas()
+        self.grafico.setMinimumHeight(200)
+        self.layout_card.addWidget(self.grafico)
+
+        self._setup_tabela(self.COLUNAS)
+
+        footer = QHBoxLayout()
+        self.lbl_total = QLabel("")
+        footer.addWidget(self.lbl_total)
+        footer.addStretch()
+
+        self.combo_horizonte = QComboBox()
+        for meses in self.HORIZONTES:
+            self.combo_horizonte.addItem(f"{meses} meses", meses)
+        self.combo_horizonte.setCurrentIndex(1)
+        self.combo_horizonte.currentIndexChanged.connect(self._agendar_carga)
+        footer.addWidget(self.combo_horizonte)
+
+        btn_excel = QPushButton("Exportar Excel", objectName="secondaryButton")
+        btn_excel.clicked.connect(self._exportar_excel)
+        footer.addWidget(btn_excel)
+        self.layout_card.addLayout(footer)
+
+        self.carregar_dados()
+
+    @staticmethod
+    def _mes(texto):
+        """'AAAA-MM' -> 'MM/AAAA'."""
+        return f"{texto[5:7]}/{texto[:4]}"
+
+    def carregar_dados(self):
+        self._cancelar_carga_pendente()
+        meses = self.combo_horizonte.currentData()
+        self._previsoes = receitas, despesas = (
+            self.sistema.prever_totais_mensais(eventos.RECEBIMENTO, meses),
+            self.sistema.prever_totais_mensais(eventos.DESPESA, meses),
+        )
+        linhas = [
+            (self._mes(mes), _moeda(r), _moeda(d), _moeda(r - d))
+            for mes, r, d in zip(receitas.meses_previstos, receitas.previstos, despesas.previstos)
+        ]
+        self._preencher_tabela(linhas)
+        self._atualizar_rodape()
+        self._desenhar_grafico()
+
+    def _desenhar_grafico(self):
+        """Histórico recente em linha cheia; a previsão, tracejada, continua do último mês."""
+        receitas, despesas = self._previsoes
+        n = min(self.MESES_GRAFICO, len(receitas.meses))
+        rotulos = [self._mes(m) for m in receitas.meses[len(receitas.meses) - n:] + receitas.meses_previstos]
+        series = []
+        for nome, p, cor in (("Receitas", receitas, POSITIVO), ("Despesas", despesas, NEGATIVO)):
+            historico = p.valores[len(p.valores) - n:]
+            vazio_previsao = [None] * len(p.previstos)
+            # A previsão começa no último mês do histórico, para as linhas se ligarem
+            ligacao = [None] * (n - 1) + historico[-1:] if n else []
+            series.append(Serie(nome, historico + vazio_previsao, cor))
+            series.append(Serie(f"{nome} previstas", ligacao + p.previstos, cor, tracejada=True))
+        self.grafico.definir_dados(rotulos, series)
+
+    @staticmethod
+    def _ultima_media(previsao):
+        return previsao.media_movel[-1] if previsao.media_movel else None
+
+    def _atualizar_rodape(self, anterior=None, atual=None):
+        receitas, despesas = self._previsoes
+        mr, md = self._ultima_media(receitas), self._ultima_media(despesas)
+        if mr is None or md is None:
+            self.lbl_total.setText("Histórico curto demais para a média móvel")
+            return
+        self.lbl_total.setText(
+            f"Média dos últimos meses: receitas R$ {_moeda(mr)}, despesas R$ {_moeda(md)}"
+        )
+
+    def _on_evento(self, evento):
+        # Qualquer lançamento muda os totais mensais (e invalida a previsão)
+        if self.isVisible():
+            self._agendar_carga()
+
+    def _abrir_detalhes_linha(self, row, col):
+        """As linhas são meses previstos: não há lançamento para abrir."""
+
+    def resetar(self, filtro_inicial=None):
+        self.tabela.clearSelection()
+        self.tabela.scrollToTop()
+        self.carregar_dados()
+
+    def _exportar_excel(self):
+        """Exporta Excel da previsão (valores como números, para somar na planilha)."""
+        caminho, _ = QFileDialog.getSaveFileName(
+            self, "Salvar Excel", "previsao_mensal.xlsx", "Excel Files (*.xlsx)"
+        )
+        if not caminho:
+            return
+
+        from excel_generator import gerar_excel_relatorio
+
+        receitas, despesas = self._previsoes
+        linhas = [
+            (self._mes(mes), r, d, r - d)
+            for mes, r, d in zip(receitas.meses_previstos, receitas.previstos, despesas.previstos)
+        ]
+        periodo = f"Previsão feita em {_date_to_str(date.today())}"
+        saldo = f"Resultado previsto: R$ {_moeda(sum(receitas.previstos) - sum(despesas.previstos))}"
+
+        sucesso = gerar_excel_relatorio(
+            caminho, "Previsão de Receitas e Despesas", periodo, saldo, self.COLUNAS, linhas
+        )
+
+        if sucesso:
+            QMessageBox.information(self, "Sucesso", f"Excel exportado com sucesso!\n{caminho}")
+        else:
+            QMessageBox.critical(self, "Erro", "Erro ao exportar Excel.")
+
+
 # ===================== RELATÓRIO GERAL =====================
 
+class ModeloExtrato(QAbstractTableModel):
+    """
+    Model do relatório geral: linhas do extrato (LancamentoExtrato) lidas
+    do sistema em páginas, conforme a tabela rola (canFetchMore/fetchMore).
+    Ordenar por uma coluna relê o extrato já ordenado pelo banco.
+    """
+
+    COLUNAS = ["Tipo", "ID", "Data / Situação", "Descrição", "Valor", "Saldo acumulado"]
+    # Coluna do extrato por trás de cada coluna da tabela. O saldo só
+    # existe na ordem por data, então ordenar por ele é ordenar por data.
+    ORDENACAO = ("tipo", "id", "data", "descricao", "valor", "data")
+    COLUNA_DATA = 2
+
+    # Linhas lidas do extrato por vez
+    TAMANHO_PAGINA = 500
+
+    def __init__(self, sistema, parent=None):
+        super().__init__(parent)
+        self.sistema = sistema
+        self.linhas = []                # LancamentoExtrato exibidos
+        self.ordenar_por = "data"
+        self.decrescente = False
+        self._periodo = (None, None)
+        self._filtro = {}
+        self._ultimo_lido = None        # última linha lida, exibida ou não
+        self._completo = True
+
+    @staticmethod
+    def aceita(filtro, lanc):
+        """`filtro`: tipo exibido -> ids aceitos (None = todos)."""
+        if lanc.tipo not in filtro:
+            return False
+        ids = filtro[lanc.tipo]
+        return ids is None or lanc.id in ids
+
+    def carregar(self, data_inicio, data_fim, filtro, minimo_linhas=None):
+        """Relê o extrato do período até ter `minimo_linhas` linhas exibidas."""
+        self.beginResetModel()
+        self._periodo = (data_inicio, data_fim)
+        self._filtro = filtro
+        self.linhas.clear()             # a lista é compartilhada com o diálogo
+        self._ultimo_lido = None
+        self._completo = not filtro
+        self.linhas += self._ler(minimo_linhas or self.TAMANHO_PAGINA)
+        self.endResetModel()
+
+    def recarregar(self):
+        """Relê com a ordem e o filtro atuais, mantendo a quantidade de linhas."""
+        self.carregar(*self._periodo, self._filtro, len(self.linhas))
+
+    def _ler(self, minimo_linhas):
+        """Lê páginas até juntar `minimo_linhas` linhas aceitas pelo filtro (ou acabar)."""
+        novas = []
+        while len(novas) < minimo_linhas and not self._completo:
+            pagina = self.sistema.pagina_extrato(
+                *self._periodo, self._ultimo_lido, self.TAMANHO_PAGINA,
+                self.ordenar_por, self.decrescente,
+            )
+            self._completo = len(pagina) < self.TAMANHO_PAGINA
+            if pagina:
+                self._ultimo_lido = replace(pagina[-1])
+            novas += [l for l in pagina if self.aceita(self._filtro, l)]
+        return novas
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._completo
+
+    def fetchMore(self, parent=QModelIndex()):
+        novas = self._ler(self.TAMANHO_PAGINA)
+        if novas:
+            inicio = len(self.linhas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(novas) - 1)
+            self.linhas += novas
+            self.endInsertRows()
+
+    def definir_ordem(self, coluna, ordem):
+        self.ordenar_por = self.ORDENACAO[coluna]
+        self.decrescente = ordem == Qt.DescendingOrder
+
+    def sort(self, coluna, ordem=Qt.AscendingOrder):
+        self.definir_ordem(coluna, ordem)
+        self.carregar(*self._periodo, self._filtro)
+
+    def substituir(self, row, lanc, diferenca=0.0):
+        """
+        Troca a linha `row` (que fica na mesma posição) e soma `diferenca`
+        ao saldo dela e de todas as posteriores a ela na ordem das datas.
+        """
+        self.linhas[row] = lanc
+        primeira = ultima = row
+        if diferenca and lanc.saldo is not None:
+            lanc.saldo += diferenca
+            if self.decrescente:
+                afetadas, primeira = self.linhas[:row], 0
+            else:
+                afetadas, ultima = self.linhas[row + 1:], len(self.linhas) - 1
+                # A próxima página parte do saldo da última linha lida
+                self._ultimo_lido.saldo += diferenca
+            for l in afetadas:
+                l.saldo += diferenca
+        self.dataChanged.emit(self.index(primeira, 0), self.index(ultima, len(self.COLUNAS) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.linhas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUNAS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUNAS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        lanc = self.linhas[index.row()]
+        col = index.column()
+        if col == 0:
+            return lanc.tipo
+        if col == 1:
+            return str(lanc.id)
+        if col == 2:
+            if lanc.tipo == "Nota de serviço":
+                return f"{_date_to_str(lanc.data)} - {'Paga' if lanc.foi_pago else 'Em aberto'}"
+            return _date_to_str(lanc.data)
+        if col == 3:
+            return lanc.descricao
+        if col == 4:
+            return _moeda(lanc.valor)
+        # Notas não mexem no saldo; fora da ordem por data não há saldo
+        if lanc.tipo == "Nota de serviço" or lanc.saldo is None:
+            return ""
+        return _moeda(lanc.saldo)
+
+
 class RelatorioGeralDialog(BaseRelatorioDialog):
+    ENTIDADES = (eventos.RECEBIMENTO, eventos.DESPESA, eventos.ORDEM_SERVICO)
     def __init__(self, sistema, parent=None, filtro_inicial=None):
         super().__init__(sistema, "Relatório geral", parent)
+        # Aqui cada linha é um LancamentoExtrato (tipo e id, como a
+        # ChaveLinha, mais data e saldo), na lista mantida pelo model
+        self.modelo = ModeloExtrato(sistema, self)
+        self._linhas = self.modelo.linhas
         
         # Filtros extras
         self.layout_card.addWidget(self._add_date_filter())
@@ -423,6 +1220,8 @@ class RelatorioGeralDialog(BaseRelatorioDialog):
         row_opts.addWidget(self.chk_receitas)
         row_opts.addWidget(self.chk_despesas)
         row_opts.addWidget(self.chk_notas)
+        row_opts.addSpacing(12)
+        row_opts.addWidget(self._add_busca("Buscar despesas e notas..."), 1)
         
         self.btn_atualizar = QPushButton("Atualizar", objectName="secondaryButton")
         self.btn_atualizar.clicked.connect(self.carregar_dados)
@@ -431,10 +1230,10 @@ class RelatorioGeralDialog(BaseRelatorioDialog):
         
         self.layout_card.addLayout(row_opts)
         
-        self._setup_tabela(["Tipo", "ID", "Data / Situação", "Descrição", "Valor"])
+        self._setup_tabela(ModeloExtrato.COLUNAS)
         
         footer = QHBoxLayout()
-        self.lbl_saldo = QLabel("Saldo (Receitas - Despesas): R$ 0,00")
+        self.lbl_saldo = QLabel("Saldo do período (Receitas - Despesas): R$ 0,00")
         footer.addWidget(self.lbl_saldo)
         footer.addStretch()
         
@@ -446,117 +1245,143 @@ class RelatorioGeralDialog(BaseRelatorioDialog):
         
         self.carregar_dados()
 
-    def carregar_dados(self):
-        data_inicio, data_fim = self.date_filter.get_date_range()
-        
-        self._linhas_raw = []
-        linhas = [] # (tipo, id, data_sit, desc, valor)
-        
-        # Receitas
-        if self.chk_receitas.isChecked():
-            recebimentos = self.sistema.listar_recebimentos_por_data(data_inicio, data_fim)
-            for r in recebimentos:
-                linhas.append(("Receita", r.id, r.data, f"Recebimento ({r.forma_pagamento.value})", r.valor))
-                self._linhas_raw.append({
-                    "tipo": "Receita", "id": r.id, "data": r.data, 
-                    "descricao": f"Recebimento ({r.forma_pagamento.value})",
-                    "valor": r.valor, "forma_pagamento": r.forma_pagamento.value,
-                    "comprovante": r.comprovante_caminho
-                })
-
-        # Despesas
+    def resetar(self, filtro_inicial=None):
+        for chk in (self.chk_receitas, self.chk_despesas, self.chk_notas):
+            chk.setChecked(True)
+        self._ordenar(ModeloExtrato.COLUNA_DATA, Qt.AscendingOrder)
+        super().resetar(filtro_inicial)
+
+    def _setup_tabela(self, colunas):
+        """Tabela sobre o ModeloExtrato: linhas sob demanda, ordenação no banco."""
+        self.tabela = QTableView()
+        self.tabela.setModel(self.modelo)
+        self.tabela.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabela.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabela.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tabela.verticalHeader().setVisible(False)
+        self.tabela.doubleClicked.connect(self._on_duplo_clique)
+        # Ordem inicial por data; setSortingEnabled já a aplica ao model
+        # (ainda sem filtro, então sem consulta)
+        self.tabela.horizontalHeader().setSortIndicator(ModeloExtrato.COLUNA_DATA, Qt.AscendingOrder)
+        self.tabela.setSortingEnabled(True)
+        self.layout_card.addWidget(self.tabela)
+
+    def _on_duplo_clique(self, index):
+        self._abrir_detalhes_linha(index.row(), index.column())
+
+    def _ordenar(self, coluna, ordem):
+        """Muda a ordem sem recarregar (a recarga vem em seguida)."""
+        header = self.tabela.horizontalHeader()
+        header.blockSignals(True)
+        header.setSortIndicator(coluna, ordem)
+        header.blockSignals(False)
+        self.modelo.definir_ordem(coluna, ordem)
+
+    def _filtro_tipos(self, data_inicio, data_fim):
+        """
+        Tipos exibidos -> ids aceitos (None = todos), conforme as caixas
+        e a busca. Receitas não têm texto: com busca ativa, ficam de fora.
+        """
+        ids_despesas = self._ids_busca("Despesa", data_inicio, data_fim)
+        ids_notas = self._ids_busca("Nota de serviço", data_inicio, data_fim)
+        filtro = {}
+        if self.chk_receitas.isChecked() and ids_despesas is None:
+            filtro["Receita"] = None
         if self.chk_despesas.isChecked():
-            despesas = self.sistema.listar_despesas_por_data(data_inicio, data_fim)
-            for d in despesas:
-                # Valor negativo visualmente
-                linhas.append(("Despesa", d.id, d.data, d.descricao, -abs(d.valor)))
-                self._linhas_raw.append({
-                    "tipo": "Despesa", "id": d.id, "data": d.data,
-                    "descricao": d.descricao, "valor": d.valor,
-                    "forma_pagamento": d.forma_pagamento.value,
-                    "eh_a_prazo": d.eh_a_prazo, "data_vencimento": d.data_vencimento,
-                    "comprovante": d.comprovante_caminho
-                })
-                
-        # Notas
+            filtro["Despesa"] = ids_despesas
         if self.chk_notas.isChecked():
-            ordens = self.sistema.listar_ordens_servico_por_data(data_inicio, data_fim)
-            for n in ordens:
-                sit = "Paga" if n.foi_pago else "Em aberto"
-                data_sit = f"{_date_to_str(n.data)} - {sit}"
-                linhas.append(("Nota de serviço", n.id, data_sit, n.descricao, n.valor_total))
-                
-                fp = n.forma_pagamento.value if n.forma_pagamento else "Não definido"
-                self._linhas_raw.append({
-                    "tipo": "Nota de serviço", "id": n.id, "data": n.data,
-                    "cliente": n.cliente, "descricao": n.descricao,
-                    "valor": n.valor_total, "situacao": sit,
-                    "forma_pagamento": fp,
-                    "comprovante": None
-                })
+            filtro["Nota de serviço"] = ids_notas
+        return filtro
 
-        self.tabela.setRowCount(len(linhas))
-        for i, (tipo, _id, ds, desc, val) in enumerate(linhas):
-            self.tabela.setItem(i, 0, QTableWidgetItem(tipo))
-            self.tabela.setItem(i, 1, QTableWidgetItem(str(_id or "")))
-            
-            d_str = _date_to_str(ds) if isinstance(ds, date) else str(ds)
-            self.tabela.setItem(i, 2, QTableWidgetItem(d_str))
-            self.tabela.setItem(i, 3, QTableWidgetItem(desc))
-            self.tabela.setItem(i, 4, QTableWidgetItem(f"{val:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")))
-
-        # Atualiza lado real do sistema (independente dos filtros visuais, geralmente)
-        # Mas aqui, o cliente pode querer o saldo DO RELATÓRIO? 
-        # O código original usava self.sistema.calcular_saldo() que é global.
-        saldo = self.sistema.calcular_saldo()
-        self.lbl_saldo.setText(f"Saldo (Receitas - Despesas): R$ {saldo:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+    def carregar_dados(self):
+        self._cancelar_carga_pendente()
+        data_inicio, data_fim = self.date_filter.get_date_range()
+        self.modelo.carregar(data_inicio, data_fim, self._filtro_tipos(data_inicio, data_fim))
+        self._atualizar_rodape()
+
+    def _aplicar_alteracao(self, row, modelo):
+        """
+        Se a linha continua no mesmo lugar da ordem atual, só ela é
+        reescrita e a diferença no fluxo desloca os saldos a partir dela.
+        Se mudou de lugar (ou saiu do período ou da busca), o extrato é
+        relido até a mesma quantidade de linhas, na mesma rolagem.
+        """
+        anterior = self._linhas[row]
+        if anterior.tipo == "Receita":
+            atual = replace(anterior, data=modelo.data, valor=modelo.valor,
+                            descricao=f"Recebimento ({modelo.forma_pagamento.value})")
+        elif anterior.tipo == "Despesa":
+            atual = replace(anterior, data=modelo.data, descricao=modelo.descricao, valor=-modelo.valor)
+        else:
+            atual = replace(anterior, data=modelo.data, descricao=modelo.descricao,
+                            valor=modelo.valor_total, foi_pago=modelo.foi_pago)
+
+        data_inicio, data_fim = self.date_filter.get_date_range()
+        fora = (data_inicio and atual.data < data_inicio) or (data_fim and atual.data > data_fim)
+        chave = self.modelo.ordenar_por
+        mudou_de_lugar = chave != "tipo" and getattr(atual, chave) != getattr(anterior, chave)
+        saiu_da_busca = self._saiu_da_busca(anterior.tipo, modelo)
+        if fora or saiu_da_busca or mudou_de_lugar:
+            rolagem = self.tabela.verticalScrollBar().value()
+            if saiu_da_busca:
+                # Os ids aceitos pelo filtro do model vêm da busca: refaz
+                filtro = self._filtro_tipos(data_inicio, data_fim)
+                self.modelo.carregar(data_inicio, data_fim, filtro, len(self.modelo.linhas))
+            else:
+                self.modelo.recarregar()
+            self.tabela.verticalScrollBar().setValue(rolagem)
+        else:
+            self.modelo.substituir(row, atual, atual.fluxo - anterior.fluxo)
+        self._atualizar_rodape()
+
+    def _atualizar_rodape(self, anterior=None, atual=None):
+        # Saldo do período filtrado (independe das caixas de tipo e da
+        # busca). Vem do índice de saldos do sistema, que já recebeu a
+        # alteração, então uma edição pontual não precisa de conta extra.
+        data_inicio, data_fim = self.date_filter.get_date_range()
+        saldo = self.sistema.saldo_periodo(data_inicio, data_fim)
+        texto = f"Saldo do período (Receitas - Despesas): R$ {_moeda(saldo)}"
+        if data_fim is not None:
+            saldo_final = self.sistema.saldo_em(data_fim)
+            texto += f"   ·   Saldo em {_date_to_str(data_fim)}: R$ {_moeda(saldo_final)}"
+        self.lbl_saldo.setText(texto)
     
     def _exportar_excel(self):
-        """Exporta Excel do relatório geral."""
+        """
+        Exporta Excel do relatório geral: o extrato inteiro do período, na
+        ordem da tabela, lido em páginas e entregue ao gerador linha a linha.
+        """
         caminho, _ = QFileDialog.getSaveFileName(
             self, "Salvar Excel", "relatorio_geral.xlsx", "Excel Files (*.xlsx)"
         )
         if not caminho:
             return
         
-        data_inicio, data_fim = self.date_filter.get_date_range()
+        from excel_generator import gerar_excel_relatorio
         
-        colunas = ["Tipo", "ID", "Data / Situação", "Descrição", "Valor"]
-        linhas = []
-        total_receitas = 0.0
-        total_despesas = 0.0
-        
-        # Receitas
-        if self.chk_receitas.isChecked():
-            recebimentos = self.sistema.listar_recebimentos_por_data(data_inicio, data_fim)
-            for r in recebimentos:
-                linhas.append(("Receita", str(r.id or ""), r.data, 
-                              f"Recebimento ({r.forma_pagamento.value})", r.valor))
-                total_receitas += r.valor
-        
-        # Despesas
-        if self.chk_despesas.isChecked():
-            despesas = self.sistema.listar_despesas_por_data(data_inicio, data_fim)
-            for d in despesas:
-                linhas.append(("Despesa", str(d.id or ""), d.data, 
-                              d.descricao, -abs(d.valor)))
-                total_despesas += d.valor
-        
-        # Notas
-        if self.chk_notas.isChecked():
-            ordens = self.sistema.listar_ordens_servico_por_data(data_inicio, data_fim)
-            for n in ordens:
-                sit = "Paga" if n.foi_pago else "Em aberto"
-                data_sit = f"{_date_to_str(n.data)} - {sit}"
-                linhas.append(("Nota de serviço", str(n.id or ""), data_sit, 
-                              n.descricao, n.valor_total))
+        data_inicio, data_fim = self.date_filter.get_date_range()
+        filtro = self._filtro_tipos(data_inicio, data_fim)
+        
+        def linhas():
+            extrato = self.sistema.extrato(
+                data_inicio, data_fim, self.modelo.ordenar_por, self.modelo.decrescente
+            )
+            for lanc in extrato:
+                if not ModeloExtrato.aceita(filtro, lanc):
+                    continue
+                if lanc.tipo == "Nota de serviço":
+                    sit = "Paga" if lanc.foi_pago else "Em aberto"
+                    yield (lanc.tipo, str(lanc.id), f"{_date_to_str(lanc.data)} - {sit}",
+                           lanc.descricao, lanc.valor, None)
+                else:
+                    yield (lanc.tipo, str(lanc.id), lanc.data, lanc.descricao, lanc.valor, lanc.saldo)
         
         modo = self.date_filter.get_modo_texto()
         periodo = "Todos os registros" if modo == "Tudo" else self.date_filter.lbl_info.text()
-        saldo = total_receitas - total_despesas
-        saldo_texto = f"Saldo (Receitas - Despesas): R$ {saldo:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        saldo = self.sistema.saldo_periodo(data_inicio, data_fim)
+        saldo_texto = f"Saldo do período (Receitas - Despesas): R$ {_moeda(saldo)}"
         
-        sucesso = gerar_excel_relatorio(caminho, "Relatório Geral", periodo, saldo_texto, colunas, linhas)
+        sucesso = gerar_excel_relatorio(caminho, "Relatório Geral", periodo, saldo_texto, ModeloExtrato.COLUNAS, linhas())
         
         if sucesso:
             QMessageBox.information(self, "Sucesso", f"Excel exportado com sucesso!\n{caminho}")
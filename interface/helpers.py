@@ -11,6 +11,7 @@ from datetime import date, timedelta
 from datetime import date, timedelta
 from PySide6.QtCore import QDate, QObject, QEvent, Qt
 from PySide6.QtWidgets import QLineEdit
+from PySide6.QtGui import QPixmap, QPainter, QPainterPath
 
 from models import FormaPagamento
 
@@ -175,6 +176,41 @@ def calcular_range_ano(ano: int) -> tuple[date, date]:
     return (inicio, fim)
 
 
+# ===================== IMAGENS =====================
+
+def criar_pixmap_circular(caminho: Optional[str], tamanho: int) -> Optional[QPixmap]:
+    """
+    Carrega a imagem em `caminho` e devolve um pixmap circular de `tamanho` px,
+    recortando o centro (mesmo efeito de "cover" do CSS).
+    Retorna None se não houver caminho ou se a imagem não puder ser lida.
+    """
+    if not caminho:
+        return None
+
+    pix = QPixmap(caminho)
+    if pix.isNull():
+        return None
+
+    rounded = QPixmap(tamanho, tamanho)
+    rounded.fill(Qt.transparent)
+
+    # Escala mantendo a proporção para cobrir o quadrado e recorta o centro
+    scaled_pix = pix.scaled(tamanho, tamanho, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    x = (scaled_pix.width() - tamanho) // 2
+    y = (scaled_pix.height() - tamanho) // 2
+    cropped = scaled_pix.copy(x, y, tamanho, tamanho)
+
+    painter = QPainter(rounded)
+    painter.setRenderHint(QPainter.Antialiasing)
+    path = QPainterPath()
+    path.addEllipse(0, 0, tamanho, tamanho)
+    painter.setClipPath(path)
+    painter.drawPixmap(0, 0, cropped)
+    painter.end()
+
+    return rounded
+
+
 # ===================== FILTROS DE EVENTOS (UI) =====================
 
 class EnterKeyFilter(QObject):
@@ -203,3 +239,14 @@ class EnterKeyFilter(QObject):
         
         # Deixa o evento seguir normalmente
         return super().eventFilter(obj, event)
+
+
+# ===================== EVENTOS =====================
+
+def inscrever_eventos(widget, sistema, callback, entidades=None) -> None:
+    """
+    Inscreve `callback` no barramento de eventos do sistema enquanto o
+    widget existir: a inscrição é cancelada quando ele é destruído.
+    """
+    cancelar = sistema.eventos.inscrever(callback, entidades)
+    widget.destroyed.connect(lambda *_: cancelar())
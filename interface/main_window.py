@@ -7,24 +7,33 @@ incluindo header, sidebar e cards financeiros dinâmicos.
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QFrame, QScrollArea, QSizePolicy
+    QPushButton, QFrame, QScrollArea, QSizePolicy, QComboBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 from datetime import date, timedelta
 
-from interface.styles import DIALOG_STYLES
-from interface.dialogs.add import (
-    NovaReceitaDialog, NovaDespesaDialog, NovaNotaServicoDialog
-)
-from interface.dialogs.reports import (
-    RelatorioReceitasDialog, RelatorioDespesasDialog, 
-    RelatorioNotasDialog, RelatorioGeralDialog
-)
-from interface.pages.employees_page import EmployeesPage
+import eventos
+from interface.charts import GraficoLinhas, Serie, NEUTRO
+from interface.theme import definir_tom
+from interface.dialog_pool import DialogPool
+from interface.helpers import inscrever_eventos
+
+# Os diálogos (e o openpyxl, usado pelos relatórios) são importados só no
+# primeiro uso, dentro dos métodos de ação: a janela principal abre sem
+# pagar o custo de carregar módulos que talvez nem sejam usados.
+#
+# Depois de construídos, os diálogos ficam no DialogPool e são reaproveitados:
+# reabrir "+ Receita" só limpa o formulário, sem recriar a árvore de widgets.
 
 
 class MainWindow(QMainWindow):
+    # Primeira verificação de vencimentos (após abrir) e intervalo entre elas
+    ATRASO_ALERTAS_MS = 1500
+    INTERVALO_ALERTAS_MS = 60_000
+    # Horizontes (dias) oferecidos no painel de fluxo de caixa
+    HORIZONTES_PROJECAO = (30, 60, 90)
+
     def __init__(self, sistema):
         super().__init__()
 
@@ -35,12 +44,32 @@ class MainWindow(QMainWindow):
         self.janela_funcionarios = None
         
         self._setup_ui()
+        self._setup_dialogos()
+        
+        # Totais do painel: calculados uma vez e depois ajustados pelos
+        # eventos de alteração (só a diferença de cada registro)
+        self._atualizar_resumo()
+        inscrever_eventos(self, self.sistema, self._on_evento)
+
+        # Alertas de vencimento: a primeira leitura das contas a pagar fica
+        # para depois da janela aparecer; depois disso a agenda do sistema
+        # acompanha as despesas e cada verificação só consulta a memória
+        self._timer_alertas = QTimer(self)
+        self._timer_alertas.timeout.connect(self._atualizar_alertas)
+        QTimer.singleShot(self.ATRASO_ALERTAS_MS, self._iniciar_alertas)
+
+        # Fluxo de caixa projetado: também calculado depois da janela
+        # aparecer; alterações em sequência viram um só recálculo
+        self._projecao_iniciada = False
+        self._timer_projecao = QTimer(self)
+        self._timer_projecao.setSingleShot(True)
+        self._timer_projecao.timeout.connect(self._atualizar_projecao)
+        self._timer_alertas.timeout.connect(self._agendar_projecao)   # virada do dia
 
     def _setup_ui(self):
         """Configura a interface principal."""
-        central = QWidget()
+        central = QWidget(objectName="centralWidget")
         self.setCentralWidget(central)
-        central.setStyleSheet("background-color: #F5F5F5;")
         
         main_layout = QVBoxLayout(central)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -64,22 +93,15 @@ class MainWindow(QMainWindow):
 
     def _create_header(self, parent_layout):
         """Cria o header azul escuro."""
-        header = QFrame()
+        header = QFrame(objectName="mainHeader")
         header.setFixedHeight(55)
-        header.setStyleSheet("background-color: #2B4B7C;")
         
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(15, 0, 15, 0)
         header_layout.setSpacing(12)
         
         # Logo
-        logo = QLabel("🔧")
-        logo.setStyleSheet("""
-            font-size: 24px;
-            background-color: #3D5A80;
-            padding: 6px 10px;
-            border-radius: 8px;
-        """)
+        logo = QLabel("🔧", objectName="headerLogo")
         header_layout.addWidget(logo)
         
         # Menu
@@ -88,53 +110,37 @@ class MainWindow(QMainWindow):
         
         # Ajuda
         help_btn = self._header_icon("?")
-        help_btn.setStyleSheet("""
-            font-size: 16px;
-            font-weight: bold;
-            color: white;
-            background: transparent;
-            border: 2px solid rgba(255,255,255,0.5);
-            border-radius: 15px;
-            padding: 4px 10px;
-        """)
+        help_btn.setObjectName("headerHelp")
         header_layout.addWidget(help_btn)
         
         # Notificações
-        notif_btn = self._header_icon("🔔")
-        header_layout.addWidget(notif_btn)
+        self.btn_notificacoes = self._header_icon("🔔")
+        self.btn_notificacoes.setToolTip("Nenhuma conta a vencer")
+        self.btn_notificacoes.clicked.connect(self.abrir_notificacoes)
+        header_layout.addWidget(self.btn_notificacoes)
+
+        # Contador de contas vencidas/a vencer, no canto do sino
+        self.lbl_badge = QLabel(self.btn_notificacoes, objectName="headerBadge")
+        self.lbl_badge.setAlignment(Qt.AlignCenter)
+        self.lbl_badge.setMinimumWidth(16)
+        self.lbl_badge.setFixedHeight(16)
+        self.lbl_badge.move(18, 0)
+        self.lbl_badge.hide()
         
         header_layout.addStretch()
         parent_layout.addWidget(header)
 
     def _header_icon(self, icon):
         """Cria um ícone do header."""
-        btn = QPushButton(icon)
+        btn = QPushButton(icon, objectName="headerIcon")
         btn.setFixedSize(32, 32)
         btn.setCursor(Qt.PointingHandCursor)
-        btn.setStyleSheet("""
-            QPushButton {
-                font-size: 16px;
-                color: white;
-                background: transparent;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: rgba(255,255,255,0.1);
-                border-radius: 6px;
-            }
-        """)
         return btn
 
     def _create_sidebar(self, parent_layout):
         """Cria a sidebar de navegação."""
-        sidebar = QFrame()
+        sidebar = QFrame(objectName="sidebar")
         sidebar.setFixedWidth(160)
-        sidebar.setStyleSheet("""
-            QFrame {
-                background-color: #E8E8E8;
-                border-right: 1px solid #D0D0D0;
-            }
-        """)
         
         sidebar_layout = QVBoxLayout(sidebar)
         sidebar_layout.setContentsMargins(0, 15, 0, 15)
@@ -147,6 +153,8 @@ class MainWindow(QMainWindow):
             ("📋", "Receitas", self.abrir_relatorio_receitas),
             ("📋", "Despesas", self.abrir_relatorio_despesas),
             ("📋", "Notas", self.abrir_relatorio_notas),
+            ("🗓", "Folha", self.abrir_relatorio_folha),
+            ("📈", "Previsão", self.abrir_relatorio_previsao),
         ]
         
         for icon, text, callback in menu_items:
@@ -158,46 +166,33 @@ class MainWindow(QMainWindow):
 
     def _create_sidebar_item(self, icon, text, callback):
         """Cria um item da sidebar."""
-        btn = QPushButton(f"{icon}  {text}")
+        btn = QPushButton(f"{icon}  {text}", objectName="sidebarItem")
         btn.setFixedHeight(42)
         btn.setCursor(Qt.PointingHandCursor)
-        btn.setStyleSheet("""
-            QPushButton {
-                text-align: left;
-                padding-left: 15px;
-                font-size: 14px;
-                color: #4A4A4A;
-                background: transparent;
-                border: none;
-                border-left: 3px solid transparent;
-            }
-            QPushButton:hover {
-                background-color: #D8D8D8;
-                border-left: 3px solid #2B4B7C;
-            }
-        """)
         btn.clicked.connect(callback)
         return btn
 
     def _create_content_area(self, parent_layout):
         """Cria a área principal de conteúdo."""
-        content = QFrame()
-        content.setStyleSheet("background-color: #F5F5F5;")
+        content = QFrame(objectName="contentArea")
         
         content_layout = QVBoxLayout(content)
         content_layout.setContentsMargins(30, 25, 30, 25)
         content_layout.setSpacing(20)
         
         # Título
-        title = QLabel("Financeiro")
-        title.setStyleSheet("font-size: 26px; font-weight: bold; color: #333;")
+        title = QLabel("Financeiro", objectName="pageTitle")
         content_layout.addWidget(title)
         
         # ===== SEÇÃO: RESUMO FINANCEIRO =====
         self._create_financial_section(content_layout)
         
-        # ===== SEÇÃO: NOTAS DE SERVIÇO =====
-        self._create_notes_section(content_layout)
+        # ===== SEÇÃO: NOTAS DE SERVIÇO E FLUXO DE CAIXA =====
+        notes_row = QHBoxLayout()
+        notes_row.setSpacing(20)
+        self._create_notes_section(notes_row)
+        self._create_projection_section(notes_row)
+        content_layout.addLayout(notes_row)
         
         # ===== SEÇÃO: INFORMAÇÕES ADICIONAIS =====
         self._create_info_section(content_layout)
@@ -208,14 +203,7 @@ class MainWindow(QMainWindow):
     def _create_financial_section(self, parent_layout):
         """Cria a seção de resumo financeiro."""
         # Container com fundo branco
-        container = QFrame()
-        container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 16px;
-                border: 1px solid #E0E0E0;
-            }
-        """)
+        container = QFrame(objectName="sectionCard")
         
         container_layout = QVBoxLayout(container)
         container_layout.setContentsMargins(25, 20, 25, 20)
@@ -225,33 +213,29 @@ class MainWindow(QMainWindow):
         cards_layout = QHBoxLayout()
         cards_layout.setSpacing(30)
         
-        # Obter dados
-        total_receitas = self._calcular_total_receitas()
-        total_despesas = self._calcular_total_despesas()
-        resultado = total_receitas - total_despesas
+        # Os valores são preenchidos por _atualizar_resumo
         
         # Card Receitas
         self.card_receitas = self._create_financial_card(
-            self._formatar_moeda(total_receitas),
+            self._formatar_moeda(0),
             "Total em receitas",
-            "#00b33c"
+            "positivo"
         )
         cards_layout.addWidget(self.card_receitas)
         
         # Card Despesas
         self.card_despesas = self._create_financial_card(
-            self._formatar_moeda(total_despesas),
+            self._formatar_moeda(0),
             "Total em despesas",
-            "#E53935"
+            "negativo"
         )
         cards_layout.addWidget(self.card_despesas)
         
         # Card Resultado
-        cor_resultado = "#2196F3" if resultado >= 0 else "#E53935"
         self.card_resultado = self._create_financial_card(
-            self._formatar_moeda(resultado),
+            self._formatar_moeda(0),
             "Resultado",
-            cor_resultado
+            "neutro"
         )
         cards_layout.addWidget(self.card_resultado)
         
@@ -262,10 +246,10 @@ class MainWindow(QMainWindow):
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(15)
         
-        btn_receita = self._create_action_button("+ Receita", "#00b33c", self.abrir_dialogo_receita)
+        btn_receita = self._create_action_button("+ Receita", "positivo", self.abrir_dialogo_receita)
         buttons_layout.addWidget(btn_receita)
         
-        btn_despesa = self._create_action_button("+ Despesa", "#E53935", self.abrir_dialogo_despesa)
+        btn_despesa = self._create_action_button("+ Despesa", "negativo", self.abrir_dialogo_despesa)
         buttons_layout.addWidget(btn_despesa)
         
         buttons_layout.addStretch()
@@ -273,30 +257,28 @@ class MainWindow(QMainWindow):
         
         parent_layout.addWidget(container)
 
-    def _create_financial_card(self, valor, titulo, cor):
-        """Cria um card de resumo financeiro."""
-        card = QFrame()
+    def _create_financial_card(self, valor, titulo, tom):
+        """Cria um card de resumo financeiro (tom: positivo, negativo ou neutro)."""
+        card = QFrame(objectName="financialCard")
         card.setFixedWidth(180)
-        card.setStyleSheet("background: transparent; border: none;")
         
         layout = QVBoxLayout(card)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(5)
         
         # Valor
-        lbl_valor = QLabel(valor)
-        lbl_valor.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {cor};")
+        lbl_valor = QLabel(valor, objectName="cardValue")
+        lbl_valor.setProperty("tom", tom)
         layout.addWidget(lbl_valor)
         
         # Título
-        lbl_titulo = QLabel(titulo)
-        lbl_titulo.setStyleSheet("font-size: 13px; color: #666;")
+        lbl_titulo = QLabel(titulo, objectName="cardTitle")
         layout.addWidget(lbl_titulo)
         
         # Barra colorida
-        bar = QFrame()
+        bar = QFrame(objectName="cardBar")
+        bar.setProperty("tom", tom)
         bar.setFixedHeight(4)
-        bar.setStyleSheet(f"background-color: {cor}; border-radius: 2px;")
         layout.addWidget(bar)
         
         # Guardar referência
@@ -304,61 +286,37 @@ class MainWindow(QMainWindow):
         
         return card
 
-    def _create_action_button(self, texto, cor, callback):
-        """Cria um botão de ação colorido."""
-        btn = QPushButton(texto)
+    def _create_action_button(self, texto, tom, callback):
+        """Cria um botão de ação colorido (tom: positivo ou negativo)."""
+        btn = QPushButton(texto, objectName="actionButton")
+        btn.setProperty("tom", tom)
         btn.setFixedHeight(40)
         btn.setFixedWidth(140)
         btn.setCursor(Qt.PointingHandCursor)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {cor};
-                color: white;
-                border-radius: 20px;
-                font-size: 14px;
-                font-weight: 600;
-                border: none;
-            }}
-            QPushButton:hover {{
-                background-color: {self._darken_color(cor)};
-            }}
-        """)
         btn.clicked.connect(callback)
         return btn
 
     def _create_notes_section(self, parent_layout):
         """Cria a seção de notas de serviço."""
-        container = QFrame()
+        container = QFrame(objectName="sectionCard")
         container.setFixedWidth(380)
-        container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 16px;
-                border: 1px solid #E0E0E0;
-            }
-        """)
         
         layout = QVBoxLayout(container)
         layout.setContentsMargins(20, 15, 20, 15)
         layout.setSpacing(12)
         
         # Título
-        title = QLabel("Notas de serviço")
-        title.setStyleSheet("font-size: 16px; font-weight: bold; color: #333;")
+        title = QLabel("Notas de serviço", objectName="sectionHeading")
         layout.addWidget(title)
         
         # Resumo de notas
-        pendentes = self._contar_ordens_pendentes()
-        total_ordens = self._contar_total_ordens()
-        
         info_layout = QHBoxLayout()
         
-        lbl_pendentes = QLabel(f"📌 {pendentes} pendentes")
-        lbl_pendentes.setStyleSheet("font-size: 13px; color: #E53935;")
+        lbl_pendentes = QLabel("📌 0 pendentes", objectName="infoLine")
+        lbl_pendentes.setProperty("tom", "negativo")
         info_layout.addWidget(lbl_pendentes)
         
-        lbl_total = QLabel(f"📋 {total_ordens} total")
-        lbl_total.setStyleSheet("font-size: 13px; color: #666;")
+        lbl_total = QLabel("📋 0 total", objectName="infoLine")
         info_layout.addWidget(lbl_total)
         
         info_layout.addStretch()
@@ -369,26 +327,52 @@ class MainWindow(QMainWindow):
         self.lbl_total_ordens = lbl_total
         
         # Botão nova nota
-        btn_nova = QPushButton("  +   Nova nota de serviço")
+        btn_nova = QPushButton("  +   Nova nota de serviço", objectName="outlineButton")
         btn_nova.setFixedHeight(40)
         btn_nova.setCursor(Qt.PointingHandCursor)
-        btn_nova.setStyleSheet("""
-            QPushButton {
-                background-color: #F5F5F5;
-                color: #555;
-                border: 1px solid #D0D0D0;
-                border-radius: 20px;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #E8E8E8;
-            }
-        """)
         btn_nova.clicked.connect(self.abrir_dialogo_nota_servico)
         layout.addWidget(btn_nova)
+
+        # Notas em aberto por cliente e idade
+        btn_aging = QPushButton("A receber por idade", objectName="outlineButton")
+        btn_aging.setFixedHeight(40)
+        btn_aging.setCursor(Qt.PointingHandCursor)
+        btn_aging.clicked.connect(self.abrir_relatorio_aging)
+        layout.addWidget(btn_aging)
         
         parent_layout.addWidget(container)
 
+    def _create_projection_section(self, parent_layout):
+        """Cria a seção do fluxo de caixa projetado (saldo dos próximos dias)."""
+        container = QFrame(objectName="sectionCard")
+
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(20, 15, 20, 15)
+        layout.setSpacing(8)
+
+        header = QHBoxLayout()
+        header.addWidget(QLabel("Fluxo de caixa projetado", objectName="sectionHeading"))
+        header.addStretch()
+        self.combo_horizonte = QComboBox()
+        for dias in self.HORIZONTES_PROJECAO:
+            self.combo_horizonte.addItem(f"{dias} dias", dias)
+        self.combo_horizonte.currentIndexChanged.connect(lambda _: self._agendar_projecao())
+        header.addWidget(self.combo_horizonte)
+        layout.addLayout(header)
+
+        info_layout = QHBoxLayout()
+        self.lbl_projecao_final = QLabel("Calculando...", objectName="infoLine")
+        info_layout.addWidget(self.lbl_projecao_final)
+        self.lbl_projecao_menor = QLabel("", objectName="infoLine")
+        info_layout.addWidget(self.lbl_projecao_menor)
+        info_layout.addStretch()
+        layout.addLayout(info_layout)
+
+        self.grafico_projecao = GraficoLinhas()
+        layout.addWidget(self.grafico_projecao)
+
+        parent_layout.addWidget(container, 1)
+
     def _create_info_section(self, parent_layout):
         """Cria seção com informações adicionais."""
         # Container horizontal para dois cards
@@ -396,168 +380,277 @@ class MainWindow(QMainWindow):
         row.setSpacing(20)
         
         # Card: Funcionários
-        card_func = self._create_info_card(
+        self.card_funcionarios = self._create_info_card(
             "👥 Funcionários",
-            self._contar_funcionarios(),
+            0,
             "cadastrados",
             self.abrir_funcionarios
         )
-        row.addWidget(card_func)
+        row.addWidget(self.card_funcionarios)
         
         # Card: Receitas do mês
-        receitas_mes = self._calcular_receitas_mes()
-        card_rec_mes = self._create_info_card(
+        self.card_receitas_mes = self._create_info_card(
             "📈 Este mês",
-            self._formatar_moeda(receitas_mes),
+            self._formatar_moeda(0),
             "em receitas",
             lambda: self.abrir_relatorio_receitas(filtro_inicial="Mês")
         )
-        row.addWidget(card_rec_mes)
+        row.addWidget(self.card_receitas_mes)
         
         # Card: Despesas do mês
-        despesas_mes = self._calcular_despesas_mes()
-        card_desp_mes = self._create_info_card(
+        self.card_despesas_mes = self._create_info_card(
             "📉 Este mês",
-            self._formatar_moeda(despesas_mes),
+            self._formatar_moeda(0),
             "em despesas",
             lambda: self.abrir_relatorio_despesas(filtro_inicial="Mês")
         )
-        row.addWidget(card_desp_mes)
+        row.addWidget(self.card_despesas_mes)
+
+        # Card: Folha do mês
+        self.card_folha = self._create_info_card(
+            "🗓 Folha do mês",
+            0,
+            "pagamentos a fazer",
+            self.abrir_relatorio_folha
+        )
+        row.addWidget(self.card_folha)
         
         row.addStretch()
         parent_layout.addLayout(row)
 
     def _create_info_card(self, titulo, valor, subtitulo, callback):
         """Cria um card informativo clicável."""
-        card = QPushButton()
+        card = QPushButton(objectName="infoCard")
         card.setFixedSize(180, 100)
         card.setCursor(Qt.PointingHandCursor)
-        card.setStyleSheet("""
-            QPushButton {
-                background-color: white;
-                border-radius: 12px;
-                border: 1px solid #E0E0E0;
-                text-align: left;
-            }
-            QPushButton:hover {
-                background-color: #FAFAFA;
-                border-color: #2B4B7C;
-            }
-        """)
         card.clicked.connect(callback)
         
         layout = QVBoxLayout(card)
         layout.setContentsMargins(15, 12, 15, 12)
         layout.setSpacing(4)
         
-        lbl_titulo = QLabel(titulo)
-        lbl_titulo.setStyleSheet("font-size: 12px; color: #666;")
+        lbl_titulo = QLabel(titulo, objectName="infoCardTitle")
         layout.addWidget(lbl_titulo)
         
-        lbl_valor = QLabel(str(valor))
-        lbl_valor.setStyleSheet("font-size: 18px; font-weight: bold; color: #333;")
+        lbl_valor = QLabel(str(valor), objectName="infoCardValue")
         layout.addWidget(lbl_valor)
         
-        lbl_sub = QLabel(subtitulo)
-        lbl_sub.setStyleSheet("font-size: 11px; color: #888;")
+        lbl_sub = QLabel(subtitulo, objectName="infoCardSubtitle")
         layout.addWidget(lbl_sub)
         
         layout.addStretch()
         
+        card.valor_label = lbl_valor
         return card
 
     # ========= MÉTODOS DE CÁLCULO =========
 
-    def _calcular_total_receitas(self):
-        try:
-            return sum(r.valor for r in self.sistema.listar_recebimentos())
-        except:
-            return 0.0
-
-    def _calcular_total_despesas(self):
-        try:
-            return sum(d.valor for d in self.sistema.listar_despesas())
-        except:
-            return 0.0
-
-    def _contar_ordens_pendentes(self):
-        try:
-            return len([o for o in self.sistema.listar_ordens_servico() if not o.foi_pago])
-        except:
-            return 0
-
-    def _contar_total_ordens(self):
-        try:
-            return len(self.sistema.listar_ordens_servico())
-        except:
-            return 0
-
-    def _contar_funcionarios(self):
-        try:
-            return len(self.sistema.listar_funcionarios())
-        except:
-            return 0
-
-    def _calcular_receitas_mes(self):
-        try:
-            hoje = date.today()
-            receitas = self.sistema.listar_recebimentos()
-            return sum(r.valor for r in receitas if r.data.year == hoje.year and r.data.month == hoje.month)
-        except:
-            return 0.0
-
-    def _calcular_despesas_mes(self):
+    def _calcular_totais(self):
+        """Calcula todos os números do painel a partir do resumo mensal."""
+        mes_atual = date.today().isoformat()[:7]
+        totais = dict.fromkeys(
+            ("receitas", "despesas", "receitas_mes", "despesas_mes"), 0.0
+        )
+        totais.update(pendentes=0, ordens=0, funcionarios=0, folha=0)
+        chaves = {eventos.RECEBIMENTO: "receitas", eventos.DESPESA: "despesas"}
         try:
-            hoje = date.today()
-            despesas = self.sistema.listar_despesas()
-            return sum(d.valor for d in despesas if d.data.year == hoje.year and d.data.month == hoje.month)
-        except:
-            return 0.0
+            for linha in self.sistema.resumo_mensal():
+                if linha.entidade == eventos.ORDEM_SERVICO:
+                    totais["ordens"] += linha.quantidade
+                    if not linha.pago:
+                        totais["pendentes"] += linha.quantidade
+                    continue
+                chave = chaves[linha.entidade]
+                totais[chave] += linha.total
+                if linha.mes == mes_atual:
+                    totais[chave + "_mes"] += linha.total
+            totais["funcionarios"] = len(self.sistema.listar_funcionarios())
+            totais["folha"] = self._contar_folha_do_mes()
+        except Exception:
+            pass
+        return totais
+
+    def _contar_folha_do_mes(self):
+        hoje = date.today()
+        return len(self.sistema.obrigacoes_folha(hoje.year, hoje.month).itens)
+
+    @staticmethod
+    def _no_mes(modelo, hoje):
+        return modelo.data.year == hoje.year and modelo.data.month == hoje.month
 
     def _formatar_moeda(self, valor):
         return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
-    def _darken_color(self, hex_color):
-        r = int(hex_color[1:3], 16)
-        g = int(hex_color[3:5], 16)
-        b = int(hex_color[5:7], 16)
-        r = max(0, int(r * 0.85))
-        g = max(0, int(g * 0.85))
-        b = max(0, int(b * 0.85))
-        return f"#{r:02x}{g:02x}{b:02x}"
-
     def _atualizar_resumo(self):
-        """Atualiza todos os valores dinâmicos."""
-        total_receitas = self._calcular_total_receitas()
-        total_despesas = self._calcular_total_despesas()
-        resultado = total_receitas - total_despesas
+        """Recalcula todos os valores dinâmicos a partir do banco."""
+        self._totais = self._calcular_totais()
+        self._renderizar_resumo()
+
+    def _renderizar_resumo(self):
+        """Escreve os totais atuais nos cards."""
+        t = self._totais
+        resultado = t["receitas"] - t["despesas"]
         
-        self.card_receitas.valor_label.setText(self._formatar_moeda(total_receitas))
-        self.card_despesas.valor_label.setText(self._formatar_moeda(total_despesas))
+        self.card_receitas.valor_label.setText(self._formatar_moeda(t["receitas"]))
+        self.card_despesas.valor_label.setText(self._formatar_moeda(t["despesas"]))
         self.card_resultado.valor_label.setText(self._formatar_moeda(resultado))
         
-        cor_resultado = "#2196F3" if resultado >= 0 else "#E53935"
-        self.card_resultado.valor_label.setStyleSheet(f"font-size: 20px; font-weight: bold; color: {cor_resultado};")
-        
-        self.lbl_pendentes.setText(f"📌 {self._contar_ordens_pendentes()} pendentes")
-        self.lbl_total_ordens.setText(f"📋 {self._contar_total_ordens()} total")
+        definir_tom(self.card_resultado.valor_label, "neutro" if resultado >= 0 else "negativo")
+        
+        self.lbl_pendentes.setText(f"📌 {t['pendentes']} pendentes")
+        self.lbl_total_ordens.setText(f"📋 {t['ordens']} total")
+        
+        self.card_funcionarios.valor_label.setText(str(t["funcionarios"]))
+        self.card_receitas_mes.valor_label.setText(self._formatar_moeda(t["receitas_mes"]))
+        self.card_despesas_mes.valor_label.setText(self._formatar_moeda(t["despesas_mes"]))
+        self.card_folha.valor_label.setText(str(t["folha"]))
+
+    def _on_evento(self, evento):
+        """Aplica aos totais só a diferença trazida pelo evento."""
+        t = self._totais
+        hoje = date.today()
+        # O estado anterior sai da conta (-1) e o atual entra (+1)
+        versoes = ((evento.anterior, -1), (evento.atual, 1))
+
+        if evento.entidade in (eventos.RECEBIMENTO, eventos.DESPESA):
+            chave = "receitas" if evento.entidade == eventos.RECEBIMENTO else "despesas"
+            for modelo, sinal in versoes:
+                if modelo is None:
+                    continue
+                t[chave] += sinal * modelo.valor
+                if self._no_mes(modelo, hoje):
+                    t[chave + "_mes"] += sinal * modelo.valor
+        elif evento.entidade == eventos.ORDEM_SERVICO:
+            if evento.acao == eventos.CRIADO:
+                t["ordens"] += 1
+            for modelo, sinal in versoes:
+                if modelo is not None and not modelo.foi_pago:
+                    t["pendentes"] += sinal
+        elif evento.entidade == eventos.FUNCIONARIO:
+            if evento.acao == eventos.CRIADO:
+                t["funcionarios"] += 1
+            # Admissão, demissão ou dia de pagamento mudam a folha do mês
+            t["folha"] = self._contar_folha_do_mes()
+        else:
+            return
+
+        self._renderizar_resumo()
+        if evento.entidade == eventos.DESPESA and self._timer_alertas.isActive():
+            self._atualizar_alertas()
+        self._agendar_projecao()
+
+    # ========= ALERTAS DE VENCIMENTO =========
+
+    def _iniciar_alertas(self):
+        self._atualizar_alertas()
+        self._timer_alertas.start(self.INTERVALO_ALERTAS_MS)
+        self._projecao_iniciada = True
+        self._atualizar_projecao()
+
+    def _atualizar_alertas(self):
+        """Atualiza o contador do sino (a data de hoje muda à meia-noite)."""
+        try:
+            alertas = self.sistema.alertas_vencimento()
+        except Exception:
+            return
+        self.lbl_badge.setVisible(alertas.total > 0)
+        self.lbl_badge.setText(str(alertas.total) if alertas.total < 100 else "99+")
+        self.lbl_badge.adjustSize()
+        if alertas.total:
+            self.btn_notificacoes.setToolTip(
+                f"{len(alertas.vencidas)} vencida(s), {len(alertas.vencem_hoje)} vencem hoje, "
+                f"{len(alertas.vencem_na_semana)} vencem nesta semana"
+            )
+        else:
+            self.btn_notificacoes.setToolTip("Nenhuma conta a vencer")
+
+    # ========= FLUXO DE CAIXA PROJETADO =========
+
+    def _agendar_projecao(self):
+        """Recalcula a projeção no próximo ciclo (antes da primeira, não faz nada)."""
+        if self._projecao_iniciada:
+            self._timer_projecao.start(0)
+
+    def _atualizar_projecao(self):
+        """Projeção em memória do sistema; só o desenho é refeito aqui."""
+        try:
+            projecao = self.sistema.projetar_fluxo_caixa(self.combo_horizonte.currentData())
+        except Exception:
+            return
+        final = projecao.dias[-1]
+        self.lbl_projecao_final.setText(
+            f"Hoje: {self._formatar_moeda(projecao.dias[0].saldo)}  •  "
+            f"Em {final.data.strftime('%d/%m')}: {self._formatar_moeda(final.saldo)}"
+        )
+        menor = projecao.menor_saldo
+        self.lbl_projecao_menor.setText(
+            f"  Menor saldo: {self._formatar_moeda(menor.saldo)} em {menor.data.strftime('%d/%m')}"
+        )
+        definir_tom(self.lbl_projecao_menor, "negativo" if menor.saldo < 0 else "neutro")
+        self.lbl_projecao_final.setToolTip(
+            f"Entradas previstas: {self._formatar_moeda(projecao.total_entradas)}\n"
+            f"Saídas previstas: {self._formatar_moeda(projecao.total_saidas)}"
+        )
+        self.grafico_projecao.definir_dados(
+            [d.data.strftime("%d/%m") for d in projecao.dias],
+            [Serie("Saldo projetado", [d.saldo for d in projecao.dias], NEUTRO)],
+        )
+
+    # ========= DIÁLOGOS =========
+
+    def _setup_dialogos(self):
+        """Registra os diálogos no pool e agenda o aquecimento dos cadastros."""
+        self.dialogos = DialogPool(self)
+
+        def add(nome):
+            def fabrica():
+                from interface.dialogs import add
+                return getattr(add, nome)(self.sistema, self)
+            return fabrica
+
+        def relatorio(nome):
+            def fabrica(**kwargs):
+                from interface.dialogs import reports
+                return getattr(reports, nome)(self.sistema, self, **kwargs)
+            return fabrica
+
+        self.dialogos.registrar("receita", add("NovaReceitaDialog"))
+        self.dialogos.registrar("despesa", add("NovaDespesaDialog"))
+        self.dialogos.registrar("nota", add("NovaNotaServicoDialog"))
+        self.dialogos.registrar("rel_receitas", relatorio("RelatorioReceitasDialog"))
+        self.dialogos.registrar("rel_despesas", relatorio("RelatorioDespesasDialog"))
+        self.dialogos.registrar("rel_notas", relatorio("RelatorioNotasDialog"))
+        self.dialogos.registrar("rel_aging", relatorio("RelatorioAgingDialog"))
+        self.dialogos.registrar("rel_folha", relatorio("RelatorioFolhaDialog"))
+        self.dialogos.registrar("rel_previsao", relatorio("RelatorioPrevisaoDialog"))
+        self.dialogos.registrar("rel_geral", relatorio("RelatorioGeralDialog"))
+
+        def notificacoes():
+            from interface.dialogs.notifications import NotificacoesDialog
+            return NotificacoesDialog(self.sistema, self)
+        self.dialogos.registrar("notificacoes", notificacoes)
+
+        # Os cadastros são os mais abertos: ficam prontos em segundo plano.
+        # Os relatórios consultam o banco ao construir, então só no 1º uso.
+        self.dialogos.aquecer(["receita", "despesa", "nota"])
 
     # ========= AÇÕES =========
 
+    # Os cards do painel se atualizam sozinhos pelos eventos do sistema
+    # (_on_evento): nada a recalcular quando um diálogo fecha.
+
     def abrir_dialogo_receita(self):
-        if NovaReceitaDialog(self.sistema, self).exec():
-            self._atualizar_resumo()
+        self.dialogos.obter("receita").exec()
 
     def abrir_dialogo_despesa(self):
-        if NovaDespesaDialog(self.sistema, self).exec():
-            self._atualizar_resumo()
+        self.dialogos.obter("despesa").exec()
 
     def abrir_dialogo_nota_servico(self):
-        if NovaNotaServicoDialog(self.sistema, self).exec():
-            self._atualizar_resumo()
+        self.dialogos.obter("nota").exec()
     
     def abrir_funcionarios(self):
         if self.janela_funcionarios is None:
+            from interface.pages.employees_page import EmployeesPage
             self.janela_funcionarios = EmployeesPage(self.sistema)
             self.janela_funcionarios.setWindowTitle("Gestão de Funcionários")
             self.janela_funcionarios.resize(900, 650)
@@ -566,17 +659,25 @@ class MainWindow(QMainWindow):
         self.janela_funcionarios.activateWindow()
 
     def abrir_relatorio_receitas(self, filtro_inicial=None):
-        RelatorioReceitasDialog(self.sistema, self, filtro_inicial=filtro_inicial).exec()
-        self._atualizar_resumo()
+        self.dialogos.obter("rel_receitas", filtro_inicial=filtro_inicial).exec()
 
     def abrir_relatorio_despesas(self, filtro_inicial=None):
-        RelatorioDespesasDialog(self.sistema, self, filtro_inicial=filtro_inicial).exec()
-        self._atualizar_resumo()
+        self.dialogos.obter("rel_despesas", filtro_inicial=filtro_inicial).exec()
 
     def abrir_relatorio_notas(self):
-        RelatorioNotasDialog(self.sistema, self).exec()
-        self._atualizar_resumo()
+        self.dialogos.obter("rel_notas").exec()
+
+    def abrir_relatorio_aging(self):
+        self.dialogos.obter("rel_aging").exec()
+
+    def abrir_relatorio_folha(self):
+        self.dialogos.obter("rel_folha").exec()
+
+    def abrir_relatorio_previsao(self):
+        self.dialogos.obter("rel_previsao").exec()
 
     def abrir_relatorio_geral(self, filtro_inicial=None):
-        RelatorioGeralDialog(self.sistema, self, filtro_inicial=filtro_inicial).exec()
-        self._atualizar_resumo()
+        self.dialogos.obter("rel_geral", filtro_inicial=filtro_inicial).exec()
+
+    def abrir_notificacoes(self):
+        self.dialogos.obter("notificacoes").exec()
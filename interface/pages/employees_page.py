@@ -1,111 +1,187 @@
 """
 Página de Gestão de Funcionários.
+
+A lista é virtualizada (QListView + model/delegate): cada linha é pintada
+sob demanda pelo EmployeeDelegate, e a busca passa por um proxy model,
+sem criar/destruir widgets a cada tecla digitada.
 """
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QScrollArea, QFrame, QLineEdit, QSizePolicy
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QFrame, QLineEdit, QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+)
+from PySide6.QtCore import (
+    Qt, Signal, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QSize, QRectF
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QPixmap, QIcon
+from PySide6.QtGui import QColor, QFont, QPainter, QPainterPath, QPen
 
+import eventos
 from interface.dialogs.add_edit_employee import AddEditEmployeeDialog
+from interface.helpers import criar_pixmap_circular, inscrever_eventos
 from models import Funcionario
 
-class EmployeeCard(QFrame):
-    """Card representando um funcionário na lista."""
-    clicked = Signal(Funcionario)
+# Role customizada para recuperar o objeto Funcionario de um índice
+FuncionarioRole = Qt.UserRole + 1
+
+
+class EmployeeListModel(QAbstractListModel):
+    """Model com a lista de funcionários (uma linha por funcionário)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._funcionarios = []
+
+    def set_funcionarios(self, funcionarios):
+        self.beginResetModel()
+        self._funcionarios = list(funcionarios)
+        self.endResetModel()
+
+    def salvar_funcionario(self, func):
+        """Atualiza a linha do funcionário (pelo id) ou adiciona no fim."""
+        for row, atual in enumerate(self._funcionarios):
+            if atual.id == func.id:
+                self._funcionarios[row] = func
+                idx = self.index(row, 0)
+                self.dataChanged.emit(idx, idx)
+                return
+        row = len(self._funcionarios)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._funcionarios.append(func)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._funcionarios)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        f = self._funcionarios[index.row()]
+        if role == Qt.DisplayRole:
+            return f.nome
+        if role == FuncionarioRole:
+            return f
+        return None
+
+
+class EmployeeFilterProxy(QSortFilterProxyModel):
+    """
+    Proxy que mostra apenas os funcionários cujos ids foram encontrados
+    pela busca (None = sem filtro).
+    """
 
-    def __init__(self, funcionario: Funcionario, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.funcionario = funcionario
-        
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setStyleSheet("""
-            EmployeeCard {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 8px;
-            }
-            EmployeeCard:hover {
-                border: 1px solid #aaa;
-                background-color: #f9f9f9;
-            }
-        """)
-        self.setCursor(Qt.PointingHandCursor)
-        self.setFixedHeight(100)
-        
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(15, 15, 15, 15)
-        layout.setSpacing(15)
-        
-        # Foto (Thumbnail)
-        lbl_foto = QLabel()
-        lbl_foto.setFixedSize(70, 70)
-        # O stylesheet border-radius ajuda no bg, mas para a imagem precisamos arredondar o pixmap manualmente
-        lbl_foto.setStyleSheet("background-color: #eee; border-radius: 35px; border: 1px solid #ccc;")
-        lbl_foto.setAlignment(Qt.AlignCenter)
-        
-        if funcionario.foto_caminho:
-            pix = QPixmap(funcionario.foto_caminho)
-            if not pix.isNull():
-                # Criar pixmap circular manualmente
-                size = 70
-                rounded = QPixmap(size, size)
-                rounded.fill(Qt.transparent)
-                
-                # Escalar imagem mantendo aspect ratio para cobrir o quadrado (crop center)
-                scaled_pix = pix.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-                
-                # Recortar centro
-                x = (scaled_pix.width() - size) // 2
-                y = (scaled_pix.height() - size) // 2
-                cropped = scaled_pix.copy(x, y, size, size)
-                
-                # Pintar no pixmap transparente com pincel circular
-                from PySide6.QtGui import QPainter, QBrush, QPainterPath
-                painter = QPainter(rounded)
-                painter.setRenderHint(QPainter.Antialiasing)
-                
-                path = QPainterPath()
-                path.addEllipse(0, 0, size, size)
-                painter.setClipPath(path)
-                
-                painter.drawPixmap(0, 0, cropped)
-                painter.end()
-                
-                lbl_foto.setPixmap(rounded)
+        self._ids = None
+
+    def set_ids(self, ids):
+        self._ids = ids
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._ids is None:
+            return True
+        idx = self.sourceModel().index(source_row, 0, source_parent)
+        f = idx.data(FuncionarioRole)
+        return f.id in self._ids
+
+
+class EmployeeDelegate(QStyledItemDelegate):
+    """
+    Pinta o "card" de cada funcionário direto no viewport.
+    As fotos circulares são cacheadas por caminho para não reprocessar
+    a imagem a cada repaint.
+    """
+
+    ALTURA = 100
+    ESPACO = 10
+    TAM_FOTO = 70
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cache_fotos = {}
+
+        self._fonte_nome = QFont()
+        self._fonte_nome.setPixelSize(16)
+        self._fonte_nome.setBold(True)
+
+        self._fonte_info = QFont()
+        self._fonte_info.setPixelSize(14)
+
+        self._fonte_inicial = QFont()
+        self._fonte_inicial.setPixelSize(24)
+        self._fonte_inicial.setBold(True)
+
+    def limpar_cache(self, caminho=None):
+        """Esquece a foto de um caminho (ou todas, sem argumento)."""
+        if caminho is None:
+            self._cache_fotos.clear()
+        else:
+            self._cache_fotos.pop(caminho, None)
+
+    def _foto(self, caminho):
+        if caminho not in self._cache_fotos:
+            self._cache_fotos[caminho] = criar_pixmap_circular(caminho, self.TAM_FOTO)
+        return self._cache_fotos[caminho]
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ALTURA + self.ESPACO)
+
+    def paint(self, painter: QPainter, option, index):
+        f = index.data(FuncionarioRole)
+        if f is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card (deixa o espaço inferior como separação entre linhas)
+        rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -self.ESPACO - 0.5)
+        hover = bool(option.state & QStyle.State_MouseOver)
+        path = QPainterPath()
+        path.addRoundedRect(rect, 8, 8)
+        painter.fillPath(path, QColor("#f9f9f9" if hover else "white"))
+        painter.setPen(QPen(QColor("#aaa" if hover else "#ddd"), 1))
+        painter.drawPath(path)
+
+        # Foto (ou inicial do nome)
+        x_foto = rect.left() + 15
+        y_foto = rect.top() + (rect.height() - self.TAM_FOTO) / 2
+        foto_rect = QRectF(x_foto, y_foto, self.TAM_FOTO, self.TAM_FOTO)
+        pix = self._foto(f.foto_caminho) if f.foto_caminho else None
+        if pix is not None:
+            painter.drawPixmap(foto_rect.toRect(), pix)
         else:
-             lbl_foto.setText(funcionario.nome[0].upper())
-             lbl_foto.setStyleSheet("border-radius: 35px; background-color: #ddd; font-size: 24px; font-weight: bold; color: #555;")
-        
-        layout.addWidget(lbl_foto)
-        
-        # Infos
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(5)
-        info_layout.setAlignment(Qt.AlignVCenter)
-        
-        lbl_nome = QLabel(funcionario.nome)
-        lbl_nome.setStyleSheet("font-size: 16px; font-weight: bold; color: #333; border: none; background: transparent;")
-        
-        lbl_cargo = QLabel(f"{funcionario.cargo} • {funcionario.telefone}")
-        lbl_cargo.setStyleSheet("font-size: 14px; color: #666; border: none; background: transparent;")
-        
-        info_layout.addWidget(lbl_nome)
-        info_layout.addWidget(lbl_cargo)
-        
-        layout.addLayout(info_layout)
-        layout.addStretch()
-
-    def mousePressEvent(self, event):
-        self.clicked.emit(self.funcionario)
-        super().mousePressEvent(event)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#ddd"))
+            painter.drawEllipse(foto_rect)
+            painter.setPen(QColor("#555"))
+            painter.setFont(self._fonte_inicial)
+            inicial = f.nome[0].upper() if f.nome else "?"
+            painter.drawText(foto_rect, Qt.AlignCenter, inicial)
+
+        # Textos
+        x_texto = foto_rect.right() + 15
+        largura_texto = rect.right() - x_texto - 15
+        meio = rect.center().y()
+
+        painter.setPen(QColor("#333"))
+        painter.setFont(self._fonte_nome)
+        painter.drawText(QRectF(x_texto, meio - 24, largura_texto, 22),
+                         Qt.AlignLeft | Qt.AlignVCenter, f.nome)
+
+        painter.setPen(QColor("#666"))
+        painter.setFont(self._fonte_info)
+        painter.drawText(QRectF(x_texto, meio + 2, largura_texto, 22),
+                         Qt.AlignLeft | Qt.AlignVCenter, f"{f.cargo} • {f.telefone}")
+
+        painter.restore()
 
 
 class EmployeesPage(QWidget):
     """Página principal de funcionários."""
-    
+
     voltar_signal = Signal() # Sinal para voltar ao menu principal se necessario
 
     def __init__(self, sistema, parent=None):
@@ -113,6 +189,7 @@ class EmployeesPage(QWidget):
         self.sistema = sistema
         self._setup_ui()
         self.carregar_funcionarios()
+        inscrever_eventos(self, sistema, self._on_evento, (eventos.FUNCIONARIO,))
 
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -121,86 +198,82 @@ class EmployeesPage(QWidget):
 
         # Header
         header_layout = QHBoxLayout()
-        
-        lbl_titulo = QLabel("Funcionários")
-        lbl_titulo.setStyleSheet("font-size: 24px; font-weight: bold; color: #333;")
-        
-        self.txt_busca = QLineEdit()
-        self.txt_busca.setPlaceholderText("Buscar por nome...")
+
+        lbl_titulo = QLabel("Funcionários", objectName="employeesTitle")
+
+        self.txt_busca = QLineEdit(objectName="searchEdit")
+        self.txt_busca.setPlaceholderText("Buscar por nome, CPF, cargo...")
         self.txt_busca.setFixedWidth(300)
-        self.txt_busca.setStyleSheet("background-color: #ffffff;border-radius: 10px;border: 1px solid #d0d0d0;padding: 8px 12px;selection-background-color: #00b33c;selection-color: #ffffff; width: 40px;")
         self.txt_busca.textChanged.connect(self._filtrar)
-        
+
         btn_novo = QPushButton("+ Novo Funcionário")
         btn_novo.setObjectName("primaryButton")
-        btn_novo.setStyleSheet("background-color: #00b33c;color: white;border-radius: 10px;padding: 10px 25px;border: 1px solid #9F9F9F;font-weight: 600;")
         btn_novo.clicked.connect(self._novo_funcionario)
-        
+
         header_layout.addWidget(lbl_titulo)
         header_layout.addStretch()
         header_layout.addWidget(self.txt_busca)
         header_layout.addWidget(btn_novo)
-        
+
         layout.addLayout(header_layout)
-        
-        # Lista Scrollavel
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QFrame.NoFrame)
-        self.scroll_area.setStyleSheet("background-color: transparent;")
-        
-        self.container_lista = QWidget()
-        self.layout_lista = QVBoxLayout(self.container_lista)
-        self.layout_lista.setAlignment(Qt.AlignTop)
-        self.layout_lista.setSpacing(10)
-        
-        self.scroll_area.setWidget(self.container_lista)
-        layout.addWidget(self.scroll_area)
-        
-        self.funcionarios_cache = []
+
+        # Lista virtualizada (model -> proxy de busca -> view)
+        self.model = EmployeeListModel(self)
+        self.proxy = EmployeeFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.delegate = EmployeeDelegate(self)
+
+        self.lista = QListView(objectName="employeeList")
+        self.lista.setModel(self.proxy)
+        self.lista.setItemDelegate(self.delegate)
+        self.lista.setUniformItemSizes(True)
+        self.lista.setMouseTracking(True)
+        self.lista.setFrameShape(QFrame.NoFrame)
+        self.lista.setSelectionMode(QAbstractItemView.NoSelection)
+        self.lista.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.lista.setCursor(Qt.PointingHandCursor)
+        self.lista.clicked.connect(self._on_item_clicado)
+        layout.addWidget(self.lista)
+
+        self.lbl_vazio = QLabel("Nenhum funcionário encontrado.", objectName="emptyLabel")
+        self.lbl_vazio.setAlignment(Qt.AlignCenter)
+        self.lbl_vazio.setVisible(False)
+        layout.addWidget(self.lbl_vazio)
 
     def carregar_funcionarios(self):
-        # Limpar
-        while self.layout_lista.count():
-            child = self.layout_lista.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
         funcionarios = self.sistema.listar_funcionarios()
-        self.funcionarios_cache = funcionarios
-        
-        self._popular_lista(funcionarios)
-
-    def _popular_lista(self, funcionarios):
-        # Limpar visual apenas
-        while self.layout_lista.count():
-            child = self.layout_lista.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        if not funcionarios:
-            lbl_vazio = QLabel("Nenhum funcionário encontrado.")
-            lbl_vazio.setStyleSheet("color: #777; font-size: 16px; margin-top: 20px;")
-            lbl_vazio.setAlignment(Qt.AlignCenter)
-            self.layout_lista.addWidget(lbl_vazio)
-            return
+        # Fotos podem ter sido trocadas na edição
+        self.delegate.limpar_cache()
+        self.model.set_funcionarios(funcionarios)
+        self._filtrar(self.txt_busca.text())
 
-        for f in funcionarios:
-            card = EmployeeCard(f)
-            card.clicked.connect(self._editar_funcionario)
-            self.layout_lista.addWidget(card)
+    def _on_evento(self, evento):
+        """Aplica na lista só o funcionário criado/alterado."""
+        # A foto pode ter sido trocada (mesmo caminho com outro arquivo)
+        for func in (evento.anterior, evento.atual):
+            if func is not None and func.foto_caminho:
+                self.delegate.limpar_cache(func.foto_caminho)
+        self.model.salvar_funcionario(evento.atual)
+        self._filtrar(self.txt_busca.text())
+
+    def _atualizar_vazio(self):
+        vazio = self.proxy.rowCount() == 0
+        self.lbl_vazio.setVisible(vazio)
+        self.lista.setVisible(not vazio)
 
     def _filtrar(self, texto):
-        texto = texto.lower()
-        filtrados = [f for f in self.funcionarios_cache if texto in f.nome.lower()]
-        self._popular_lista(filtrados)
+        self.proxy.set_ids(self.sistema.buscar_ids_funcionarios(texto))
+        self._atualizar_vazio()
+
+    def _on_item_clicado(self, index):
+        funcionario = index.data(FuncionarioRole)
+        if funcionario is not None:
+            self._editar_funcionario(funcionario)
+
+    # A lista é atualizada por _on_evento quando o cadastro é salvo
 
     def _novo_funcionario(self):
-        diag = AddEditEmployeeDialog(self.sistema, self)
-        if diag.exec():
-            self.carregar_funcionarios()
+        AddEditEmployeeDialog(self.sistema, self).exec()
 
     def _editar_funcionario(self, funcionario):
-        diag = AddEditEmployeeDialog(self.sistema, self, funcionario=funcionario)
-        if diag.exec():
-            self.carregar_funcionarios()
+        AddEditEmployeeDialog(self.sistema, self, funcionario=funcionario).exec()
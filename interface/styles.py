@@ -4,6 +4,11 @@ Módulo de Estilos (Styles).
 Este arquivo contém as definições de CSS (QSS) usadas em toda a aplicação.
 Separar os estilos em um arquivo próprio facilita a manutenção do design
 visual e evita poluir o código lógico com strings de formatação.
+
+Os widgets não recebem stylesheet próprio: o tema (interface/theme.py)
+junta estas strings em um único stylesheet aplicado na QApplication, e
+cada widget escolhe sua aparência pelo objectName e pela propriedade
+dinâmica "tom" (positivo / negativo / neutro).
 """
 
 # Estilos gerais para diálogos e widgets
@@ -21,8 +26,8 @@ QDialog#relatorioGeralDialog {
     background: transparent;
 }
 
-/* Fonte base para todos os elementos dentro destes diálogos */
-* {
+/* Fonte base para todos os elementos dentro dos diálogos */
+QDialog, QDialog QWidget {
     font-size: 15px;
 }
 
@@ -332,57 +337,234 @@ QComboBox QAbstractItemView {
     outline: none;
 }
 
-/*
-    --- MAIN WINDOW STYLES ---
-    Estilos para a interface principal moderna
-*/
+/* Texto auxiliar do filtro de datas */
+QLabel#filterInfo {
+    color: #666;
+    font-style: italic;
+}
+
+/* Preview do comprovante (detalhes do lançamento) */
+QLabel#comprovantePreview {
+    border: 1px solid #CCCCCC;
+    border-radius: 8px;
+    background-color: #F5F5F5;
+}
+
+/* Área rolável do cadastro de funcionário (mostra o cinza do card) */
+QScrollArea#formScroll,
+QScrollArea#formScroll QWidget#qt_scrollarea_viewport,
+QWidget#formContent {
+    background: transparent;
+}
+
+/* Foto redonda do cadastro de funcionário */
+QLabel#fotoPreview {
+    background-color: #ddd;
+    border-radius: 40px;
+    border: 2px solid white;
+}
+"""
 
-/* Header */
+
+# Estilos da janela principal (header, sidebar, cards do dashboard)
+MAIN_WINDOW_STYLES = """
+QWidget#centralWidget, QFrame#contentArea {
+    background-color: #F5F5F5;
+}
+
+/* --- HEADER --- */
 QFrame#mainHeader {
     background-color: #2B4B7C;
 }
 
-/* Sidebar */
+QLabel#headerLogo {
+    font-size: 24px;
+    background-color: #3D5A80;
+    padding: 6px 10px;
+    border-radius: 8px;
+}
+
+QPushButton#headerIcon {
+    font-size: 16px;
+    color: white;
+    background: transparent;
+    border: none;
+}
+QPushButton#headerIcon:hover {
+    background-color: rgba(255,255,255,0.1);
+    border-radius: 6px;
+}
+
+QLabel#headerBadge {
+    background-color: #E53935;
+    color: white;
+    font-size: 10px;
+    font-weight: bold;
+    border-radius: 8px;
+    padding: 0px 4px;
+}
+
+QPushButton#headerHelp {
+    font-size: 16px;
+    font-weight: bold;
+    color: white;
+    background: transparent;
+    border: 2px solid rgba(255,255,255,0.5);
+    border-radius: 15px;
+    padding: 4px 10px;
+}
+
+/* --- SIDEBAR --- */
 QFrame#sidebar {
-    background-color: #FFFFFF;
-    border-right: 1px solid #E0E0E0;
+    background-color: #E8E8E8;
+    border-right: 1px solid #D0D0D0;
 }
 
-/* Sidebar item hover */
 QPushButton#sidebarItem {
     text-align: left;
     padding-left: 15px;
     font-size: 14px;
-    font-weight: 500;
     color: #4A4A4A;
     background: transparent;
     border: none;
     border-left: 3px solid transparent;
 }
-
 QPushButton#sidebarItem:hover {
-    background-color: #F0F4F8;
+    background-color: #D8D8D8;
     border-left: 3px solid #2B4B7C;
-    color: #2B4B7C;
 }
 
-/* Financial Cards */
-QFrame#financialCard {
+/* --- CONTEÚDO --- */
+QLabel#pageTitle {
+    font-size: 26px;
+    font-weight: bold;
+    color: #333;
+}
+
+/* Seções brancas arredondadas (resumo financeiro, notas) */
+QFrame#sectionCard {
     background-color: white;
     border-radius: 16px;
-    border: 1px solid #E2E8F0;
+    border: 1px solid #E0E0E0;
 }
 
-/* Action buttons */
-QPushButton#actionButton {
-    border-radius: 18px;
+QLabel#sectionHeading {
+    font-size: 16px;
+    font-weight: bold;
+    color: #333;
+}
+
+/* Cards financeiros (valor + título + barra colorida) */
+QFrame#financialCard {
+    background: transparent;
+    border: none;
+}
+
+QLabel#cardValue {
+    font-size: 20px;
+    font-weight: bold;
+}
+QLabel#cardValue[tom="positivo"] { color: #00b33c; }
+QLabel#cardValue[tom="negativo"] { color: #E53935; }
+QLabel#cardValue[tom="neutro"]   { color: #2196F3; }
+
+QLabel#cardTitle {
     font-size: 13px;
+    color: #666;
+}
+
+QFrame#cardBar {
+    border-radius: 2px;
+    border: none;
+}
+QFrame#cardBar[tom="positivo"] { background-color: #00b33c; }
+QFrame#cardBar[tom="negativo"] { background-color: #E53935; }
+QFrame#cardBar[tom="neutro"]   { background-color: #2196F3; }
+
+/* Botões de ação coloridos (+ Receita / + Despesa) */
+QPushButton#actionButton {
+    color: white;
+    border-radius: 20px;
+    font-size: 14px;
     font-weight: 600;
-    padding: 0 20px;
     border: none;
 }
+QPushButton#actionButton[tom="positivo"] { background-color: #00b33c; }
+QPushButton#actionButton[tom="positivo"]:hover { background-color: #009833; }
+QPushButton#actionButton[tom="negativo"] { background-color: #E53935; }
+QPushButton#actionButton[tom="negativo"]:hover { background-color: #c2302d; }
+
+/* Resumo das notas de serviço */
+QLabel#infoLine {
+    font-size: 13px;
+    color: #666;
+}
+QLabel#infoLine[tom="negativo"] { color: #E53935; }
+
+QPushButton#outlineButton {
+    background-color: #F5F5F5;
+    color: #555;
+    border: 1px solid #D0D0D0;
+    border-radius: 20px;
+    font-size: 13px;
+}
+QPushButton#outlineButton:hover {
+    background-color: #E8E8E8;
+}
+
+/* Cards informativos clicáveis */
+QPushButton#infoCard {
+    background-color: white;
+    border-radius: 12px;
+    border: 1px solid #E0E0E0;
+    text-align: left;
+}
+QPushButton#infoCard:hover {
+    background-color: #FAFAFA;
+    border-color: #2B4B7C;
+}
 
-QPushButton#actionButton:hover {
-    opacity: 0.9;
+QLabel#infoCardTitle {
+    font-size: 12px;
+    color: #666;
+}
+QLabel#infoCardValue {
+    font-size: 18px;
+    font-weight: bold;
+    color: #333;
+}
+QLabel#infoCardSubtitle {
+    font-size: 11px;
+    color: #888;
+}
+"""
+
+
+# Estilos da página de funcionários
+EMPLOYEES_STYLES = """
+QLabel#employeesTitle {
+    font-size: 24px;
+    font-weight: bold;
+    color: #333;
+}
+
+QLineEdit#searchEdit {
+    background-color: #ffffff;
+    border-radius: 10px;
+    border: 1px solid #d0d0d0;
+    padding: 8px 12px;
+    selection-background-color: #00b33c;
+    selection-color: #ffffff;
+}
+
+QListView#employeeList {
+    background-color: transparent;
+    border: none;
+}
+
+QLabel#emptyLabel {
+    color: #777;
+    font-size: 16px;
+    margin-top: 20px;
 }
 """
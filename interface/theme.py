@@ -0,0 +1,40 @@
+"""
+Módulo de Tema (Theme).
+
+Monta, uma única vez, o stylesheet da aplicação a partir das strings de
+interface/styles.py e o aplica na QApplication. Assim o Qt faz o parse do
+QSS só na inicialização, em vez de reprocessar um stylesheet por widget a
+cada diálogo aberto.
+
+Os widgets escolhem a aparência pelo objectName e, quando a cor depende
+de um valor (ex.: resultado positivo/negativo), pela propriedade "tom".
+"""
+
+from functools import lru_cache
+
+from interface.styles import DIALOG_STYLES, MAIN_WINDOW_STYLES, EMPLOYEES_STYLES
+
+
+@lru_cache(maxsize=1)
+def construir_stylesheet() -> str:
+    """Retorna o stylesheet completo da aplicação (montado só uma vez)."""
+    return "\n".join((DIALOG_STYLES, MAIN_WINDOW_STYLES, EMPLOYEES_STYLES))
+
+
+def aplicar_tema(app) -> None:
+    """Aplica o tema na QApplication. Deve ser chamado antes de criar as janelas."""
+    app.setStyleSheet(construir_stylesheet())
+
+
+def definir_tom(widget, tom: str) -> None:
+    """
+    Troca a variação de cor de um widget ("positivo", "negativo", "neutro").
+
+    Propriedades dinâmicas não são reavaliadas sozinhas pelo Qt: por isso o
+    widget é "re-polido", o que reaplica só as regras dele.
+    """
+    if widget.property("tom") == tom:
+        return
+    widget.setProperty("tom", tom)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
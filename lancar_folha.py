@@ -0,0 +1,66 @@
+"""
+Lança a folha de pagamento de um mês como despesas.
+
+Gera, para os funcionários ativos no mês, as despesas de salário, 13º e
+férias (terço constitucional), na data de pagamento de cada um. Rodar de
+novo não duplica nada: só o que ainda não foi lançado é gravado. Sem
+--confirmar, apenas mostra a prévia. Pode ser agendado (cron, Agendador
+de Tarefas) para rodar todo mês.
+
+Uso:
+    python lancar_folha.py                      (prévia do mês atual)
+    python lancar_folha.py 2024 5               (prévia de maio/2024)
+    python lancar_folha.py 2024 5 --confirmar   (lança maio/2024)
+"""
+
+import sys
+from datetime import date
+
+from database import Database
+from services import SistemaFinanceiro
+
+
+def _moeda(valor):
+    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def main(argv):
+    args = [a for a in argv[1:] if a != "--confirmar"]
+    confirmar = "--confirmar" in argv
+    hoje = date.today()
+    try:
+        ano = int(args[0]) if args else hoje.year
+        mes = int(args[1]) if len(args) > 1 else hoje.month
+        if not 1 <= mes <= 12:
+            raise ValueError(f"Mês inválido: {mes}")
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return 1
+
+    sistema = SistemaFinanceiro(Database("financeiro.db"))
+
+    previstos = sistema.prever_folha(ano, mes)
+    print(f"Folha de {mes:02d}/{ano}:")
+    for p in previstos:
+        o = p.obrigacao
+        if p.lancado:
+            situacao = "já lançada"
+        elif p.valor is None:
+            situacao = "sem salário cadastrado"
+        else:
+            situacao = _moeda(p.valor)
+        print(f"   {o.data.strftime('%d/%m')}  {o.tipo:<12} {o.funcionario.nome}: {situacao}")
+    if not previstos:
+        print("   nenhum pagamento no mês")
+
+    if not confirmar:
+        print("Prévia apenas; use --confirmar para lançar.")
+        return 0
+
+    ids = sistema.lancar_folha(ano, mes)
+    print(f"{len(ids)} despesa(s) lançada(s).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
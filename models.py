@@ -8,10 +8,10 @@ simples relacionados a esses objetos, sem acesso direto ao banco
 nem à interface gráfica.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
 from datetime import date
 from enum import Enum
-from typing import Optional
+from typing import List, Optional, Set
 
 class FormaPagamento(Enum):
     """Enumeração das formas de pagamento suportadas no sistema."""
@@ -21,10 +21,47 @@ class FormaPagamento(Enum):
     CREDITO = "Credito"
     BOLETO = "Boleto"
     CHEQUE = "Cheque"
-    
+
+
+class RastreiaAlteracoes:
+    """
+    Base dos modelos gravados no banco: sabe quais campos mudaram.
+
+    `marcar_salvo()` (chamado pelos repositórios ao ler ou gravar o
+    registro) guarda uma cópia dos valores; os campos alterados são os que
+    diferem dessa cópia. Assim o repositório grava só as colunas que
+    mudaram, ou nada, se o campo voltou ao valor de antes. Modelos criados
+    do zero não são rastreados.
+    """
+
+    def marcar_salvo(self) -> None:
+        """Passa a comparar os campos com os valores atuais."""
+        self.__dict__.pop("_salvo", None)
+        self._salvo = self.__dict__.copy()
+
+    @property
+    def rastreado(self) -> bool:
+        return "_salvo" in self.__dict__
+
+    @property
+    def campos_alterados(self) -> Set[str]:
+        salvo = self.__dict__.get("_salvo")
+        if salvo is None:
+            return set()
+        return {f.name for f in fields(self) if getattr(self, f.name) != salvo[f.name]}
+
+    def campos_diferentes(self, outro) -> Set[str]:
+        """Campos em que este modelo difere de `outro` (do mesmo tipo)."""
+        return {f.name for f in fields(self) if getattr(self, f.name) != getattr(outro, f.name)}
+
+    def como_salvo(self):
+        """Cópia do modelo com os valores da última leitura/gravação."""
+        salvo = self.__dict__.get("_salvo") or {}
+        return replace(self, **{nome: salvo[nome] for nome in self.campos_alterados})
+
 
 @dataclass
-class Recebimento:
+class Recebimento(RastreiaAlteracoes):
     """
     Representa um recebimento de dinheiro (entrada de caixa).
 
@@ -43,7 +80,7 @@ class Recebimento:
 
 
 @dataclass
-class Despesa:
+class Despesa(RastreiaAlteracoes):
     """
     Representa uma despesa (saída de dinheiro).
 
@@ -54,8 +91,10 @@ class Despesa:
         forma_pagamento: Forma de pagamento utilizada.
         descricao: Texto explicando do que se trata a despesa.
         eh_a_prazo: Indica se é uma conta a prazo (True) ou à vista (False).
-        data_vencimento: Data de vencimento, usada quando eh_a_prazo=True.
+        data_vencimento: Data de vencimento, usada quando eh_a_prazo=True
+            (numa despesa parcelada, o vencimento da próxima parcela em aberto).
         comprovante_caminho: Caminho opcional para um comprovante da despesa.
+        foi_pago: Indica se a conta já foi paga (contas à vista já nascem pagas).
     """
     id: Optional[int]
     valor: float
@@ -65,10 +104,11 @@ class Despesa:
     eh_a_prazo: bool = False
     data_vencimento: Optional[date] = None
     comprovante_caminho: Optional[str] = None
+    foi_pago: bool = True
 
 
 @dataclass
-class OrdemServico:
+class OrdemServico(RastreiaAlteracoes):
     """
     Representa uma ordem de serviço.
 
@@ -80,6 +120,8 @@ class OrdemServico:
         data: Data de emissão/registro da OS.
         foi_pago: Indica se a OS já foi totalmente paga.
         forma_pagamento: Forma de pagamento usada, quando já definido.
+        saldo_aberto: Quanto falta receber (valor total menos os pagamentos;
+            zero se paga). Mantido pelo banco; só leitura.
     """
     id: Optional[int]
     cliente: str
@@ -88,10 +130,32 @@ class OrdemServico:
     data: date
     foi_pago: bool
     forma_pagamento: Optional[FormaPagamento] = None
+    saldo_aberto: Optional[float] = None
 
 
 @dataclass
-class Funcionario:
+class PagamentoOS:
+    """
+    Parte de um recebimento usada para pagar uma ordem de serviço (tabela
+    pagamentos_os). Um recebimento pode pagar várias ordens, e uma ordem
+    pode ser paga em vários recebimentos.
+
+    Atributos:
+        id: Identificador único no banco de dados.
+        ordem_servico_id: Ordem de serviço paga.
+        recebimento_id: Recebimento de onde saiu o pagamento.
+        valor: Valor pago à ordem.
+        data: Data do recebimento.
+    """
+    id: Optional[int]
+    ordem_servico_id: int
+    recebimento_id: int
+    valor: float
+    data: date
+
+
+@dataclass
+class Funcionario(RastreiaAlteracoes):
     """
     Representa um funcionário.
 
@@ -107,6 +171,7 @@ class Funcionario:
         mes_decimo_terceiro: Mês planejado/realizado para o 13º salário (1-12).
         mes_ferias: Mês planejado/realizado para férias (1-12).
         data_demissao: Data de saída (None se estiver ativo).
+        salario: Salário mensal, usado para lançar a folha (None se não informado).
     """
     id: Optional[int]
     nome: str
@@ -119,3 +184,312 @@ class Funcionario:
     mes_decimo_terceiro: Optional[int] = None
     mes_ferias: Optional[int] = None
     data_demissao: Optional[date] = None
+    salario: Optional[float] = None
+
+
+@dataclass
+class ResultadoBusca:
+    """
+    Representa um resultado da busca textual (despesa ou ordem de serviço).
+
+    Atributos:
+        tipo: "Despesa" ou "Nota de serviço".
+        id: Identificador do registro encontrado.
+        data: Data do registro.
+        descricao: Texto principal para exibição (descrição ou cliente - descrição).
+        valor: Valor da despesa ou valor total da OS.
+        relevancia: Pontuação da busca (quanto menor, mais relevante).
+    """
+    tipo: str
+    id: int
+    data: date
+    descricao: str
+    valor: float
+    relevancia: float
+
+
+@dataclass
+class ResumoMes:
+    """
+    Uma linha do resumo mensal (tabela resumo_mensal).
+
+    Atributos:
+        mes: Mês no formato "AAAA-MM".
+        entidade: "recebimento", "despesa" ou "ordem_servico".
+        forma_pagamento: Forma de pagamento (None quando não definida).
+        pago: Situação (recebimentos e despesas contam sempre como pagos).
+        quantidade: Quantos lançamentos o mês tem nessa combinação.
+        total: Soma dos valores desses lançamentos.
+    """
+    mes: str
+    entidade: str
+    forma_pagamento: Optional[FormaPagamento]
+    pago: bool
+    quantidade: int
+    total: float
+
+
+@dataclass
+class LancamentoExtrato:
+    """
+    Uma linha do extrato unificado (recebimentos, despesas e ordens de
+    serviço em ordem de data), com o saldo acumulado até ela.
+
+    Atributos:
+        tipo: "Receita", "Despesa" ou "Nota de serviço".
+        id: Identificador do registro.
+        data: Data do lançamento.
+        descricao: Texto para exibição.
+        valor: Valor exibido (despesas negativas; OS pelo valor total).
+        foi_pago: Situação (recebimentos contam sempre como pagos).
+        saldo: Recebimentos - despesas até esta linha, inclusive (None
+            quando o extrato não está em ordem de data).
+    """
+    tipo: str
+    id: int
+    data: date
+    descricao: str
+    valor: float
+    foi_pago: bool
+    saldo: Optional[float]
+
+    @property
+    def fluxo(self) -> float:
+        """Quanto a linha mexe no saldo (ordens de serviço não mexem)."""
+        return 0.0 if self.tipo == "Nota de serviço" else self.valor
+
+
+@dataclass
+class Parcela:
+    """
+    Parcela de uma despesa a prazo (tabela parcelas_despesa). Toda despesa a
+    prazo tem ao menos uma; a despesa guarda o valor total e a data da
+    compra (competência), as parcelas guardam quando cada parte vence
+    (caixa).
+
+    Atributos:
+        id: Identificador único no banco de dados.
+        despesa_id: Despesa a que a parcela pertence.
+        numero: Número da parcela (1, 2, ...).
+        valor: Valor da parcela.
+        data_vencimento: Data em que a parcela vence.
+        foi_pago: Indica se a parcela já foi paga.
+        quantidade: Total de parcelas da despesa.
+        descricao: Descrição da despesa (só leitura, para listagens).
+        forma_pagamento: Forma de pagamento da despesa (só leitura).
+    """
+    id: Optional[int]
+    despesa_id: Optional[int]
+    numero: int
+    valor: float
+    data_vencimento: date
+    foi_pago: bool = False
+    quantidade: int = 1
+    descricao: str = ""
+    forma_pagamento: Optional[FormaPagamento] = None
+
+    @property
+    def rotulo(self) -> str:
+        """Descrição com o número da parcela, ex.: "Torno (2/6)"."""
+        if self.quantidade <= 1:
+            return self.descricao
+        return f"{self.descricao} ({self.numero}/{self.quantidade})"
+
+
+@dataclass
+class TotaisDespesasMes:
+    """
+    Despesas de um mês pelos dois critérios.
+
+    Atributos:
+        ano, mes: Mês dos totais.
+        competencia: Despesas lançadas no mês (pela data da compra).
+        a_vista: Despesas à vista lançadas no mês.
+        parcelas: Parcelas de contas a prazo que vencem no mês.
+    """
+    ano: int
+    mes: int
+    competencia: float
+    a_vista: float
+    parcelas: float
+
+    @property
+    def caixa(self) -> float:
+        """O que sai do caixa no mês: à vista pela data, a prazo pelo vencimento."""
+        return self.a_vista + self.parcelas
+
+
+@dataclass
+class AlertasVencimento:
+    """
+    Parcelas de contas a prazo ainda não pagas, agrupadas pela proximidade
+    do vencimento.
+
+    Atributos:
+        hoje: Data de referência dos grupos.
+        vencidas: Vencimento antes de hoje.
+        vencem_hoje: Vencimento hoje.
+        vencem_na_semana: Vencimento nos próximos 7 dias (depois de hoje).
+    """
+    hoje: date
+    vencidas: List[Parcela]
+    vencem_hoje: List[Parcela]
+    vencem_na_semana: List[Parcela]
+
+    @property
+    def total(self) -> int:
+        return len(self.vencidas) + len(self.vencem_hoje) + len(self.vencem_na_semana)
+
+
+@dataclass
+class AgingCliente:
+    """
+    Ordens de serviço não pagas de um cliente, por idade (dias desde a
+    emissão da OS até a data de referência).
+
+    Atributos:
+        cliente: Nome do cliente.
+        ate_30: Valor em aberto com até 30 dias.
+        de_31_a_60: Valor em aberto com 31 a 60 dias.
+        de_61_a_90: Valor em aberto com 61 a 90 dias.
+        acima_de_90: Valor em aberto com mais de 90 dias.
+        quantidade: Quantas ordens estão em aberto.
+        mais_antiga: Data da ordem em aberto mais antiga.
+    """
+    cliente: str
+    ate_30: float
+    de_31_a_60: float
+    de_61_a_90: float
+    acima_de_90: float
+    quantidade: int
+    mais_antiga: date
+
+    @property
+    def total(self) -> float:
+        return self.ate_30 + self.de_31_a_60 + self.de_61_a_90 + self.acima_de_90
+
+
+@dataclass
+class ObrigacaoFolha:
+    """
+    Um pagamento de folha devido a um funcionário.
+
+    Atributos:
+        data: Dia do pagamento (dia_pagamento do funcionário, limitado ao
+            último dia do mês).
+        tipo: "Salário", "13º salário" ou "Férias".
+        funcionario: Funcionário que deve ser pago.
+    """
+    data: date
+    tipo: str
+    funcionario: Funcionario
+
+
+@dataclass
+class ObrigacoesMes:
+    """
+    Tudo o que a folha deve pagar em um mês, em ordem de data.
+
+    Atributos:
+        ano: Ano do mês.
+        mes: Mês (1-12).
+        itens: Obrigações do mês (salários, 13º e férias).
+    """
+    ano: int
+    mes: int
+    itens: List[ObrigacaoFolha]
+
+
+@dataclass
+class LancamentoFolha:
+    """
+    Uma despesa que a folha do mês lança (ou já lançou) para uma obrigação.
+
+    Atributos:
+        obrigacao: Pagamento devido (data, tipo e funcionário).
+        valor: Valor da despesa (None se o funcionário não tem salário cadastrado).
+        despesa_id: Despesa já lançada para a obrigação (None se ainda não foi).
+    """
+    obrigacao: ObrigacaoFolha
+    valor: Optional[float]
+    despesa_id: Optional[int] = None
+
+    @property
+    def lancado(self) -> bool:
+        return self.despesa_id is not None
+
+
+@dataclass
+class DiaProjecao:
+    """
+    Um dia do fluxo de caixa projetado.
+
+    Atributos:
+        data: Dia da projeção.
+        entradas: Recebimentos previstos (e já lançados) no dia.
+        saidas: Pagamentos previstos (e já lançados) no dia.
+        saldo: Saldo em caixa no fim do dia.
+    """
+    data: date
+    entradas: float
+    saidas: float
+    saldo: float
+
+
+@dataclass
+class ProjecaoFluxo:
+    """
+    Fluxo de caixa projetado para os próximos dias.
+
+    Atributos:
+        hoje: Primeiro dia da projeção.
+        saldo_inicial: Saldo em caixa no início de hoje (contas a prazo só
+            saem do caixa nas parcelas).
+        dias: Um item por dia, de hoje em diante.
+    """
+    hoje: date
+    saldo_inicial: float
+    dias: List[DiaProjecao]
+
+    @property
+    def saldo_final(self) -> float:
+        return self.dias[-1].saldo if self.dias else self.saldo_inicial
+
+    @property
+    def total_entradas(self) -> float:
+        return sum(d.entradas for d in self.dias)
+
+    @property
+    def total_saidas(self) -> float:
+        return sum(d.saidas for d in self.dias)
+
+    @property
+    def menor_saldo(self) -> Optional[DiaProjecao]:
+        """Dia de menor saldo no período (o primeiro, em caso de empate)."""
+        return min(self.dias, key=lambda d: d.saldo) if self.dias else None
+
+
+@dataclass
+class PrevisaoMensal:
+    """
+    Tendência, sazonalidade e previsão dos totais mensais de uma entidade.
+
+    Atributos:
+        entidade: eventos.RECEBIMENTO ou eventos.DESPESA.
+        meses: Meses do histórico ("AAAA-MM"), sem lacunas (mês sem
+            lançamentos vale 0).
+        valores: Total de cada mês do histórico.
+        media_movel: Média dos últimos meses (None enquanto não há meses suficientes).
+        suavizado: Suavização exponencial simples, já com a sazonalidade.
+        indice_sazonal: Fator de cada mês do ano, janeiro primeiro (1.0 = mês médio).
+        meses_previstos: Meses da previsão ("AAAA-MM").
+        previstos: Valor previsto para cada um deles.
+    """
+    entidade: str
+    meses: List[str]
+    valores: List[float]
+    media_movel: List[Optional[float]]
+    suavizado: List[float]
+    indice_sazonal: List[float]
+    meses_previstos: List[str]
+    previstos: List[float]
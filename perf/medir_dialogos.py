@@ -0,0 +1,89 @@
+"""
+Mede o tempo de construção (construtor + show + primeiro polish) dos
+diálogos principais, em milissegundos (mediana de N aberturas).
+
+Uso:
+    python perf/medir_dialogos.py [N]
+
+Roda sem tela (QT_QPA_PLATFORM=offscreen) e usa um banco temporário
+com alguns lançamentos, para não tocar no financeiro.db.
+"""
+
+import os
+import sys
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+from PySide6.QtWidgets import QApplication
+
+from database import Database
+from services import SistemaFinanceiro
+from models import FormaPagamento
+from interface.theme import aplicar_tema
+
+
+def _popular(sistema):
+    base = date.today().replace(day=1)
+    for i in range(60):
+        dia = base - timedelta(days=i)
+        sistema.registrar_recebimento(100.0 + i, FormaPagamento.PIX, dia)
+        sistema.registrar_despesa(50.0 + i, f"Despesa {i}", FormaPagamento.DINHEIRO, dia)
+        sistema.gerar_ordem_servico(f"Cliente {i}", f"Serviço {i}", 200.0, i % 2 == 0, None, dia)
+
+
+def _medir(fabrica, n):
+    app = QApplication.instance()
+    tempos = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        w = fabrica()
+        w.show()
+        app.processEvents()
+        tempos.append((time.perf_counter() - t0) * 1000)
+        w.close()
+        w.deleteLater()
+        app.processEvents()
+    return statistics.median(tempos)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = QApplication(sys.argv)
+    aplicar_tema(app)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sistema = SistemaFinanceiro(Database(os.path.join(tmp, "medicao.db")))
+        _popular(sistema)
+
+        from interface.main_window import MainWindow
+        from interface.dialogs.add import NovaReceitaDialog, NovaDespesaDialog, NovaNotaServicoDialog
+        from interface.dialogs.reports import RelatorioDespesasDialog, RelatorioGeralDialog
+        from interface.dialogs.add_edit_employee import AddEditEmployeeDialog
+
+        janela = MainWindow(sistema)
+        casos = [
+            ("MainWindow", lambda: MainWindow(sistema)),
+            ("NovaReceitaDialog", lambda: NovaReceitaDialog(sistema, janela)),
+            ("NovaDespesaDialog", lambda: NovaDespesaDialog(sistema, janela)),
+            ("NovaNotaServicoDialog", lambda: NovaNotaServicoDialog(sistema, janela)),
+            ("AddEditEmployeeDialog", lambda: AddEditEmployeeDialog(sistema, janela)),
+            ("RelatorioDespesasDialog", lambda: RelatorioDespesasDialog(sistema, janela)),
+            ("RelatorioGeralDialog", lambda: RelatorioGeralDialog(sistema, janela)),
+        ]
+        for nome, fabrica in casos:
+            print(f"{nome:<26} {_medir(fabrica, n):8.1f} ms")
+
+        # Destrói a janela antes da QApplication (evita crash no encerramento)
+        janela.deleteLater()
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
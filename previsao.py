@@ -0,0 +1,108 @@
+"""
+Módulo de previsão dos totais mensais.
+
+A partir do total de cada mês (tabela resumo_mensal, não dos lançamentos),
+calcula tendência e sazonalidade e projeta os próximos meses: média
+móvel, índice sazonal de cada mês do ano (comparado com a média do
+próprio ano) e suavização exponencial simples da série sem a
+sazonalidade. Usa NumPy quando está instalado; sem ele, as mesmas contas
+são feitas em Python puro. Não conhece banco de dados nem interface.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:     # Opcional: sem NumPy, as contas rodam em Python puro
+    np = None
+
+
+def media_movel(valores: Sequence[float], janela: int) -> List[Optional[float]]:
+    """Média dos últimos `janela` meses de cada mês (None nos primeiros)."""
+    if janela < 1:
+        raise ValueError("A janela da média móvel deve ter pelo menos 1 mês.")
+    if len(valores) < janela:
+        return [None] * len(valores)
+    if np is not None:
+        medias = np.convolve(np.asarray(valores, dtype=float), np.ones(janela) / janela, "valid").tolist()
+    else:
+        soma = sum(valores[:janela])
+        medias = [soma / janela]
+        for i in range(janela, len(valores)):
+            soma += valores[i] - valores[i - janela]
+            medias.append(soma / janela)
+    return [None] * (janela - 1) + medias
+
+
+def indice_sazonal(primeiro_mes: int, valores: Sequence[float]) -> List[float]:
+    """
+    Fator de cada mês do ano (janeiro primeiro): em cada ano completo da
+    série, o valor do mês dividido pela média do ano; depois, a média
+    desses fatores entre os anos, normalizada para que a média dos 12 seja
+    1. Sem nenhum ano completo (com movimento), todos os fatores são 1.
+    `primeiro_mes` é o mês (1-12) do primeiro valor.
+    """
+    inicio = (13 - primeiro_mes) % 12        # Posição do primeiro janeiro
+    anos = (len(valores) - inicio) // 12
+    if anos < 1:
+        return [1.0] * 12
+    if np is not None:
+        matriz = np.asarray(valores[inicio:inicio + anos * 12], dtype=float).reshape(anos, 12)
+        medias = matriz.mean(axis=1)
+        matriz = matriz[medias > 0]
+        if not len(matriz):
+            return [1.0] * 12
+        fatores = (matriz / matriz.mean(axis=1, keepdims=True)).mean(axis=0)
+        return (fatores / fatores.mean()).tolist()
+    linhas = []
+    for a in range(anos):
+        ano = valores[inicio + a * 12:inicio + (a + 1) * 12]
+        media = sum(ano) / 12
+        if media > 0:
+            linhas.append([v / media for v in ano])
+    if not linhas:
+        return [1.0] * 12
+    fatores = [sum(coluna) / len(linhas) for coluna in zip(*linhas)]
+    media = sum(fatores) / 12
+    return [f / media for f in fatores]
+
+
+def suavizacao_exponencial(valores: Sequence[float], alfa: float) -> List[float]:
+    """
+    Nível suavizado de cada mês: alfa * valor + (1 - alfa) * nível anterior,
+    começando pelo primeiro valor. Cada passo depende do anterior, então
+    esta conta é um laço mesmo com NumPy (a série tem poucas dezenas de meses).
+    """
+    if not 0 < alfa <= 1:
+        raise ValueError("O alfa da suavização deve estar entre 0 (exclusive) e 1.")
+    niveis = []
+    nivel = None
+    for v in valores:
+        nivel = v if nivel is None else alfa * v + (1 - alfa) * nivel
+        niveis.append(nivel)
+    return niveis
+
+
+def prever(
+    primeiro_mes: int, valores: Sequence[float], horizonte: int, alfa: float
+) -> Tuple[List[float], List[float], List[float]]:
+    """
+    (índice sazonal, série suavizada, previstos): a série é dessazonalizada,
+    suavizada e, para cada mês previsto, o último nível volta a ser
+    multiplicado pelo fator do mês do ano.
+    """
+    indice = indice_sazonal(primeiro_mes, valores)
+    if not valores:
+        return indice, [], [0.0] * horizonte
+    n = len(valores)
+    fatores = [indice[(primeiro_mes - 1 + i) % 12] for i in range(n + horizonte)]
+    if np is not None:
+        f = np.asarray(fatores[:n])
+        v = np.asarray(valores, dtype=float)
+        dessazonalizados = np.where(f > 0, v / np.where(f > 0, f, 1), v).tolist()
+    else:
+        dessazonalizados = [v / f if f > 0 else v for v, f in zip(valores, fatores)]
+    niveis = suavizacao_exponencial(dessazonalizados, alfa)
+    suavizados = [nivel * f for nivel, f in zip(niveis, fatores)]
+    previstos = [niveis[-1] * f for f in fatores[n:]]
+    return indice, suavizados, previstos
@@ -7,80 +7,209 @@ Cada repositório cuida do CRUD de uma entidade específica, utilizando
 a classe Database para executar os comandos SQL.
 """
 
-from datetime import date
-from typing import List
+from datetime import date, timedelta
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from database import Database
-from models import Recebimento, Despesa, OrdemServico, FormaPagamento, Funcionario
+from busca import normalizar_texto
+from database import Database, MAX_ANEXOS, FONTES_LANCAMENTOS, sql_lancamentos
+from models import (
+    Recebimento, Despesa, OrdemServico, FormaPagamento, Funcionario, ResultadoBusca, ResumoMes,
+    LancamentoExtrato, AgingCliente, Parcela, PagamentoOS
+)
 
 
+def _valor_coluna(valor):
+    """Converte um atributo do modelo para o formato gravado no banco."""
+    if isinstance(valor, bool):
+        return 1 if valor else 0
+    if isinstance(valor, date):
+        return valor.isoformat()        # date -> "YYYY-MM-DD"
+    if isinstance(valor, Enum):
+        return valor.value
+    return valor
 
 
-class RecebimentoRepositorio:
+def _atualizar_colunas(db: Database, tabela: str, colunas, modelo,
+                       campos: Optional[Iterable[str]] = None) -> bool:
+    """
+    UPDATE só das `colunas` que estão em `campos`. Sem `campos`, usa os
+    campos alterados do modelo (se ele for rastreado) ou todas as colunas.
+    Retorna False, sem tocar no banco, quando não há nada para gravar.
+    """
+    sql, params = _sql_atualizar(tabela, colunas, modelo, campos)
+    if not sql:
+        return False
+    _conferir_atualizado(db.alterar(sql, params))
+    modelo.marcar_salvo()
+    return True
+
+
+def _sql_atualizar(tabela: str, colunas, modelo, campos: Optional[Iterable[str]] = None):
+    """(sql, params) do UPDATE de _atualizar_colunas; sql vazio se não há o que gravar."""
+    if campos is None:
+        campos = modelo.campos_alterados if modelo.rastreado else colunas
+    alteradas = [c for c in colunas if c in campos]
+    if not alteradas:
+        return "", []
+    sql = f"UPDATE {tabela} SET {', '.join(f'{c} = ?' for c in alteradas)} WHERE id = ?"
+    return sql, [_valor_coluna(getattr(modelo, c)) for c in alteradas] + [modelo.id]
+
+
+def _conferir_atualizado(afetadas: int) -> None:
+    if afetadas == 0:
+        # Registros de anos arquivados só existem no arquivo (somente leitura)
+        raise ValueError("Registro não encontrado no banco principal (ano arquivado?).")
+
+
+def _filtro_datas(coluna: str, data_inicio: Optional[date], data_fim: Optional[date]):
+    condicoes = []
+    params = []
+    if data_inicio:
+        condicoes.append(f"{coluna} >= ?")
+        params.append(data_inicio.isoformat())
+    if data_fim:
+        condicoes.append(f"{coluna} <= ?")
+        params.append(data_fim.isoformat())
+    sql = "".join(f" AND {c}" for c in condicoes)
+    return sql, params
+
+
+class _RepositorioLancamentos:
+    """
+    Leituras comuns de recebimentos, despesas e ordens de serviço. Essas
+    tabelas podem ter anos movidos para arquivos anuais (ver
+    Database.arquivar_ano): as leituras por data anexam só os arquivos
+    necessários, e a busca por id olha os arquivos se o registro não
+    estiver no banco principal.
+
+    Cada subclasse define _TABELA, _SELECT (com `{tabela}` no FROM) e
+    _de_linha.
+    """
+
+    _TABELA = ""
+    _SELECT = ""
+    _COLUNA_VALOR = "valor"
+
     def __init__(self, db: Database):
         self.db = db
-    
+
+    def listar_por_data(self, data_inicio: Optional[date] = None, data_fim: Optional[date] = None):
+        filtro, params = _filtro_datas("data", data_inicio, data_fim)
+        rows = self.db.consultar_por_data(
+            self._SELECT + " WHERE 1=1" + filtro, self._TABELA, params,
+            data_inicio, data_fim, ordem="ORDER BY id",
+        )
+        return [self._de_linha(r) for r in rows]
+
+    def totais_por_dia(self) -> List[Tuple[date, float]]:
+        """Soma dos valores de cada data (banco principal e arquivos)."""
+        rows = self.db.consultar_por_data(
+            f"SELECT data, SUM({self._COLUNA_VALOR}) FROM {{tabela}} GROUP BY data", self._TABELA
+        )
+        return [(date.fromisoformat(r[0]), r[1]) for r in rows]
+
+    def obter_por_id(self, id_: int):
+        sql = self._SELECT + " WHERE id = ?"
+        rows = self.db.consultar(sql.format(tabela=self._TABELA), (id_,))
+        if not rows:
+            rows = self.db.consultar_por_data(sql, self._TABELA, (id_,))
+        return self._de_linha(rows[0]) if rows else None
+
+    def listar_por_ids(self, ids: Iterable[int]):
+        """Registros do banco principal com os `ids`, em uma consulta só."""
+        ids = list(ids)
+        if not ids:
+            return []
+        sql = self._SELECT.format(tabela=self._TABELA) + f" WHERE id IN ({', '.join('?' * len(ids))})"
+        return [self._de_linha(r) for r in self.db.consultar(sql + " ORDER BY id", ids)]
+
+    def atualizar_em_lote(self, ids: Iterable[int], valores: Dict[str, object], filtro: str = "") -> int:
+        """
+        Grava `valores` (coluna -> valor do modelo) em todos os `ids` com um
+        UPDATE só; `filtro` restringe quais deles mudam. Registros de anos
+        arquivados não são alcançados. Retorna quantos mudaram.
+        """
+        sql, params = self._sql_em_lote(ids, valores, filtro)
+        return self.db.alterar(sql, params) if sql else 0
+
+    def _sql_em_lote(self, ids: Iterable[int], valores: Dict[str, object], filtro: str = ""):
+        ids = list(ids)
+        if not ids:
+            return "", []
+        sql = (
+            f"UPDATE {self._TABELA} SET {', '.join(f'{c} = ?' for c in valores)} "
+            f"WHERE id IN ({', '.join('?' * len(ids))})"
+        )
+        if filtro:
+            sql += f" AND {filtro}"
+        return sql, [_valor_coluna(v) for v in valores.values()] + ids
+
+
+class RecebimentoRepositorio(_RepositorioLancamentos):
+    _TABELA = "recebimentos"
+    _SELECT = "SELECT id, valor, data, forma_pagamento, comprovante_caminho FROM {tabela}"
+
+    _INSERT = """
+        INSERT INTO recebimentos (valor, data, forma_pagamento, comprovante_caminho)
+        VALUES (?, ?, ?, ?)
+        """
+
+    _COLUNAS = ("valor", "data", "forma_pagamento", "comprovante_caminho")
+
     def criar(self, rec: Recebimento) -> int:
-        sql = """
-            INSERT INTO recebimentos (valor, data, forma_pagamento, comprovante_caminho)
-            VALUES (?, ?, ?, ?)
-            """
-        params = (
+        return self.db.executar(self._INSERT, self._params_insert(rec))
+
+    def criar_em(self, conn, rec: Recebimento) -> int:
+        """Grava o recebimento na conexão `conn` (dentro de uma transação aberta)."""
+        return conn.execute(self._INSERT, self._params_insert(rec)).lastrowid
+
+    @staticmethod
+    def _params_insert(rec: Recebimento):
+        return (
             rec.valor,
             rec.data.isoformat(),         # date -> "YYYY-MM-DD"
             rec.forma_pagamento.value,    # FormaPagamento.PIX -> "pix"
             rec.comprovante_caminho
         )
 
-        return self.db.executar(sql, params)
-
-
-    def atualizar(self, rec: Recebimento) -> None:
+    def atualizar(self, rec: Recebimento, campos: Optional[Iterable[str]] = None) -> bool:
         if rec.id is None:
             raise ValueError("Recebimento precisa ter id para atualizar.")
-        sql = """
-            UPDATE recebimentos
-            SET valor = ?,
-                data = ?,
-                forma_pagamento = ?,
-                comprovante_caminho = ?
-            WHERE id = ?
-        """
-        params = (
-            rec.valor,
-            rec.data.isoformat(),
-            rec.forma_pagamento.value,
-            rec.comprovante_caminho,
-            rec.id,
-        )
-        self.db.executar(sql, params)
+        return _atualizar_colunas(self.db, "recebimentos", self._COLUNAS, rec, campos)
 
+    @staticmethod
+    def _de_linha(r) -> Recebimento:
+        rec = Recebimento(
+            id=r[0],
+            valor=r[1],
+            data=date.fromisoformat(r[2]),      # "YYYY-MM-DD" -> date
+            forma_pagamento=FormaPagamento(r[3]),
+            comprovante_caminho=r[4]
+        )
+        rec.marcar_salvo()
+        return rec
 
     def listar_todos(self) -> List[Recebimento]:
-        sql = "SELECT id, valor, data, forma_pagamento, comprovante_caminho FROM recebimentos"
-        rows = self.db.consultar(sql)
-
-        recebimentos: List[Recebimento] = []
-        for r in rows:
-            recebimentos.append(
-                Recebimento(
-                    id=r[0],
-                    valor=r[1],
-                    data=date.fromisoformat(r[2]),      # "YYYY-MM-DD" -> date
-                    forma_pagamento=FormaPagamento(r[3]),
-                    comprovante_caminho=r[4]
-                )
-            )
-        return recebimentos
+        return self.listar_por_data()
     
 
-class DespesaRepositorio:
-    def __init__(self, db: Database):
-        self.db = db
-
-    def criar(self, despesa: Despesa) -> int:
+class DespesaRepositorio(_RepositorioLancamentos):
+    _TABELA = "despesas"
+    _SELECT = """
+        SELECT id,
+               valor,
+               data,
+               forma_pagamento,
+               descricao,
+               eh_a_prazo,
+               data_vencimento,
+               comprovante_caminho,
+               foi_pago
+        FROM {tabela}
+        """
 
-        sql ="""
+    _INSERT = """
         INSERT INTO despesas (
             valor,
             data,
@@ -88,84 +217,268 @@ class DespesaRepositorio:
             descricao,
             eh_a_prazo,
             data_vencimento,
-            comprovante_caminho
+            comprovante_caminho,
+            foi_pago
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """
-        params = (
+
+    _COLUNAS = (
+        "valor", "data", "forma_pagamento", "descricao",
+        "eh_a_prazo", "data_vencimento", "comprovante_caminho", "foi_pago",
+    )
+
+    def criar(self, despesa: Despesa) -> int:
+        return self.db.executar(self._INSERT, self._params_insert(despesa))
+
+    def criar_em(self, conn, despesa: Despesa) -> int:
+        """Grava a despesa na conexão `conn` (dentro de uma transação aberta)."""
+        return conn.execute(self._INSERT, self._params_insert(despesa)).lastrowid
+
+    @staticmethod
+    def _params_insert(despesa: Despesa):
+        return (
             despesa.valor,
             despesa.data.isoformat(),             # date -> "YYYY-MM-DD"
             despesa.forma_pagamento.value,        # FormaPagamento -> str
             despesa.descricao,
             1 if despesa.eh_a_prazo else 0,
             despesa.data_vencimento.isoformat() if despesa.data_vencimento else None,
-            despesa.comprovante_caminho
+            despesa.comprovante_caminho,
+            1 if despesa.foi_pago else 0
         )
 
-        return self.db.executar(sql, params)
-    
-
-    def atualizar(self, despesa: Despesa) -> None:
+    def atualizar(self, despesa: Despesa, campos: Optional[Iterable[str]] = None) -> bool:
         if despesa.id is None:
             raise ValueError("Despesa precisa ter id para atualizar.")
-        sql = """
-            UPDATE despesas
-            SET valor = ?,
-                data = ?,
-                forma_pagamento = ?,
-                descricao = ?,
-                eh_a_prazo = ?,
-                data_vencimento = ?,
-                comprovante_caminho = ?
-            WHERE id = ?
+        return _atualizar_colunas(self.db, "despesas", self._COLUNAS, despesa, campos)
+
+    def atualizar_em(self, conn, despesa: Despesa, campos: Optional[Iterable[str]] = None) -> bool:
         """
-        params = (
-            despesa.valor,
-            despesa.data.isoformat(),
-            despesa.forma_pagamento.value,
-            despesa.descricao,
-            1 if despesa.eh_a_prazo else 0,
-            despesa.data_vencimento.isoformat() if despesa.data_vencimento else None,
-            despesa.comprovante_caminho,
-            despesa.id,
-        )
-        self.db.executar(sql, params)
+        Como atualizar, na conexão `conn` (dentro de uma transação aberta).
+        Não marca a despesa como salva: quem chama faz isso depois do commit.
+        """
+        sql, params = _sql_atualizar("despesas", self._COLUNAS, despesa, campos)
+        if not sql:
+            return False
+        _conferir_atualizado(conn.execute(sql, params).rowcount)
+        return True
 
+    @staticmethod
+    def _de_linha(r) -> Despesa:
+        despesa = Despesa(
+            id=r[0],
+            valor=r[1],
+            data=date.fromisoformat(r[2]),
+            forma_pagamento=FormaPagamento(r[3]),
+            descricao=r[4],
+            eh_a_prazo=bool(r[5]),
+            data_vencimento=date.fromisoformat(r[6]) if r[6] else None,
+            comprovante_caminho=r[7],
+            foi_pago=bool(r[8])
+        )
+        despesa.marcar_salvo()
+        return despesa
 
     def listar_todos(self) -> List[Despesa]:
-        sql = """
-        SELECT id,
-               valor,
-               data,
-               forma_pagamento,
-               descricao,
-               eh_a_prazo,
-               data_vencimento,
-               comprovante_caminho
-        FROM despesas
-        """
-        rows = self.db.consultar(sql)
+        return self.listar_por_data()
 
-        despesas: List[Despesa] = []
-        for r in rows:
-            despesas.append(
-                Despesa(
-                    id=r[0],
-                    valor=r[1],
-                    data=date.fromisoformat(r[2]),
-                    forma_pagamento=FormaPagamento(r[3]),
-                    descricao=r[4],
-                    eh_a_prazo=bool(r[5]),
-                    data_vencimento=date.fromisoformat(r[6]) if r[6] else None,
-                    comprovante_caminho=r[7]
-                )
+    def marcar_pagas(self, ids: Iterable[int]) -> int:
+        """
+        Marca como pagas as contas a prazo em aberto entre os `ids`, com
+        todas as parcelas, em uma transação (um UPDATE por tabela).
+        Retorna quantas despesas mudaram.
+        """
+        ids = list(ids)
+        sql, params = self._sql_em_lote(ids, {"foi_pago": True}, "eh_a_prazo = 1 AND foi_pago = 0")
+        if not sql:
+            return 0
+        with self.db.transacao() as conn:
+            alteradas = conn.execute(sql, params).rowcount
+            conn.execute(
+                f"UPDATE parcelas_despesa SET foi_pago = 1 "
+                f"WHERE foi_pago = 0 AND despesa_id IN ({', '.join('?' * len(ids))})",
+                ids,
             )
-        return despesas
+        return alteradas
+
+    def total_a_vista(self, data_inicio: date, data_fim: date) -> float:
+        """Soma das despesas à vista lançadas entre as datas (principal e arquivos)."""
+        rows = self.db.consultar_por_data(
+            "SELECT SUM(valor) FROM {tabela} WHERE eh_a_prazo = 0 AND data BETWEEN ? AND ?",
+            self._TABELA, (data_inicio.isoformat(), data_fim.isoformat()), data_inicio, data_fim,
+        )
+        return sum(r[0] or 0.0 for r in rows)
 
 
-class OrdemServicoRepositorio:
-    def __init__(self, db: Database):
+class ParcelaRepositorio:
+    """
+    Parcelas das despesas a prazo (tabela parcelas_despesa, só no banco
+    principal). As leituras por vencimento usam os índices
+    parcelas_despesa_vencimento e parcelas_a_pagar; as da despesa, a chave
+    única (despesa_id, numero).
+    """
+
+    # Parcela com os dados de listagem da despesa. A despesa de uma parcela
+    # em aberto está no principal; a de uma parcela paga pode já ter ido
+    # para um arquivo anual, e aí descrição e forma ficam vazias
+    _SELECT = """
+        SELECT p.id, p.despesa_id, p.numero, p.valor, p.data_vencimento, p.foi_pago,
+               (SELECT COUNT(*) FROM parcelas_despesa t WHERE t.despesa_id = p.despesa_id),
+               d.descricao, d.forma_pagamento
+        FROM parcelas_despesa p
+        LEFT JOIN despesas d ON d.id = p.despesa_id
+        """
+
+    _INSERT = """
+        INSERT INTO parcelas_despesa (despesa_id, numero, valor, data_vencimento, foi_pago)
+        VALUES (?, ?, ?, ?, ?)
+        """
+
+    def __init__(self, db: Database, despesas: DespesaRepositorio):
         self.db = db
+        self.despesas = despesas
+
+    @staticmethod
+    def _params_insert(p: Parcela):
+        return (p.despesa_id, p.numero, p.valor, p.data_vencimento.isoformat(), 1 if p.foi_pago else 0)
+
+    def criar_com_despesa(self, despesa: Despesa, parcelas: List[Parcela]) -> None:
+        """
+        Grava a despesa e todas as suas parcelas em uma transação só
+        (preenche os ids da despesa e das parcelas).
+        """
+        with self.db.transacao() as conn:
+            despesa.id = self.despesas.criar_em(conn, despesa)
+            for p in parcelas:
+                p.despesa_id = despesa.id
+            conn.executemany(self._INSERT, [self._params_insert(p) for p in parcelas])
+            ids = conn.execute(
+                "SELECT id FROM parcelas_despesa WHERE despesa_id = ? ORDER BY numero", (despesa.id,)
+            ).fetchall()
+        for p, r in zip(parcelas, ids):
+            p.id = r[0]
+
+    @staticmethod
+    def _de_linha(r) -> Parcela:
+        return Parcela(
+            id=r[0],
+            despesa_id=r[1],
+            numero=r[2],
+            valor=r[3],
+            data_vencimento=date.fromisoformat(r[4]),
+            foi_pago=bool(r[5]),
+            quantidade=r[6],
+            descricao=r[7] or "",
+            forma_pagamento=FormaPagamento(r[8]) if r[8] else None,
+        )
+
+    def obter_por_id(self, parcela_id: int) -> Optional[Parcela]:
+        rows = self.db.consultar(self._SELECT + " WHERE p.id = ?", (parcela_id,))
+        return self._de_linha(rows[0]) if rows else None
+
+    def listar_da_despesa(self, despesa_id: int) -> List[Parcela]:
+        rows = self.db.consultar(self._SELECT + " WHERE p.despesa_id = ? ORDER BY p.numero", (despesa_id,))
+        return [self._de_linha(r) for r in rows]
+
+    def listar_a_pagar(
+        self, data_inicio: Optional[date] = None, data_fim: Optional[date] = None
+    ) -> List[Parcela]:
+        """Parcelas em aberto por vencimento (índice parcial parcelas_a_pagar)."""
+        filtro, params = _filtro_datas("p.data_vencimento", data_inicio, data_fim)
+        sql = self._SELECT + " WHERE p.foi_pago = 0" + filtro + " ORDER BY p.data_vencimento, p.id"
+        return [self._de_linha(r) for r in self.db.consultar(sql, params)]
+
+    def total_vencimento(self, data_inicio: date, data_fim: date) -> float:
+        """Soma das parcelas (pagas ou não) que vencem entre as datas."""
+        rows = self.db.consultar(
+            "SELECT SUM(valor) FROM parcelas_despesa WHERE data_vencimento BETWEEN ? AND ?",
+            (data_inicio.isoformat(), data_fim.isoformat()),
+        )
+        return rows[0][0] or 0.0
+
+    def pagar(self, despesa: Despesa, parcela_id: int) -> bool:
+        """
+        Marca a parcela da `despesa` (lida do banco) como paga e leva o
+        pagamento à despesa, em uma transação só: ela passa a vencer na
+        próxima parcela em aberto ou, paga a última, fica paga. Retorna
+        False, sem gravar nada, se a parcela já estava paga.
+        """
+        with self.db.transacao() as conn:
+            if conn.execute(
+                "UPDATE parcelas_despesa SET foi_pago = 1 WHERE id = ? AND foi_pago = 0", (parcela_id,)
+            ).rowcount == 0:
+                return False
+            proxima = conn.execute(
+                "SELECT data_vencimento FROM parcelas_despesa WHERE despesa_id = ? AND foi_pago = 0 "
+                "ORDER BY numero LIMIT 1",
+                (despesa.id,),
+            ).fetchone()
+            if proxima:
+                despesa.data_vencimento = date.fromisoformat(proxima[0])
+            else:
+                despesa.foi_pago = True
+            self.despesas.atualizar_em(conn, despesa)
+        despesa.marcar_salvo()
+        return True
+
+    def atualizar_com_despesa(self, despesa: Despesa, campos: Optional[Iterable[str]] = None) -> bool:
+        """
+        Grava a despesa editada e leva a mudança às parcelas, em uma
+        transação só: à vista fica sem parcelas; a prazo sem parcelas ganha
+        uma, em aberto; com parcela única, ela segue valor, vencimento e
+        situação da despesa; com várias, só a quitação (despesa paga, todas
+        pagas). Retorna False, sem gravar nada, se a despesa não mudou.
+        """
+        with self.db.transacao() as conn:
+            if not self.despesas.atualizar_em(conn, despesa, campos):
+                return False
+            self._acompanhar_despesa(conn, despesa)
+        despesa.marcar_salvo()
+        return True
+
+    def _acompanhar_despesa(self, conn, despesa: Despesa) -> None:
+        if not despesa.eh_a_prazo:
+            conn.execute("DELETE FROM parcelas_despesa WHERE despesa_id = ?", (despesa.id,))
+            return
+        quantidade = conn.execute(
+            "SELECT COUNT(*) FROM parcelas_despesa WHERE despesa_id = ?", (despesa.id,)
+        ).fetchone()[0]
+        vencimento = despesa.data_vencimento or despesa.data
+        if quantidade == 0:
+            p = Parcela(None, despesa.id, 1, despesa.valor, vencimento, False)
+            conn.execute(self._INSERT, self._params_insert(p))
+        elif quantidade == 1:
+            conn.execute(
+                "UPDATE parcelas_despesa SET valor = ?, data_vencimento = ?, foi_pago = ? "
+                "WHERE despesa_id = ?",
+                (despesa.valor, vencimento.isoformat(), 1 if despesa.foi_pago else 0, despesa.id),
+            )
+        elif despesa.foi_pago:
+            conn.execute("UPDATE parcelas_despesa SET foi_pago = 1 WHERE despesa_id = ?", (despesa.id,))
+
+
+class OrdemServicoRepositorio(_RepositorioLancamentos):
+    _TABELA = "ordens_servico"
+    _COLUNA_VALOR = "valor_total"
+
+    _SELECT = """
+        SELECT id,
+            cliente,
+            descricao,
+            valor_total,
+            data,
+            foi_pago,
+            forma_pagamento,
+            saldo_aberto
+        FROM {tabela}
+        """
+
+    # saldo_aberto não entra: quem o mantém são os triggers do banco
+    _COLUNAS = ("cliente", "descricao", "valor_total", "data", "foi_pago", "forma_pagamento")
+
+    # Limites (em dias) das faixas de aging: até 30, 31-60, 61-90, mais de 90
+    _FAIXAS_AGING = (30, 60, 90)
 
     def criar(self, os_: OrdemServico) -> int:
         sql = """
@@ -189,73 +502,146 @@ class OrdemServicoRepositorio:
         )
         return self.db.executar(sql, params)
 
+    @staticmethod
+    def _de_linha(r) -> OrdemServico:
+        os_ = OrdemServico(
+            id=r[0],
+            cliente=r[1],
+            descricao=r[2],
+            valor_total=r[3],
+            data=date.fromisoformat(r[4]),
+            foi_pago=bool(r[5]),
+            forma_pagamento=FormaPagamento(r[6]) if r[6] else None,
+            saldo_aberto=r[7]
+        )
+        os_.marcar_salvo()
+        return os_
 
     def listar_todas(self) -> List[OrdemServico]:
-        sql = """
-        SELECT id,
-            cliente,
-            descricao,
-            valor_total,
-            data,
-            foi_pago,
-            forma_pagamento
-        FROM ordens_servico
-        """
-        rows = self.db.consultar(sql)
+        return self.listar_por_data()
 
-        ordens: List[OrdemServico] = []
-        for r in rows:
-            ordens.append(
-                OrdemServico(
-                    id=r[0],
-                    cliente=r[1],
-                    descricao=r[2],
-                    valor_total=r[3],
-                    data=date.fromisoformat(r[4]),
-                    foi_pago=bool(r[5]),
-                    forma_pagamento=FormaPagamento(r[6]) if r[6] else None
-                )
-            )
+    def listar_a_receber(self) -> List[OrdemServico]:
+        """Ordens não pagas (só no banco principal: ordens em aberto não são arquivadas)."""
+        sql = self._SELECT.format(tabela=self._TABELA) + " WHERE foi_pago = 0 ORDER BY id"
+        return [self._de_linha(r) for r in self.db.consultar(sql)]
 
-        return ordens
-    
-    def atualizar(self, os_: OrdemServico) -> None:
+    def atualizar(self, os_: OrdemServico, campos: Optional[Iterable[str]] = None) -> bool:
         if os_.id is None:
             raise ValueError("Ordem de serviço precisa ter id para atualizar.")
-        sql = """
-            UPDATE ordens_servico
-            SET cliente = ?,
-                descricao = ?,
-                valor_total = ?,
-                data = ?,
-                foi_pago = ?,
-                forma_pagamento = ?
-            WHERE id = ?
+        if not _atualizar_colunas(self.db, "ordens_servico", self._COLUNAS, os_, campos):
+            return False
+        # Valor ou situação podem ter mudado o saldo (refeito pelos triggers)
+        os_.saldo_aberto = self.db.consultar(
+            "SELECT saldo_aberto FROM ordens_servico WHERE id = ?", (os_.id,)
+        )[0][0]
+        os_.marcar_salvo()
+        return True
+
+    def marcar_pagas(self, ids: Iterable[int], forma_pagamento: FormaPagamento) -> int:
         """
-        params = (
-            os_.cliente,
-            os_.descricao,
-            os_.valor_total,
-            os_.data.isoformat(),
-            1 if os_.foi_pago else 0,
-            os_.forma_pagamento.value if os_.forma_pagamento else None,
-            os_.id,
+        Marca as ordens em aberto com os `ids` como pagas, em um UPDATE só
+        (os triggers zeram o saldo e acertam o resumo). Retorna quantas
+        mudaram.
+        """
+        return self.atualizar_em_lote(
+            ids, {"foi_pago": True, "forma_pagamento": forma_pagamento}, "foi_pago = 0"
         )
-        self.db.executar(sql, params)
 
-
-    def marcar_como_pago(self, os_id: int, forma_pagamento: FormaPagamento) -> None:
+    def aging_em_aberto(self, hoje: date) -> List[AgingCliente]:
+        """
+        Valores em aberto por cliente e faixa de idade, do maior total para o
+        menor, pelo saldo ainda a receber de cada ordem. A idade é comparada
+        pela data (texto ISO) com os limites de cada faixa, e a consulta
+        inteira sai do índice parcial ordens_servico_a_receber: o custo depende das ordens em aberto, não
+        do histórico. Ordens em aberto não são arquivadas, então só o banco
+        principal é lido.
+        """
+        limites = [(hoje - timedelta(days=dias)).isoformat() for dias in self._FAIXAS_AGING]
         sql = """
-            UPDATE ordens_servico
-            SET foi_pago = 1,
-                forma_pagamento = ?
-            WHERE id = ?
+            SELECT cliente,
+                   SUM(CASE WHEN data >= ? THEN saldo_aberto ELSE 0 END),
+                   SUM(CASE WHEN data < ? AND data >= ? THEN saldo_aberto ELSE 0 END),
+                   SUM(CASE WHEN data < ? AND data >= ? THEN saldo_aberto ELSE 0 END),
+                   SUM(CASE WHEN data < ? THEN saldo_aberto ELSE 0 END),
+                   COUNT(*),
+                   MIN(data)
+            FROM ordens_servico
+            WHERE foi_pago = 0
+            GROUP BY cliente
+            ORDER BY SUM(saldo_aberto) DESC, cliente
+            """
+        a30, a60, a90 = limites
+        rows = self.db.consultar(sql, (a30, a30, a60, a60, a90, a90))
+        return [
+            AgingCliente(
+                cliente=r[0], ate_30=r[1], de_31_a_60=r[2], de_61_a_90=r[3], acima_de_90=r[4],
+                quantidade=r[5], mais_antiga=date.fromisoformat(r[6]),
+            )
+            for r in rows
+        ]
+
+
+class PagamentoOSRepositorio:
+    """
+    Pagamentos de ordens de serviço (tabela pagamentos_os). Gravar
+    pagamentos acerta o saldo em aberto das ordens pelos triggers do banco.
+    """
+
+    def __init__(self, db: Database, recebimentos: RecebimentoRepositorio):
+        self.db = db
+        self.recebimentos = recebimentos
+
+    def registrar(self, rec: Recebimento, valores: Dict[int, float]) -> List[PagamentoOS]:
         """
-        fp_val = forma_pagamento.value if forma_pagamento else None
-        self.db.executar(sql, (fp_val, os_id))
+        Grava o recebimento e a parte dele paga a cada ordem de `valores`
+        (ordem_servico_id -> valor) em uma transação só. Ordens ainda sem
+        forma de pagamento ficam com a do recebimento.
+        """
+        with self.db.transacao() as conn:
+            rec.id = self.recebimentos.criar_em(conn, rec)
+            pagamentos = [PagamentoOS(None, os_id, rec.id, valor, rec.data) for os_id, valor in valores.items()]
+            conn.executemany(
+                "INSERT INTO pagamentos_os (ordem_servico_id, recebimento_id, valor, data) VALUES (?, ?, ?, ?)",
+                [(p.ordem_servico_id, p.recebimento_id, p.valor, p.data.isoformat()) for p in pagamentos],
+            )
+            conn.execute(
+                f"UPDATE ordens_servico SET forma_pagamento = ? "
+                f"WHERE forma_pagamento IS NULL AND id IN ({', '.join('?' * len(valores))})",
+                [rec.forma_pagamento.value, *valores],
+            )
+        return pagamentos
+
+    def listar_da_ordem(self, os_id: int) -> List[PagamentoOS]:
+        rows = self.db.consultar(
+            "SELECT id, ordem_servico_id, recebimento_id, valor, data FROM pagamentos_os "
+            "WHERE ordem_servico_id = ? ORDER BY data, id",
+            (os_id,),
+        )
+        return [PagamentoOS(r[0], r[1], r[2], r[3], date.fromisoformat(r[4])) for r in rows]
 
 
 class FuncionarioRepositorio:
+    _SELECT = """
+            SELECT id,
+                   nome,
+                   cpf,
+                   telefone,
+                   cargo,
+                   foto_caminho,
+                   data_admissao,
+                   dia_pagamento,
+                   mes_decimo_terceiro,
+                   mes_ferias,
+                   data_demissao,
+                   salario
+            FROM funcionarios
+        """
+
+    _COLUNAS = (
+        "nome", "cpf", "telefone", "cargo", "foto_caminho", "data_admissao",
+        "dia_pagamento", "mes_decimo_terceiro", "mes_ferias", "data_demissao", "salario",
+    )
+
     def __init__(self, db: Database):
         self.db = db
 
@@ -271,9 +657,10 @@ class FuncionarioRepositorio:
                 dia_pagamento,
                 mes_decimo_terceiro,
                 mes_ferias,
-                data_demissao
+                data_demissao,
+                salario
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         params = (
             func.nome,
@@ -285,79 +672,383 @@ class FuncionarioRepositorio:
             func.dia_pagamento,
             func.mes_decimo_terceiro,
             func.mes_ferias,
-            func.data_demissao.isoformat() if func.data_demissao else None
+            func.data_demissao.isoformat() if func.data_demissao else None,
+            func.salario
         )
         return self.db.executar(sql, params)
 
-    def atualizar(self, func: Funcionario) -> None:
+    def atualizar(self, func: Funcionario, campos: Optional[Iterable[str]] = None) -> bool:
         if func.id is None:
             raise ValueError("Funcionário precisa ter id para atualizar.")
-        sql = """
-            UPDATE funcionarios
-            SET nome = ?,
-                cpf = ?,
-                telefone = ?,
-                cargo = ?,
-                foto_caminho = ?,
-                data_admissao = ?,
-                dia_pagamento = ?,
-                mes_decimo_terceiro = ?,
-                mes_ferias = ?,
-                data_demissao = ?
-            WHERE id = ?
-        """
-        params = (
-            func.nome,
-            func.cpf,
-            func.telefone,
-            func.cargo,
-            func.foto_caminho,
-            func.data_admissao.isoformat(),
-            func.dia_pagamento,
-            func.mes_decimo_terceiro,
-            func.mes_ferias,
-            func.data_demissao.isoformat() if func.data_demissao else None,
-            func.id,
+        return _atualizar_colunas(self.db, "funcionarios", self._COLUNAS, func, campos)
+
+    @staticmethod
+    def _de_linha(r) -> Funcionario:
+        func = Funcionario(
+            id=r[0],
+            nome=r[1],
+            cpf=r[2],
+            telefone=r[3],
+            cargo=r[4],
+            foto_caminho=r[5],
+            data_admissao=date.fromisoformat(r[6]),
+            dia_pagamento=r[7],
+            mes_decimo_terceiro=r[8],
+            mes_ferias=r[9],
+            data_demissao=date.fromisoformat(r[10]) if r[10] else None,
+            salario=r[11]
         )
-        self.db.executar(sql, params)
+        func.marcar_salvo()
+        return func
 
     def listar_todos(self) -> List[Funcionario]:
-        sql = """
-            SELECT id,
-                   nome,
-                   cpf,
-                   telefone,
-                   cargo,
-                   foto_caminho,
-                   data_admissao,
-                   dia_pagamento,
-                   mes_decimo_terceiro,
-                   mes_ferias,
-                   data_demissao
-            FROM funcionarios
+        rows = self.db.consultar(self._SELECT)
+        return [self._de_linha(r) for r in rows]
+
+    def obter_por_id(self, func_id: int) -> Optional[Funcionario]:
+        rows = self.db.consultar(self._SELECT + " WHERE id = ?", (func_id,))
+        return self._de_linha(rows[0]) if rows else None
+
+
+class FolhaRepositorio:
+    """
+    Registro das despesas lançadas pela folha (tabela folha_lancamentos),
+    uma por funcionário, competência ("AAAA-MM") e tipo de pagamento.
+    """
+
+    def __init__(self, db: Database, despesas: DespesaRepositorio):
+        self.db = db
+        self.despesas = despesas
+
+    def lancados(self, competencia: str) -> Dict[Tuple[int, str], int]:
+        """(funcionario_id, tipo) -> despesa_id do que já foi lançado na competência."""
+        rows = self.db.consultar(
+            "SELECT funcionario_id, tipo, despesa_id FROM folha_lancamentos WHERE competencia = ?",
+            (competencia,),
+        )
+        return {(r[0], r[1]): r[2] for r in rows}
+
+    def lancar(self, competencia: str, itens: Iterable[Tuple[int, str, Despesa]]) -> List[Despesa]:
         """
-        rows = self.db.consultar(sql)
-        funcionarios = []
-        for r in rows:
-            funcionarios.append(
-                Funcionario(
-                    id=r[0],
-                    nome=r[1],
-                    cpf=r[2],
-                    telefone=r[3],
-                    cargo=r[4],
-                    foto_caminho=r[5],
-                    data_admissao=date.fromisoformat(r[6]),
-                    dia_pagamento=r[7],
-                    mes_decimo_terceiro=r[8],
-                    mes_ferias=r[9],
-                    data_demissao=date.fromisoformat(r[10]) if r[10] else None
+        Grava as despesas de `itens` (funcionario_id, tipo, despesa) em uma
+        transação só. Cada item primeiro reserva a sua chave em
+        folha_lancamentos; se ela já existia, o item foi lançado antes (por
+        esta ou outra execução) e é pulado. Retorna as despesas gravadas.
+        """
+        gravadas = []
+        with self.db.transacao() as conn:
+            for funcionario_id, tipo, despesa in itens:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO folha_lancamentos (funcionario_id, competencia, tipo) VALUES (?, ?, ?)",
+                    (funcionario_id, competencia, tipo),
                 )
+                if cur.rowcount == 0:
+                    continue
+                chave = cur.lastrowid
+                despesa.id = self.despesas.criar_em(conn, despesa)
+                conn.execute("UPDATE folha_lancamentos SET despesa_id = ? WHERE id = ?", (despesa.id, chave))
+                gravadas.append(despesa)
+        return gravadas
+
+
+class ResumoMensalRepositorio:
+    """
+    Leitura da tabela resumo_mensal (mantida por triggers no banco):
+    poucas linhas por mês, em vez de todos os lançamentos.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def listar(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        entidade: Optional[str] = None,
+    ) -> List[ResumoMes]:
+        condicoes = []
+        params = []
+        if data_inicio:
+            condicoes.append("mes >= ?")
+            params.append(data_inicio.isoformat()[:7])
+        if data_fim:
+            condicoes.append("mes <= ?")
+            params.append(data_fim.isoformat()[:7])
+        if entidade:
+            condicoes.append("entidade = ?")
+            params.append(entidade)
+        sql = "SELECT mes, entidade, forma_pagamento, pago, quantidade, total FROM resumo_mensal"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        rows = self.db.consultar(sql + " ORDER BY mes", params)
+        return [
+            ResumoMes(
+                mes=r[0],
+                entidade=r[1],
+                forma_pagamento=FormaPagamento(r[2]) if r[2] else None,
+                pago=bool(r[3]),
+                quantidade=r[4],
+                total=r[5],
+            )
+            for r in rows
+        ]
+
+
+class ExtratoRepositorio:
+    """
+    Extrato unificado (view `lancamentos`): recebimentos, despesas e ordens
+    de serviço numa lista só, lida em páginas e ordenada pelo banco.
+
+    O SQLite não usa os índices das tabelas para ordenar o resultado de uma
+    view com UNION ALL; por isso cada página consulta as tabelas em separado
+    (com as mesmas colunas da view, ver sql_lancamentos), cada uma dando no
+    máximo `limite` linhas pelo índice da coluna ordenada, e só essas são
+    juntadas e ordenadas. A paginação é por chave: cada página continua
+    depois da última linha da anterior, sem OFFSET.
+
+    Na ordem por data, o saldo acumulado vem calculado (SUM ... OVER) a
+    partir do saldo em que a página anterior parou.
+    """
+
+    # Colunas pelas quais o extrato pode ser ordenado. Empates são
+    # desfeitos por tipo (ordem das fontes) e id.
+    ORDENAVEIS = ("tipo", "id", "data", "descricao", "valor")
+
+    _ORDEM = {fonte[1]: n for n, fonte in enumerate(FONTES_LANCAMENTOS)}
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def _depois_de(self, ordem: int, apos: Optional[LancamentoExtrato], coluna: str, decrescente: bool):
+        """Condição "vem depois de `apos`" para a fonte `ordem`, na ordem pedida."""
+        if apos is None:
+            return "", []
+        ordem_apos = self._ORDEM[apos.tipo]
+        depois = "<" if decrescente else ">"
+        # A fonte inteira vem depois (ou antes) da fonte de `apos`
+        fonte_depois = ordem < ordem_apos if decrescente else ordem > ordem_apos
+        if coluna == "tipo":
+            if ordem == ordem_apos:
+                return f" AND id {depois} ?", [apos.id]
+            return ("", []) if fonte_depois else (" AND 0", [])
+        valor = _valor_coluna(getattr(apos, coluna))
+        if ordem == ordem_apos:
+            # O primeiro termo, simples, deixa o SQLite começar pelo índice
+            return f" AND {coluna} {depois}= ? AND ({coluna}, id) {depois} (?, ?)", [valor, valor, apos.id]
+        if fonte_depois:
+            return f" AND {coluna} {depois}= ?", [valor]
+        return f" AND {coluna} {depois} ?", [valor]
+
+    def pagina(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        apos: Optional[LancamentoExtrato] = None,
+        saldo_inicial: float = 0.0,
+        limite: int = 500,
+        ordenar_por: str = "data",
+        decrescente: bool = False,
+    ) -> List[LancamentoExtrato]:
+        """
+        Até `limite` linhas do extrato entre as datas, ordenadas por
+        `ordenar_por` (uma de ORDENAVEIS). `apos` é a última linha da página
+        anterior; sem ela, a leitura começa do início.
+
+        Só na ordem por data as linhas trazem saldo (nas outras, None).
+        `saldo_inicial` é o saldo de onde a leitura começa: na ordem
+        crescente, o acumulado antes do período; na decrescente, o
+        acumulado no fim dele. Com `apos`, vem do saldo dela.
+        """
+        if ordenar_por not in self.ORDENAVEIS:
+            raise ValueError(f"Coluna de ordenação inválida: {ordenar_por}")
+        por_data = ordenar_por == "data"
+        if apos is not None and por_data:
+            saldo_inicial = apos.saldo - apos.fluxo if decrescente else apos.saldo
+
+        anos = [
+            ano for ano in self.db.anos_arquivados()
+            if (data_inicio is None or ano >= data_inicio.year)
+            and (data_fim is None or ano <= data_fim.year)
+        ]
+        filtro, params_filtro = _filtro_datas("data", data_inicio, data_fim)
+        restantes = []
+        if por_data:
+            # Por data, uma leitura anexa até MAX_ANEXOS anos seguidos; os
+            # demais ficam para outra, que começa onde esta termina
+            if apos is not None:
+                anos = [a for a in anos if (a <= apos.data.year if decrescente else a >= apos.data.year)]
+            if decrescente:
+                anos.reverse()
+            lotes, restantes = [anos[:MAX_ANEXOS]], anos[MAX_ANEXOS:]
+            if restantes and decrescente:
+                filtro += " AND data > ?"
+                params_filtro.append(date(restantes[0], 12, 31).isoformat())
+            elif restantes:
+                filtro += " AND data < ?"
+                params_filtro.append(date(restantes[0], 1, 1).isoformat())
+        else:
+            # Nas outras ordens, cada lote de arquivos dá as suas primeiras
+            # linhas, e a página sai da junção dos lotes
+            lotes = [anos[i:i + MAX_ANEXOS] for i in range(0, len(anos), MAX_ANEXOS)] or [[]]
+
+        sentido = " DESC" if decrescente else ""
+        chave = [] if ordenar_por == "tipo" else [ordenar_por]
+        ordem_fonte = ", ".join(c + sentido for c in chave + ["id"])
+        ordem_total = ", ".join(c + sentido for c in chave + ["ordem", "id"])
+        if not por_data:
+            saldo = "NULL"
+        elif decrescente:
+            saldo = (f"? - COALESCE(SUM(fluxo) OVER (ORDER BY {ordem_total} "
+                     f"ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0)")
+        else:
+            saldo = f"? + SUM(fluxo) OVER (ORDER BY {ordem_total} ROWS UNBOUNDED PRECEDING)"
+
+        rows = []
+        for n, lote in enumerate(lotes):
+            partes = []
+            params = [saldo_inicial] if por_data else []
+            for ordem, fonte in enumerate(FONTES_LANCAMENTOS):
+                condicao, params_chave = self._depois_de(ordem, apos, ordenar_por, decrescente)
+                origens = ([fonte[0]] if n == 0 else []) + [f"arq_{ano}.{fonte[0]}" for ano in lote]
+                for origem in origens:
+                    partes.append(f"""
+                        SELECT * FROM (
+                            SELECT * FROM ({sql_lancamentos(ordem, origem)})
+                            WHERE 1=1{filtro}{condicao}
+                            ORDER BY {ordem_fonte} LIMIT ?)""")
+                    params += [*params_filtro, *params_chave, limite]
+            sql = f"""
+                SELECT ordem, id, data, descricao, valor, pago, {saldo}
+                FROM ({" UNION ALL ".join(partes)})
+                ORDER BY {ordem_total}
+                LIMIT ?"""
+            with self.db.conexao(lote) as conn:
+                rows += conn.execute(sql, params + [limite]).fetchall()
+        if len(lotes) > 1:
+            posicao = {"id": 1, "descricao": 3, "valor": 4}.get(ordenar_por)
+            rows.sort(key=lambda r: (r[posicao] if posicao else 0, r[0], r[1]), reverse=decrescente)
+            del rows[limite:]
+
+        linhas = [
+            LancamentoExtrato(
+                tipo=FONTES_LANCAMENTOS[r[0]][1],
+                id=r[1],
+                data=date.fromisoformat(r[2]),
+                descricao=r[3],
+                valor=r[4],
+                foi_pago=bool(r[5]),
+                saldo=r[6],
             )
-        return funcionarios
+            for r in rows
+        ]
+        if restantes and len(linhas) < limite:
+            if linhas:
+                saldo_inicial = linhas[-1].saldo - linhas[-1].fluxo if decrescente else linhas[-1].saldo
+            if decrescente:
+                data_fim = date(restantes[0], 12, 31)
+            else:
+                data_inicio = date(restantes[0], 1, 1)
+            linhas += self.pagina(data_inicio, data_fim, None, saldo_inicial, limite - len(linhas),
+                                  ordenar_por, decrescente)
+        return linhas
 
 
+class BuscaRepositorio:
+    """
+    Busca textual sobre despesas (descrição) e ordens de serviço
+    (cliente e descrição), usando as tabelas FTS5 do banco.
+    Se o SQLite não tiver FTS5, cai para uma busca com LIKE. Os arquivos
+    anuais não têm tabelas FTS5: neles a busca é sempre a do LIKE, e os
+    resultados vêm depois dos do banco principal.
+    """
 
+    def __init__(self, db: Database):
+        self.db = db
 
+    @staticmethod
+    def _consulta_fts(texto: str) -> str:
+        """
+        Converte o texto digitado em uma consulta FTS5: cada termo vira
+        uma busca por prefixo, e todos os termos precisam aparecer.
+        """
+        termos = texto.split()
+        return " ".join('"' + t.replace('"', '""') + '"*' for t in termos)
+
+    def buscar(
+        self,
+        texto: str,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        limite: Optional[int] = 50,
+    ) -> List[ResultadoBusca]:
+        if not texto.strip():
+            return []
+        if not self.db.fts_disponivel:
+            return self._buscar_like(texto, data_inicio, data_fim, limite)
+
+        consulta = self._consulta_fts(texto)
+        filtro_d, params_d = _filtro_datas("d.data", data_inicio, data_fim)
+        filtro_o, params_o = _filtro_datas("o.data", data_inicio, data_fim)
+
+        # bm25: quanto menor, mais relevante. Na OS o cliente pesa mais.
+        sql = f"""
+            SELECT 'Despesa', d.id, d.data, d.descricao, d.valor,
+                   bm25(despesas_fts) AS relevancia
+            FROM despesas_fts
+            JOIN despesas d ON d.id = despesas_fts.rowid
+            WHERE despesas_fts MATCH ?{filtro_d}
+            UNION ALL
+            SELECT 'Nota de serviço', o.id, o.data, o.cliente || ' - ' || o.descricao, o.valor_total,
+                   bm25(ordens_servico_fts, 2.0, 1.0) AS relevancia
+            FROM ordens_servico_fts
+            JOIN ordens_servico o ON o.id = ordens_servico_fts.rowid
+            WHERE ordens_servico_fts MATCH ?{filtro_o}
+            ORDER BY relevancia, 3 DESC
+        """
+        params = [consulta, *params_d, consulta, *params_o]
+        if limite is not None:
+            sql += " LIMIT ?"
+            params.append(limite)
+
+        resultados = [self._para_resultado(r) for r in self.db.consultar(sql, params)]
+        if limite is None or len(resultados) < limite:
+            resultados += self._buscar_like(
+                texto, data_inicio, data_fim,
+                None if limite is None else limite - len(resultados), principal=False,
+            )
+        return resultados
 
-        
\ No newline at end of file
+    def _buscar_like(self, texto, data_inicio, data_fim, limite, principal=True) -> List[ResultadoBusca]:
+        """
+        Fallback sem FTS5: todos os termos precisam aparecer (sem ranking
+        real). Com `principal` falso, procura só nos arquivos anuais.
+        """
+        termos = normalizar_texto(texto).split()
+        resultados = []
+
+        filtro_d, params_d = _filtro_datas("d.data", data_inicio, data_fim)
+        sql_d = "SELECT 'Despesa', d.id, d.data, d.descricao, d.valor, 0 FROM {tabela} d WHERE 1=1" + filtro_d
+        filtro_o, params_o = _filtro_datas("o.data", data_inicio, data_fim)
+        sql_o = ("SELECT 'Nota de serviço', o.id, o.data, o.cliente || ' - ' || o.descricao, "
+                 "o.valor_total, 0 FROM {tabela} o WHERE 1=1" + filtro_o)
+
+        rows = self.db.consultar_por_data(sql_d, "despesas", params_d, data_inicio, data_fim, principal=principal)
+        rows += self.db.consultar_por_data(sql_o, "ordens_servico", params_o, data_inicio, data_fim, principal=principal)
+        for r in rows:
+            alvo = normalizar_texto(r[3])
+            if all(t in alvo for t in termos):
+                resultados.append(self._para_resultado(r))
+
+        resultados.sort(key=lambda x: x.data, reverse=True)
+        return resultados[:limite] if limite is not None else resultados
+
+    @staticmethod
+    def _para_resultado(r) -> ResultadoBusca:
+        return ResultadoBusca(
+            tipo=r[0],
+            id=r[1],
+            data=date.fromisoformat(r[2]),
+            descricao=r[3],
+            valor=r[4],
+            relevancia=r[5],
+        )
@@ -0,0 +1,86 @@
+"""
+Módulo de saldos por data.
+
+Fornece um índice do fluxo líquido diário (recebimentos - despesas) que
+responde "saldo em 31/03" e "saldo no período" em tempo logarítmico,
+usando uma árvore de Fenwick (soma de prefixos). Não conhece banco de
+dados nem interface: quem usa o índice informa os fluxos de cada dia.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IndiceSaldos:
+    """
+    Árvore de Fenwick sobre o fluxo líquido de cada dia.
+
+    A posição de um dia é a distância (em dias) até o primeiro dia coberto.
+    Um lançamento fora da faixa coberta faz a árvore ser refeita, com folga
+    para os dois lados, de modo que o custo fica amortizado.
+    """
+
+    # Folga mínima (dias) adicionada ao refazer a árvore
+    FOLGA_DIAS = 366
+
+    def __init__(self, fluxos: Iterable[Tuple[date, float]] = ()):
+        self._por_dia: Dict[int, float] = {}   # ordinal do dia -> fluxo líquido
+        self._base = 0                          # ordinal da posição 1
+        self._arvore = [0.0]                    # 1-indexada
+        for dia, valor in fluxos:
+            o = dia.toordinal()
+            self._por_dia[o] = self._por_dia.get(o, 0.0) + valor
+        if self._por_dia:
+            self._reconstruir(min(self._por_dia), max(self._por_dia))
+
+    def __len__(self):
+        return len(self._por_dia)
+
+    def _reconstruir(self, primeiro: int, ultimo: int) -> None:
+        """Refaz a árvore cobrindo [primeiro, ultimo] com folga, em O(n)."""
+        folga = max(self.FOLGA_DIAS, (ultimo - primeiro) // 2)
+        self._base = primeiro - folga
+        tamanho = ultimo - self._base + 1 + folga
+        arvore = [0.0] * (tamanho + 1)
+        for o, valor in self._por_dia.items():
+            arvore[o - self._base + 1] += valor
+        for i in range(1, tamanho + 1):
+            pai = i + (i & -i)
+            if pai <= tamanho:
+                arvore[pai] += arvore[i]
+        self._arvore = arvore
+
+    def adicionar(self, dia: date, valor: float) -> None:
+        """Soma `valor` ao fluxo do dia (negativo para despesas ou estornos)."""
+        o = dia.toordinal()
+        self._por_dia[o] = self._por_dia.get(o, 0.0) + valor
+        i = o - self._base + 1
+        tamanho = len(self._arvore) - 1
+        if i < 1 or i > tamanho:
+            self._reconstruir(min(self._por_dia), max(self._por_dia))
+            return
+        while i <= tamanho:
+            self._arvore[i] += valor
+            i += i & -i
+
+    def saldo_em(self, dia: Optional[date] = None) -> float:
+        """Saldo acumulado até o fim do dia (inclusive). None = saldo total."""
+        tamanho = len(self._arvore) - 1
+        i = tamanho if dia is None else min(dia.toordinal() - self._base + 1, tamanho)
+        total = 0.0
+        while i > 0:
+            total += self._arvore[i]
+            i -= i & -i
+        return total
+
+    def fluxos(self, inicio: date, dias: int) -> List[float]:
+        """Fluxo líquido de cada um dos `dias` dias a partir de `inicio`."""
+        o = inicio.toordinal()
+        return [self._por_dia.get(o + i, 0.0) for i in range(dias)]
+
+    def saldo_periodo(self, inicio: Optional[date] = None, fim: Optional[date] = None) -> float:
+        """Fluxo líquido entre `inicio` e `fim` (inclusive; None = sem limite)."""
+        total = self.saldo_em(fim)
+        if inicio is not None:
+            total -= self.saldo_em(inicio - timedelta(days=1))
+        return total
@@ -9,17 +9,35 @@ diretamente com o banco de dados.
 """
 
 
+from calendar import monthrange
 from datetime import date, timedelta
-from typing import Optional, List
+from typing import Dict, Iterable, Iterator, Optional, List, Set
 
+import eventos
+from busca import IndiceNGramas
 from database import Database
-from models import Recebimento, Despesa, OrdemServico, FormaPagamento, Funcionario
+from eventos import BarramentoEventos, EventoAlteracao
+import previsao
+from folha import CalendarioFolha, valor_obrigacao
+from fluxo import (
+    FOLHA, ORDEM, PARCELAS, FluxoPrevisto, lancado_da_compra, previsto_da_folha, previsto_da_ordem,
+    previsto_das_parcelas,
+)
+from models import Recebimento, Despesa, OrdemServico, FormaPagamento, Funcionario, ResultadoBusca, ResumoMes, LancamentoExtrato, AlertasVencimento, AgingCliente, ObrigacoesMes, LancamentoFolha, Parcela, TotaisDespesasMes, PagamentoOS, ProjecaoFluxo, PrevisaoMensal
 from repositories import (
     RecebimentoRepositorio,
     DespesaRepositorio,
+    ParcelaRepositorio,
     OrdemServicoRepositorio,
-    FuncionarioRepositorio
+    PagamentoOSRepositorio,
+    FuncionarioRepositorio,
+    BuscaRepositorio,
+    ResumoMensalRepositorio,
+    ExtratoRepositorio,
+    FolhaRepositorio
 )
+from saldos import IndiceSaldos
+from vencimentos import AgendaVencimentos, dividir_em_parcelas
 
 
 class SistemaFinanceiro:
@@ -63,9 +81,76 @@ class SistemaFinanceiro:
         # Repositórios especializados para cada tipo de entidade
         self.recebimentos_repo = RecebimentoRepositorio(self.db)
         self.despesas_repo = DespesaRepositorio(self.db)
+        self.parcelas_repo = ParcelaRepositorio(self.db, self.despesas_repo)
         self.os_repo = OrdemServicoRepositorio(self.db)
+        self.pagamentos_os_repo = PagamentoOSRepositorio(self.db, self.recebimentos_repo)
         self.func_repo = FuncionarioRepositorio(self.db)
+        self.busca_repo = BuscaRepositorio(self.db)
+        self.resumo_repo = ResumoMensalRepositorio(self.db)
+        self.extrato_repo = ExtratoRepositorio(self.db)
+        self.folha_repo = FolhaRepositorio(self.db, self.despesas_repo)
+
+        # Índice de busca de funcionários (montado na primeira busca)
+        self._indice_funcionarios: Optional[IndiceNGramas] = None
+
+        # Saldo acumulado por dia (montado na primeira consulta de saldo)
+        self._indice_saldos: Optional[IndiceSaldos] = None
+
+        # Parcelas a pagar por vencimento (montada na primeira consulta de alertas)
+        self._agenda_vencimentos: Optional[AgendaVencimentos] = None
 
+        # Obrigações da folha por mês (refeito depois de mudar um funcionário)
+        self._calendario_folha: Optional[CalendarioFolha] = None
+
+        # Entradas e saídas previstas por dia (montado na primeira projeção);
+        # a folha prevista é refeita quando o período ou os funcionários mudam
+        self._fluxo_previsto: Optional[FluxoPrevisto] = None
+        self._folha_prevista: Optional[tuple] = None
+
+        # Versão dos totais mensais: muda a cada recebimento/despesa gravado.
+        # As previsões calculadas valem enquanto a versão não muda.
+        self._versao_totais = 0
+        self._previsoes: Dict[tuple, PrevisaoMensal] = {}
+        self._versao_previsoes = 0
+
+        # Avisos de alteração para a interface (ver eventos.py)
+        self.eventos = BarramentoEventos()
+
+    def _publicar(self, entidade: str, acao: str, atual, anterior=None) -> None:
+        self._atualizar_indice_saldos(entidade, atual, anterior)
+        if entidade in (eventos.RECEBIMENTO, eventos.DESPESA):
+            self._versao_totais += 1
+        if entidade == eventos.DESPESA:
+            self._atualizar_parcelas_a_pagar(atual, anterior)
+        if entidade == eventos.ORDEM_SERVICO and self._fluxo_previsto is not None:
+            self._fluxo_previsto.substituir((ORDEM, atual.id), previsto_da_ordem(atual))
+        if entidade == eventos.FUNCIONARIO:
+            self._calendario_folha = None
+            self._folha_prevista = None
+        self.eventos.publicar(
+            EventoAlteracao(entidade=entidade, id=atual.id, acao=acao, anterior=anterior, atual=atual)
+        )
+
+    def _atualizar(self, repo, entidade: str, modelo, gravar=None) -> bool:
+        """
+        Grava só os campos que mudaram e publica o evento. Um modelo lido do
+        banco já sabe o que mudou; um montado do zero é comparado com o
+        registro gravado. Retorna False se não havia nada para gravar (nesse
+        caso não há escrita nem evento). `gravar(modelo, campos)` substitui
+        repo.atualizar quando a gravação envolve outras tabelas.
+        """
+        if modelo.rastreado:
+            anterior = modelo.como_salvo()
+            campos = modelo.campos_alterados
+        else:
+            anterior = repo.obter_por_id(modelo.id)
+            campos = modelo.campos_diferentes(anterior) if anterior is not None else None
+        if campos is not None and not campos:
+            return False
+        if not (gravar or repo.atualizar)(modelo, campos):
+            return False
+        self._publicar(entidade, eventos.ATUALIZADO, modelo, anterior)
+        return True
 
 
      # ========= RECEBIMENTOS =========
@@ -92,7 +177,9 @@ class SistemaFinanceiro:
             forma_pagamento=forma_pagamento,
             comprovante_caminho=comprovante_caminho,
         )
-        return self.recebimentos_repo.criar(rec)
+        rec.id = self.recebimentos_repo.criar(rec)
+        self._publicar(eventos.RECEBIMENTO, eventos.CRIADO, rec)
+        return rec.id
 
     def listar_recebimentos(self) -> List[Recebimento]:
         """
@@ -127,7 +214,9 @@ class SistemaFinanceiro:
             data_vencimento=None,
             comprovante_caminho=comprovante_caminho,
         )
-        return self.despesas_repo.criar(desp)
+        desp.id = self.despesas_repo.criar(desp)
+        self._publicar(eventos.DESPESA, eventos.CRIADO, desp)
+        return desp.id
 
     def registrar_despesa_a_prazo(
         self,
@@ -153,8 +242,54 @@ class SistemaFinanceiro:
             eh_a_prazo=True,
             data_vencimento=data_vencimento,
             comprovante_caminho=comprovante_caminho,
+            foi_pago=False,
         )
-        return self.despesas_repo.criar(desp)
+        return self._gravar_com_parcelas(desp, [(data_vencimento, valor)])
+
+    def registrar_despesa_parcelada(
+        self,
+        valor: float,
+        descricao: str,
+        forma_pagamento: FormaPagamento,
+        primeiro_vencimento: date,
+        quantidade_parcelas: int,
+        data_lancamento: Optional[date] = None,
+        comprovante_caminho: Optional[str] = None,
+    ) -> int:
+        """
+        Registra uma compra a prazo dividida em parcelas mensais (boleto,
+        crédito parcelado). `valor` é o total da compra, lançado na data de
+        lançamento (competência); cada parcela vence um mês depois da
+        anterior, a partir de `primeiro_vencimento` (caixa). Despesa e
+        parcelas são gravadas juntas, em uma transação.
+        """
+        desp = Despesa(
+            id=None,
+            valor=valor,
+            data=data_lancamento or date.today(),
+            forma_pagamento=forma_pagamento,
+            descricao=descricao,
+            eh_a_prazo=True,
+            comprovante_caminho=comprovante_caminho,
+            foi_pago=False,
+        )
+        return self._gravar_com_parcelas(
+            desp, dividir_em_parcelas(valor, quantidade_parcelas, primeiro_vencimento)
+        )
+
+    def _gravar_com_parcelas(self, desp: Despesa, divisao) -> int:
+        """Grava a despesa a prazo com as parcelas (vencimento, valor) de `divisao`."""
+        parcelas = [
+            Parcela(id=None, despesa_id=None, numero=n, valor=valor, data_vencimento=vencimento,
+                    quantidade=len(divisao), descricao=desp.descricao,
+                    forma_pagamento=desp.forma_pagamento)
+            for n, (vencimento, valor) in enumerate(divisao, 1)
+        ]
+        # Na despesa, o vencimento é o da próxima parcela em aberto
+        desp.data_vencimento = parcelas[0].data_vencimento
+        self.parcelas_repo.criar_com_despesa(desp, parcelas)
+        self._publicar(eventos.DESPESA, eventos.CRIADO, desp)
+        return desp.id
 
     def listar_despesas(self) -> List[Despesa]:
         """
@@ -184,8 +319,11 @@ class SistemaFinanceiro:
             data=data or date.today(),
             foi_pago= foi_pago,
             forma_pagamento=forma_pagamento,
+            saldo_aberto=0.0 if foi_pago else valor_total,
         )
-        return self.os_repo.criar(os_)
+        os_.id = self.os_repo.criar(os_)
+        self._publicar(eventos.ORDEM_SERVICO, eventos.CRIADO, os_)
+        return os_.id
 
     def listar_ordens_servico(self) -> List[OrdemServico]:
         """
@@ -237,20 +375,7 @@ class SistemaFinanceiro:
         Returns:
             Lista de recebimentos filtrados
         """
-        recebimentos = self.listar_recebimentos()
-        
-        if data_inicio is None and data_fim is None:
-            return recebimentos
-        
-        resultado = []
-        for r in recebimentos:
-            if data_inicio and r.data < data_inicio:
-                continue
-            if data_fim and r.data  > data_fim:
-                continue
-            resultado.append(r)
-        
-        return resultado
+        return self.recebimentos_repo.listar_por_data(data_inicio, data_fim)
 
     def listar_despesas_por_data(
         self, 
@@ -267,20 +392,7 @@ class SistemaFinanceiro:
         Returns:
             Lista de despesas filtradas
         """
-        despesas = self.listar_despesas()
-        
-        if data_inicio is None and data_fim is None:
-            return despesas
-        
-        resultado = []
-        for d in despesas:
-            if data_inicio and d.data < data_inicio:
-                continue
-            if data_fim and d.data > data_fim:
-                continue
-            resultado.append(d)
-        
-        return resultado
+        return self.despesas_repo.listar_por_data(data_inicio, data_fim)
 
     def listar_ordens_servico_por_data(
         self, 
@@ -297,20 +409,33 @@ class SistemaFinanceiro:
         Returns:
             Lista de ordens de serviço filtradas
         """
-        ordens = self.listar_ordens_servico()
-        
-        if data_inicio is None and data_fim is None:
-            return ordens
-        
-        resultado = []
-        for o in ordens:
-            if data_inicio and o.data < data_inicio:
-                continue
-            if data_fim and o.data > data_fim:
-                continue
-            resultado.append(o)
-        
-        return resultado
+        return self.os_repo.listar_por_data(data_inicio, data_fim)
+
+    # ========= BUSCA TEXTUAL =========
+
+    def buscar(
+        self,
+        texto: str,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        limite: Optional[int] = 50,
+    ) -> List[ResultadoBusca]:
+        """
+        Busca despesas (pela descrição) e ordens de serviço (pelo cliente
+        ou descrição) que contenham o texto, ignorando acentos. Cada termo
+        é buscado como prefixo ("corr" encontra "correia").
+
+        Args:
+            texto: Texto digitado pelo usuário.
+            data_inicio: Data inicial (inclusive). Se None, sem limite inferior.
+            data_fim: Data final (inclusive). Se None, sem limite superior.
+            limite: Máximo de resultados. Se None, retorna todos.
+
+        Returns:
+            Resultados das duas entidades, do mais relevante para o menos.
+            Anos arquivados (ver arquivar_ano) ficam fora da busca.
+        """
+        return self.busca_repo.buscar(texto, data_inicio, data_fim, limite)
 
     # ========= FUNÇÕES DE APOIO / RESUMO =========
 
@@ -319,24 +444,496 @@ class SistemaFinanceiro:
         Calcula o saldo simples do sistema:
         total de recebimentos - total de despesas.
         """
-        total_recebimentos = sum(r.valor for r in self.listar_recebimentos())
-        total_despesas = sum(d.valor for d in self.listar_despesas())
-        return total_recebimentos - total_despesas
-    
+        sinais = {eventos.RECEBIMENTO: 1, eventos.DESPESA: -1}
+        return sum(sinais.get(r.entidade, 0) * r.total for r in self.resumo_mensal())
+
+    def resumo_mensal(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        entidade: Optional[str] = None,
+    ) -> List[ResumoMes]:
+        """
+        Totais por mês, entidade (eventos.RECEBIMENTO, DESPESA ou
+        ORDEM_SERVICO), forma de pagamento e situação, lidos da tabela
+        resumo_mensal. As datas valem pelo mês: o mês de data_inicio e o de
+        data_fim entram inteiros.
+        """
+        return self.resumo_repo.listar(data_inicio, data_fim, entidade)
+
+    def verificar_resumo_mensal(self, corrigir: bool = False) -> List[tuple]:
+        """
+        Confere a tabela resumo_mensal contra os lançamentos. Retorna as
+        chaves divergentes (vazia = consistente); com corrigir=True, havendo
+        divergência, a tabela é refeita do zero.
+        """
+        divergentes = self.db.verificar_resumo_mensal()
+        if divergentes and corrigir:
+            self.db.reconstruir_resumo_mensal()
+            self._versao_totais += 1
+        return divergentes
+
+    # ========= PREVISÃO MENSAL =========
+
+    def prever_totais_mensais(
+        self,
+        entidade: str,
+        meses: int = 6,
+        janela: int = 3,
+        alfa: float = 0.3,
+        hoje: Optional[date] = None,
+    ) -> PrevisaoMensal:
+        """
+        Previsão dos totais mensais de recebimentos ou despesas (entidade
+        eventos.RECEBIMENTO ou DESPESA) para `meses` meses a partir do mês
+        atual, com a média móvel de `janela` meses, o índice sazonal e a
+        suavização exponencial (fator `alfa`) do histórico (ver previsao.py).
+        O histórico vai até o mês passado e vem da tabela resumo_mensal. O
+        resultado fica guardado até um recebimento ou despesa ser gravado.
+        """
+        if entidade not in (eventos.RECEBIMENTO, eventos.DESPESA):
+            raise ValueError(f"Previsão não disponível para {entidade}.")
+        if meses < 1:
+            raise ValueError("A previsão deve ter pelo menos 1 mês.")
+        hoje = hoje or date.today()
+        if self._versao_previsoes != self._versao_totais:
+            self._previsoes.clear()
+            self._versao_previsoes = self._versao_totais
+        chave = (entidade, meses, janela, alfa, hoje.year, hoje.month)
+        if chave not in self._previsoes:
+            self._previsoes[chave] = self._calcular_previsao(entidade, meses, janela, alfa, hoje)
+        return self._previsoes[chave]
+
+    def _calcular_previsao(self, entidade, meses, janela, alfa, hoje) -> PrevisaoMensal:
+        totais: Dict[str, float] = {}
+        for linha in self.resumo_repo.listar(data_fim=hoje.replace(day=1) - timedelta(days=1), entidade=entidade):
+            totais[linha.mes] = totais.get(linha.mes, 0.0) + linha.total
+        atual = hoje.year * 12 + hoje.month - 1
+        if totais:
+            primeiro = min(totais)
+            inicio = int(primeiro[:4]) * 12 + int(primeiro[5:7]) - 1
+        else:
+            inicio = atual
+        def rotulo(n):
+            return f"{n // 12:04d}-{n % 12 + 1:02d}"
+
+        historico = [rotulo(n) for n in range(inicio, atual)]
+        valores = [totais.get(m, 0.0) for m in historico]
+        indice, suavizado, previstos = previsao.prever(inicio % 12 + 1, valores, meses, alfa)
+        return PrevisaoMensal(
+            entidade=entidade,
+            meses=historico,
+            valores=valores,
+            media_movel=previsao.media_movel(valores, janela),
+            suavizado=suavizado,
+            indice_sazonal=indice,
+            meses_previstos=[rotulo(n) for n in range(atual, atual + meses)],
+            previstos=previstos,
+        )
+
+    # ========= SALDO POR DATA =========
+
+    def _obter_indice_saldos(self) -> IndiceSaldos:
+        if self._indice_saldos is None:
+            fluxos = self.recebimentos_repo.totais_por_dia()
+            fluxos += [(dia, -total) for dia, total in self.despesas_repo.totais_por_dia()]
+            self._indice_saldos = IndiceSaldos(fluxos)
+        return self._indice_saldos
+
+    def _atualizar_indice_saldos(self, entidade: str, atual, anterior) -> None:
+        """Leva ao índice de saldos a diferença de um recebimento/despesa gravado."""
+        if self._indice_saldos is None:
+            return
+        sinal = {eventos.RECEBIMENTO: 1, eventos.DESPESA: -1}.get(entidade)
+        if sinal is None:
+            return
+        if anterior is not None:
+            self._indice_saldos.adicionar(anterior.data, -sinal * anterior.valor)
+        self._indice_saldos.adicionar(atual.data, sinal * atual.valor)
+
+    def saldo_em(self, data: date) -> float:
+        """Saldo (recebimentos - despesas) acumulado até o fim de `data`."""
+        return self._obter_indice_saldos().saldo_em(data)
+
+    def saldo_periodo(self, data_inicio: Optional[date] = None, data_fim: Optional[date] = None) -> float:
+        """
+        Recebimentos - despesas lançados entre as datas (inclusive).
+        Sem datas, é o saldo total.
+        """
+        return self._obter_indice_saldos().saldo_periodo(data_inicio, data_fim)
+
+    # ========= EXTRATO COM SALDO ACUMULADO =========
+
+    def pagina_extrato(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        apos: Optional[LancamentoExtrato] = None,
+        limite: int = 500,
+        ordenar_por: str = "data",
+        decrescente: bool = False,
+    ) -> List[LancamentoExtrato]:
+        """
+        Próxima página do extrato do período (recebimentos, despesas e
+        ordens de serviço), ordenado pelo banco por `ordenar_por` (ver
+        ExtratoRepositorio.ORDENAVEIS). `apos` é a última linha da página
+        anterior. Na ordem por data, as linhas trazem o saldo acumulado,
+        que parte do saldo do índice na borda do período.
+        """
+        saldo_inicial = 0.0
+        if apos is None and ordenar_por == "data":
+            if decrescente:
+                saldo_inicial = self.saldo_periodo(None, data_fim)
+            elif data_inicio is not None:
+                saldo_inicial = self.saldo_em(data_inicio - timedelta(days=1))
+        return self.extrato_repo.pagina(
+            data_inicio, data_fim, apos, saldo_inicial, limite, ordenar_por, decrescente
+        )
+
+    def extrato(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        ordenar_por: str = "data",
+        decrescente: bool = False,
+        tamanho_pagina: int = 1000,
+    ) -> Iterator[LancamentoExtrato]:
+        """Percorre o extrato do período inteiro, lendo uma página por vez."""
+        apos = None
+        while True:
+            pagina = self.pagina_extrato(data_inicio, data_fim, apos, tamanho_pagina, ordenar_por, decrescente)
+            yield from pagina
+            if len(pagina) < tamanho_pagina:
+                return
+            apos = pagina[-1]
+
+        # ========= ARQUIVO ANUAL =========
+
+    def arquivar_ano(self, ano: int) -> Dict[str, int]:
+        """
+        Move os recebimentos, despesas e ordens de serviço de um ano já
+        encerrado para o arquivo anual (financeiro_AAAA.db). Relatórios e
+        totais continuam enxergando esses registros; edição e busca textual
+        passam a valer só para o banco principal.
+
+        Returns:
+            Quantidade de registros movidos por tabela.
+        """
+        return self.db.arquivar_ano(ano)
+
+    def anos_arquivados(self) -> List[int]:
+        return self.db.anos_arquivados()
+
+        # ========= CONSULTA POR ID =========
+
+    def obter_recebimento(self, rec_id: int) -> Optional[Recebimento]:
+        return self.recebimentos_repo.obter_por_id(rec_id)
+
+    def obter_despesa(self, despesa_id: int) -> Optional[Despesa]:
+        return self.despesas_repo.obter_por_id(despesa_id)
+
+    def obter_ordem_servico(self, os_id: int) -> Optional[OrdemServico]:
+        return self.os_repo.obter_por_id(os_id)
+
         # ========= ATUALIZAÇÕES =========
 
-    def atualizar_recebimento(self, rec: Recebimento) -> None:
-        self.recebimentos_repo.atualizar(rec)
+    def _publicar_alterados(self, repo, entidade: str, anteriores: Dict[int, object]) -> None:
+        """Relê (em uma consulta) os registros gravados em lote e publica os que mudaram."""
+        for atual in repo.listar_por_ids(anteriores):
+            anterior = anteriores[atual.id]
+            if atual != anterior:
+                self._publicar(entidade, eventos.ATUALIZADO, atual, anterior)
 
-    def atualizar_despesa(self, desp: Despesa) -> None:
-        self.despesas_repo.atualizar(desp)
+    def _gravar_em_lote(self, repo, entidade: str, ids: Iterable[int], gravar) -> int:
+        """
+        Roda `gravar(ids)` (uma escrita só, que devolve quantos registros
+        mudaram) e publica um evento por registro alterado.
+        """
+        anteriores = {m.id: m for m in repo.listar_por_ids(ids)}
+        alterados = gravar(list(anteriores)) if anteriores else 0
+        if alterados:
+            self._publicar_alterados(repo, entidade, anteriores)
+        return alterados
 
-    def atualizar_ordem_servico(self, os_: OrdemServico) -> None:
-        self.os_repo.atualizar(os_)
+    def atualizar_recebimento(self, rec: Recebimento) -> bool:
+        return self._atualizar(self.recebimentos_repo, eventos.RECEBIMENTO, rec)
 
-        self.os_repo.marcar_como_pago(os_id, forma_pagamento)
+    def atualizar_despesa(self, desp: Despesa) -> bool:
+        """
+        Grava a despesa editada, levando a mudança às parcelas na mesma
+        transação (ver ParcelaRepositorio.atualizar_com_despesa). Numa
+        despesa parcelada em várias vezes, valor e vencimento vêm das
+        parcelas e não mudam aqui.
+        """
+        anterior = desp.como_salvo() if desp.rastreado else self.despesas_repo.obter_por_id(desp.id)
+        if anterior is not None and desp.eh_a_prazo and not anterior.eh_a_prazo:
+            # À vista nasce paga; virando conta a prazo, passa a estar em aberto
+            desp.foi_pago = False
+        gravar = None
+        if anterior is not None and (desp.eh_a_prazo or anterior.eh_a_prazo):
+            mudou_valor = (desp.valor, desp.data_vencimento) != (anterior.valor, anterior.data_vencimento)
+            if (desp.eh_a_prazo and anterior.eh_a_prazo and mudou_valor
+                    and len(self.parcelas_repo.listar_da_despesa(desp.id)) > 1):
+                raise ValueError("Despesa parcelada: valor e vencimento são definidos pelas parcelas.")
+            gravar = self.parcelas_repo.atualizar_com_despesa
+        return self._atualizar(self.despesas_repo, eventos.DESPESA, desp, gravar)
+
+    def atualizar_ordem_servico(self, os_: OrdemServico) -> bool:
+        return self._atualizar(self.os_repo, eventos.ORDEM_SERVICO, os_)
+
+    def marcar_ordem_como_paga(self, os_id: int, forma_pagamento: FormaPagamento) -> bool:
+        """
+        Marca uma ordem de serviço como paga, com a forma de pagamento usada.
+        """
+        if self.obter_ordem_servico(os_id) is None:
+            raise ValueError(f"Ordem de serviço {os_id} não encontrada.")
+        return self.marcar_ordens_como_pagas([os_id], forma_pagamento) > 0
+
+    def marcar_despesa_como_paga(self, despesa_id: int) -> bool:
+        """
+        Marca uma conta a prazo como paga, com todas as parcelas (sai dos
+        alertas de vencimento).
+        """
+        desp = self.despesas_repo.obter_por_id(despesa_id)
+        if desp is None:
+            raise ValueError(f"Despesa {despesa_id} não encontrada.")
+        desp.foi_pago = True
+        return self.atualizar_despesa(desp)
+
+    def marcar_despesas_como_pagas(self, ids: Iterable[int]) -> int:
+        """
+        Marca como pagas, com as parcelas, as contas a prazo em aberto entre
+        as despesas `ids`, em uma transação. Retorna quantas mudaram.
+        """
+        return self._gravar_em_lote(self.despesas_repo, eventos.DESPESA, ids, self.despesas_repo.marcar_pagas)
+
+    def alterar_forma_pagamento_despesas(self, ids: Iterable[int], forma_pagamento: FormaPagamento) -> int:
+        """
+        Troca a forma de pagamento de várias despesas com um UPDATE só.
+        Retorna quantas mudaram: as de anos arquivados (somente leitura)
+        ficam de fora.
+        """
+        return self._gravar_em_lote(
+            self.despesas_repo, eventos.DESPESA, ids,
+            lambda ids_: self.despesas_repo.atualizar_em_lote(ids_, {"forma_pagamento": forma_pagamento}),
+        )
+
+    def alterar_forma_pagamento_ordens(self, ids: Iterable[int], forma_pagamento: FormaPagamento) -> int:
+        """
+        Troca a forma de pagamento de várias ordens de serviço com um UPDATE
+        só. Retorna quantas mudaram: as de anos arquivados (somente leitura)
+        ficam de fora.
+        """
+        return self._gravar_em_lote(
+            self.os_repo, eventos.ORDEM_SERVICO, ids,
+            lambda ids_: self.os_repo.atualizar_em_lote(ids_, {"forma_pagamento": forma_pagamento}),
+        )
+
+    # ========= PARCELAS =========
+
+    def parcelas_da_despesa(self, despesa_id: int) -> List[Parcela]:
+        return self.parcelas_repo.listar_da_despesa(despesa_id)
+
+    def pagar_parcela(self, parcela_id: int) -> bool:
+        """
+        Marca uma parcela como paga. A despesa passa a vencer na próxima
+        parcela em aberto; paga a última, a despesa fica paga. Retorna False
+        se a parcela já estava paga.
+        """
+        parcela = self.parcelas_repo.obter_por_id(parcela_id)
+        if parcela is None:
+            raise ValueError(f"Parcela {parcela_id} não encontrada.")
+        desp = self.despesas_repo.obter_por_id(parcela.despesa_id)
+        anterior = desp.como_salvo()
+        if not self.parcelas_repo.pagar(desp, parcela_id):
+            return False
+        # Mesmo paga fora de ordem (a despesa não muda), agenda e telas mudam
+        self._publicar(eventos.DESPESA, eventos.ATUALIZADO, desp, anterior)
+        return True
+
+    def parcelas_a_vencer(self, ano: int, mes: int) -> List[Parcela]:
+        """Parcelas ainda não pagas que vencem no mês, por vencimento."""
+        inicio, fim = date(ano, mes, 1), date(ano, mes, monthrange(ano, mes)[1])
+        return self.parcelas_repo.listar_a_pagar(inicio, fim)
+
+    def totais_despesas_mes(self, ano: int, mes: int) -> TotaisDespesasMes:
+        """
+        Despesas do mês por competência (compras lançadas no mês, lidas do
+        resumo mensal) e por caixa (à vista lançadas no mês mais parcelas
+        que vencem nele). Cada parte é uma soma por índice, sem percorrer
+        as despesas.
+        """
+        inicio, fim = date(ano, mes, 1), date(ano, mes, monthrange(ano, mes)[1])
+        competencia = sum(r.total for r in self.resumo_repo.listar(inicio, fim, eventos.DESPESA))
+        return TotaisDespesasMes(
+            ano=ano,
+            mes=mes,
+            competencia=competencia,
+            a_vista=self.despesas_repo.total_a_vista(inicio, fim),
+            parcelas=self.parcelas_repo.total_vencimento(inicio, fim),
+        )
+
+    # ========= PAGAMENTOS DE ORDENS DE SERVIÇO =========
+
+    def marcar_ordens_como_pagas(self, ids: Iterable[int], forma_pagamento: FormaPagamento) -> int:
+        """
+        Marca várias ordens de serviço como pagas (sem lançar recebimento),
+        em um UPDATE só. Ordens já pagas ficam como estão. Retorna quantas
+        mudaram.
+        """
+        return self._gravar_em_lote(
+            self.os_repo, eventos.ORDEM_SERVICO, ids,
+            lambda ids_: self.os_repo.marcar_pagas(ids_, forma_pagamento),
+        )
+
+    def receber_ordens_servico(
+        self,
+        valores: Dict[int, float],
+        forma_pagamento: FormaPagamento,
+        data: Optional[date] = None,
+        comprovante_caminho: Optional[str] = None,
+    ) -> int:
+        """
+        Lança um recebimento que paga as ordens de `valores` (id -> valor
+        pago a cada uma, que pode ser só uma parte do saldo). Recebimento e
+        pagamentos são gravados juntos; o banco desconta os pagamentos do
+        saldo em aberto e marca como pagas as ordens quitadas. Retorna o id
+        do recebimento.
+        """
+        if not valores:
+            raise ValueError("Informe ao menos uma ordem de serviço.")
+        anteriores = {o.id: o for o in self.os_repo.listar_por_ids(valores)}
+        for os_id, valor in valores.items():
+            os_ = anteriores.get(os_id)
+            if os_ is None:
+                raise ValueError(f"Ordem de serviço {os_id} não encontrada (ano arquivado?).")
+            if os_.foi_pago:
+                raise ValueError(f"A ordem de serviço {os_id} já está paga.")
+            if valor <= 0 or valor > os_.saldo_aberto + 0.005:
+                raise ValueError(
+                    f"Valor inválido para a ordem de serviço {os_id}: "
+                    f"o saldo em aberto é {os_.saldo_aberto:.2f}."
+                )
+        rec = Recebimento(
+            id=None,
+            valor=round(sum(valores.values()), 2),
+            data=data or date.today(),
+            forma_pagamento=forma_pagamento,
+            comprovante_caminho=comprovante_caminho,
+        )
+        self.pagamentos_os_repo.registrar(rec, valores)
+        self._publicar(eventos.RECEBIMENTO, eventos.CRIADO, rec)
+        self._publicar_alterados(self.os_repo, eventos.ORDEM_SERVICO, anteriores)
+        return rec.id
+
+    def quitar_ordens_servico(
+        self, ids: Iterable[int], forma_pagamento: FormaPagamento, data: Optional[date] = None
+    ) -> int:
+        """
+        Recebe o saldo em aberto inteiro de cada ordem em um recebimento só
+        (ordens já pagas são ignoradas). Retorna o id do recebimento.
+        """
+        valores = {o.id: o.saldo_aberto for o in self.os_repo.listar_por_ids(ids) if not o.foi_pago}
+        return self.receber_ordens_servico(valores, forma_pagamento, data)
+
+    def pagamentos_da_ordem(self, os_id: int) -> List[PagamentoOS]:
+        return self.pagamentos_os_repo.listar_da_ordem(os_id)
+
+    # ========= CONTAS A RECEBER (AGING) =========
+
+    def aging_ordens_servico(self, hoje: Optional[date] = None) -> List[AgingCliente]:
+        """
+        Saldo em aberto das ordens de serviço não pagas, por cliente, nas
+        faixas de 0-30, 31-60, 61-90 e mais de 90 dias desde a emissão.
+        """
+        return self.os_repo.aging_em_aberto(hoje or date.today())
+
+    # ========= VENCIMENTOS =========
+
+    def _obter_agenda_vencimentos(self) -> AgendaVencimentos:
+        if self._agenda_vencimentos is None:
+            self._agenda_vencimentos = AgendaVencimentos(self.parcelas_repo.listar_a_pagar())
+        return self._agenda_vencimentos
+
+    def _atualizar_parcelas_a_pagar(self, atual: Despesa, anterior: Optional[Despesa]) -> None:
+        """
+        Relê as parcelas de uma despesa a prazo gravada e as leva à agenda e
+        ao fluxo previsto (à vista não mexe em nenhum dos dois).
+        """
+        if self._agenda_vencimentos is None and self._fluxo_previsto is None:
+            return
+        if not (atual.eh_a_prazo or (anterior is not None and anterior.eh_a_prazo)):
+            return
+        parcelas = self.parcelas_repo.listar_da_despesa(atual.id)
+        if self._agenda_vencimentos is not None:
+            self._agenda_vencimentos.substituir(atual.id, parcelas)
+        if self._fluxo_previsto is not None:
+            self._fluxo_previsto.substituir(
+                (PARCELAS, atual.id), previsto_das_parcelas(parcelas), lancado_da_compra(atual, parcelas)
+            )
+
+    def alertas_vencimento(self, hoje: Optional[date] = None) -> AlertasVencimento:
+        """
+        Parcelas a pagar vencidas, que vencem hoje e que vencem nos próximos
+        7 dias. A agenda é lida do banco uma vez e depois acompanha as
+        despesas gravadas pelo sistema.
+        """
+        return self._obter_agenda_vencimentos().alertas(hoje or date.today())
+
+
+    # ========= FLUXO DE CAIXA PROJETADO =========
+
+    def _obter_fluxo_previsto(self) -> FluxoPrevisto:
+        if self._fluxo_previsto is None:
+            fluxo = FluxoPrevisto()
+            for os_ in self.os_repo.listar_a_receber():
+                fluxo.substituir((ORDEM, os_.id), previsto_da_ordem(os_))
+            por_despesa: Dict[int, List[Parcela]] = {}
+            for p in self.parcelas_repo.listar_a_pagar():
+                por_despesa.setdefault(p.despesa_id, []).append(p)
+            despesas = {d.id: d for d in self.despesas_repo.listar_por_ids(por_despesa)}
+            for despesa_id, parcelas in por_despesa.items():
+                desp = despesas.get(despesa_id)
+                fluxo.substituir(
+                    (PARCELAS, despesa_id), previsto_das_parcelas(parcelas),
+                    lancado_da_compra(desp, parcelas) if desp is not None else None,
+                )
+            self._fluxo_previsto = fluxo
+            self._folha_prevista = None
+        return self._fluxo_previsto
+
+    def _prever_folha_no_fluxo(self, fluxo: FluxoPrevisto, inicio: date, fim: date) -> None:
+        """Põe no fluxo a folha ainda não lançada dos meses de `inicio` a `fim`."""
+        meses = (inicio.year, inicio.month), (fim.year, fim.month)
+        if self._folha_prevista == meses:
+            return
+        previstos = []
+        for n in range(inicio.year * 12 + inicio.month - 1, fim.year * 12 + fim.month):
+            previstos += self.prever_folha(n // 12, n % 12 + 1)
+        fluxo.substituir((FOLHA,), previsto_da_folha(previstos))
+        self._folha_prevista = meses
+
+    def projetar_fluxo_caixa(self, dias: int = 30, hoje: Optional[date] = None) -> ProjecaoFluxo:
+        """
+        Saldo em caixa previsto para cada um dos próximos `dias` dias: entram
+        os saldos das ordens de serviço em aberto (no prazo de recebimento
+        depois da emissão, ver fluxo.py), saem as parcelas a pagar no vencimento e a folha
+        ainda não lançada na data de pagamento; lançamentos já gravados com
+        data futura contam no dia deles. Contas a prazo saem do caixa pelas
+        parcelas, não pela data da compra. Os valores previstos ficam em
+        memória e acompanham as alterações feitas pelo sistema.
+        """
+        if dias < 1:
+            raise ValueError("O horizonte da projeção deve ter pelo menos 1 dia.")
+        hoje = hoje or date.today()
+        fluxo = self._obter_fluxo_previsto()
+        # Do começo do mês: folha do mês que não foi lançada conta como atrasada
+        self._prever_folha_no_fluxo(fluxo, hoje.replace(day=1), hoje + timedelta(days=dias - 1))
+        indice = self._obter_indice_saldos()
+        # O saldo por data tira as contas a prazo na compra; na projeção o
+        # que falta pagar delas sai só nas parcelas (ver lancado_da_compra)
+        return fluxo.projetar(hoje, dias, indice.saldo_em(hoje - timedelta(days=1)), indice.fluxos(hoje, dias))
 
-    
     # -------------------------------------------------------------------------
     # GESTÃO DE FUNCIONÁRIOS
     # -------------------------------------------------------------------------
@@ -351,10 +948,11 @@ class SistemaFinanceiro:
         dia_pagamento: int,
         foto_caminho: Optional[str] = None,
         mes_decimo_terceiro: Optional[int] = None,
-        mes_ferias: Optional[int] = None
-    ) -> None:
+        mes_ferias: Optional[int] = None,
+        salario: Optional[float] = None
+    ) -> int:
         """
-        Registra um novo funcionário.
+        Registra um novo funcionário e retorna o id gerado.
         """
         func = Funcionario(
             id=None,
@@ -367,15 +965,23 @@ class SistemaFinanceiro:
             dia_pagamento=dia_pagamento,
             mes_decimo_terceiro=mes_decimo_terceiro,
             mes_ferias=mes_ferias,
-            data_demissao=None
+            data_demissao=None,
+            salario=salario
         )
-        self.func_repo.criar(func)
+        func.id = self.func_repo.criar(func)
+        self._indexar_funcionario(func)
+        self._publicar(eventos.FUNCIONARIO, eventos.CRIADO, func)
+        return func.id
 
-    def atualizar_funcionario(self, func: Funcionario) -> None:
+    def atualizar_funcionario(self, func: Funcionario) -> bool:
         """
-        Atualiza dados de um funcionário existente.
+        Atualiza dados de um funcionário existente (só os campos alterados).
+        Retorna False se nada mudou.
         """
-        self.func_repo.atualizar(func)
+        if not self._atualizar(self.func_repo, eventos.FUNCIONARIO, func):
+            return False
+        self._indexar_funcionario(func)
+        return True
 
     def listar_funcionarios(self) -> List[Funcionario]:
         """
@@ -383,3 +989,84 @@ class SistemaFinanceiro:
         """
         return self.func_repo.listar_todos()
 
+    def buscar_ids_funcionarios(self, texto: str) -> Optional[Set[int]]:
+        """
+        Busca funcionários por nome, CPF, cargo ou telefone (ignorando
+        acentos e maiúsculas; aceita prefixos e trechos do meio).
+
+        Returns:
+            Conjunto de ids encontrados, ou None se o texto estiver vazio.
+        """
+        if self._indice_funcionarios is None:
+            indice = IndiceNGramas()
+            for func in self.listar_funcionarios():
+                indice.adicionar(func.id, self._campos_busca_funcionario(func))
+            self._indice_funcionarios = indice
+        return self._indice_funcionarios.buscar(texto)
+
+    def _indexar_funcionario(self, func: Funcionario) -> None:
+        """Atualiza o índice de busca só para o funcionário alterado."""
+        if self._indice_funcionarios is not None:
+            self._indice_funcionarios.adicionar(func.id, self._campos_busca_funcionario(func))
+
+    @staticmethod
+    def _campos_busca_funcionario(func: Funcionario):
+        return (func.nome, func.cpf, func.cargo, func.telefone)
+
+    def obrigacoes_folha(self, ano: int, mes: int) -> ObrigacoesMes:
+        """
+        Salários, 13º e férias que a folha deve pagar no mês. O calendário é
+        montado na primeira consulta e descartado quando um funcionário é
+        cadastrado ou alterado; entre uma coisa e outra, cada mês consultado
+        fica guardado.
+        """
+        if self._calendario_folha is None:
+            self._calendario_folha = CalendarioFolha(self.listar_funcionarios(), date.today())
+        return self._calendario_folha.mes(ano, mes)
+
+    def prever_folha(self, ano: int, mes: int) -> List[LancamentoFolha]:
+        """
+        Despesas que lançar a folha do mês gera, com o que já foi lançado
+        marcado (despesa_id). Não grava nada.
+        """
+        competencia = f"{ano:04d}-{mes:02d}"
+        lancados = self.folha_repo.lancados(competencia)
+        return [
+            LancamentoFolha(
+                obrigacao=o,
+                valor=valor_obrigacao(o),
+                despesa_id=lancados.get((o.funcionario.id, o.tipo)),
+            )
+            for o in self.obrigacoes_folha(ano, mes).itens
+        ]
+
+    def lancar_folha(
+        self, ano: int, mes: int, forma_pagamento: FormaPagamento = FormaPagamento.PIX
+    ) -> List[int]:
+        """
+        Lança como despesas (pagas, na data de pagamento de cada funcionário)
+        os salários, 13º e férias do mês, em uma transação só. Rodar de novo
+        não duplica: o que já foi lançado é pulado, assim como funcionários
+        sem salário cadastrado. Retorna os ids das despesas criadas.
+        """
+        rotulo = f"{mes:02d}/{ano:04d}"
+        itens = []
+        for previsto in self.prever_folha(ano, mes):
+            if previsto.lancado or previsto.valor is None:
+                continue
+            o = previsto.obrigacao
+            desp = Despesa(
+                id=None,
+                valor=previsto.valor,
+                data=o.data,
+                forma_pagamento=forma_pagamento,
+                descricao=f"{o.tipo} - {o.funcionario.nome} ({rotulo})",
+            )
+            itens.append((o.funcionario.id, o.tipo, desp))
+
+        gravadas = self.folha_repo.lancar(f"{ano:04d}-{mes:02d}", itens)
+        if gravadas:
+            self._folha_prevista = None     # O que foi lançado sai da folha prevista
+        for desp in gravadas:
+            self._publicar(eventos.DESPESA, eventos.CRIADO, desp)
+        return [desp.id for desp in gravadas]
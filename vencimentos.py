@@ -0,0 +1,87 @@
+"""
+Módulo de vencimentos das contas a pagar.
+
+Mantém em memória as parcelas das contas a prazo ainda não pagas,
+ordenadas pela data de vencimento, para responder "o que está vencido,
+vence hoje ou vence nesta semana" sem varrer as despesas. Não conhece
+banco de dados nem interface: quem usa a agenda informa as parcelas de
+cada despesa gravada.
+"""
+
+from bisect import bisect_left, insort
+from calendar import monthrange
+from datetime import date
+from typing import Dict, Iterable, List, Set, Tuple
+
+from models import AlertasVencimento, Parcela
+
+
+def dividir_em_parcelas(valor: float, quantidade: int, primeiro_vencimento: date) -> List[Tuple[date, float]]:
+    """
+    (vencimento, valor) de cada parcela: uma por mês a partir do primeiro
+    vencimento, no mesmo dia (ou no último dia dos meses mais curtos). O
+    valor é dividido em centavos; a sobra da divisão vai na última parcela.
+    """
+    if quantidade < 1:
+        raise ValueError("A quantidade de parcelas deve ser pelo menos 1.")
+    centavos = round(valor * 100)
+    base = centavos // quantidade
+    parcelas = []
+    for n in range(quantidade):
+        m = primeiro_vencimento.year * 12 + primeiro_vencimento.month - 1 + n
+        ano, mes = m // 12, m % 12 + 1
+        dia = min(primeiro_vencimento.day, monthrange(ano, mes)[1])
+        parte = base if n < quantidade - 1 else centavos - base * (quantidade - 1)
+        parcelas.append((date(ano, mes, dia), parte / 100))
+    return parcelas
+
+
+class AgendaVencimentos:
+    """
+    Parcelas a pagar em uma lista ordenada de (vencimento, id).
+
+    Incluir, tirar ou mudar o vencimento de uma parcela custa uma busca
+    binária mais o deslocamento da lista; os grupos de alerta são fatias
+    dessa lista, achadas também por busca binária.
+    """
+
+    # Quantos dias depois de hoje contam como "vence nesta semana"
+    DIAS_SEMANA = 7
+
+    def __init__(self, parcelas: Iterable[Parcela] = ()):
+        self._parcelas: Dict[int, Parcela] = {}
+        self._por_despesa: Dict[int, Set[int]] = {}
+        for p in parcelas:
+            if not p.foi_pago:
+                self._parcelas[p.id] = p
+                self._por_despesa.setdefault(p.despesa_id, set()).add(p.id)
+        self._ordem: List[Tuple[int, int]] = sorted((p.data_vencimento.toordinal(), p.id) for p in self._parcelas.values())
+
+    def __len__(self):
+        return len(self._ordem)
+
+    def substituir(self, despesa_id: int, parcelas: Iterable[Parcela]) -> None:
+        """Troca as parcelas da despesa pelas informadas (as pagas ficam de fora)."""
+        for id_ in self._por_despesa.pop(despesa_id, ()):
+            atual = self._parcelas.pop(id_)
+            del self._ordem[bisect_left(self._ordem, (atual.data_vencimento.toordinal(), id_))]
+        for p in parcelas:
+            if not p.foi_pago:
+                self._parcelas[p.id] = p
+                self._por_despesa.setdefault(despesa_id, set()).add(p.id)
+                insort(self._ordem, (p.data_vencimento.toordinal(), p.id))
+
+    def _fatia(self, inicio: int, fim: int) -> List[Parcela]:
+        """Parcelas com vencimento (ordinal) em [inicio, fim)."""
+        i = bisect_left(self._ordem, (inicio,))
+        j = bisect_left(self._ordem, (fim,))
+        return [self._parcelas[id_] for _, id_ in self._ordem[i:j]]
+
+    def alertas(self, hoje: date) -> AlertasVencimento:
+        o = hoje.toordinal()
+        return AlertasVencimento(
+            hoje=hoje,
+            vencidas=self._fatia(0, o),
+            vencem_hoje=self._fatia(o, o + 1),
+            vencem_na_semana=self._fatia(o + 1, o + 1 + self.DIAS_SEMANA),
+        )
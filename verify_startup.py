@@ -0,0 +1,84 @@
+import sys
+import os
+import subprocess
+import tempfile
+
+# Orçamentos de inicialização a frio (segundos), medidos em processo novo
+ORCAMENTO_IMPORT = 0.8      # "import app"
+ORCAMENTO_JANELA = 2.5      # import + banco + MainWindow visível
+
+# Módulos pesados que NÃO devem ser carregados antes do primeiro uso
+MODULOS_TARDIOS = [
+    "openpyxl",
+    "excel_generator",
+    "interface.dialogs.add",
+    "interface.dialogs.reports",
+    "interface.dialogs.details",
+    "interface.pages.employees_page",
+]
+
+SCRIPT_IMPORT = """
+import sys, time
+t0 = time.perf_counter()
+import app
+print(time.perf_counter() - t0)
+print(",".join(sorted(sys.modules)))
+"""
+
+SCRIPT_JANELA = """
+import sys, time
+t0 = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+from database import Database
+from services import SistemaFinanceiro
+from interface import MainWindow
+from interface.theme import aplicar_tema
+qt_app = QApplication(sys.argv)
+aplicar_tema(qt_app)
+window = MainWindow(SistemaFinanceiro(Database(sys.argv[1])))
+window.show()
+qt_app.processEvents()
+print(time.perf_counter() - t0)
+"""
+
+
+def _rodar(script, *args):
+    env = dict(os.environ)
+    # Permite rodar sem tela (CI, terminal remoto)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    saida = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return saida.stdout.strip().splitlines()
+
+
+def verify():
+    print("Testing cold start budget...")
+
+    # 1. Import do ponto de entrada
+    print("1. Testing 'import app'...")
+    linhas = _rodar(SCRIPT_IMPORT)
+    tempo_import = float(linhas[0])
+    modulos = set(linhas[1].split(","))
+    carregados = [m for m in MODULOS_TARDIOS if m in modulos]
+    assert not carregados, f"Módulos carregados cedo demais: {carregados}"
+    assert tempo_import < ORCAMENTO_IMPORT, f"import app levou {tempo_import:.3f}s"
+    print(f"   Import OK ({tempo_import * 1000:.0f} ms, orçamento {ORCAMENTO_IMPORT * 1000:.0f} ms)")
+
+    # 2. Janela principal visível (banco novo, vazio)
+    print("2. Testing MainWindow cold start...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "test_startup.db")
+        tempo_janela = float(_rodar(SCRIPT_JANELA, db_path)[-1])
+    assert tempo_janela < ORCAMENTO_JANELA, f"MainWindow levou {tempo_janela:.3f}s"
+    print(f"   MainWindow OK ({tempo_janela * 1000:.0f} ms, orçamento {ORCAMENTO_JANELA * 1000:.0f} ms)")
+
+    print("Startup Verification Successful!")
+
+if __name__ == "__main__":
+    verify()